@@ -0,0 +1,15 @@
+"""
+설정 로딩
+.env 파일은 프로세스에서 이 모듈을 처음 import할 때 한 번만 읽습니다.
+각 모듈의 설정 값(os.getenv)이 .env를 반영하도록 app.main은 이 모듈을 가장 먼저 import하며,
+OpenAI 키가 필요한 모듈(openai_client, file_analysis)도 이 모듈에서 읽습니다.
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+# .env 파일 로드
+load_dotenv(verbose=True)
+
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
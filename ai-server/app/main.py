@@ -1,23 +1,36 @@
+# .env는 다른 모듈이 설정 값을 읽기 전에 한 번만 로드
+from app import config  # noqa: F401
 from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import json
 import uuid
 import os
 import io
-from datetime import datetime
+import asyncio
+import hashlib
+import hmac
+from collections import OrderedDict
 from pathlib import Path
-from dotenv import load_dotenv
 
-from app.services.chatbot_resume import process_cover_letter_chatbot
-from app.services.word_file_handler import create_word_file_and_url
-from app.services.file_analysis import analyze_project_from_formdata
+from app.services.chatbot_resume import run_cover_letter_turn
+from app.services.chatbot_fsm import transition_stats
+from app.services.session_models import CoverLetterSession, RefineSession, ProjectRecord, Turn, load_sessions
+from app.services.shared_store import get_shared_store
+from app.services.worker_pool import drain_pools
+from app.services.export_pipeline import (
+    EXPORT_FORMATS, EXPORT_WAIT_SECONDS, register_draft, submit_export, export_stats, build_export_url
+)
+from app.services.pdf_renderer import pdf_available
+from app.services.draft_speculation import Speculation, speculation_stats
 from app.services.chatbot_meta_field import process_project_refine_chatbot
-
-# .env 파일 로드
-load_dotenv(verbose=True)
+from app.services.singleflight import SingleFlight, make_key
+from app.services.http_download import build_download_response
+from app.services.file_storage import get_file_storage
+from app.services.project_index import schedule_index_project, search_projects
+from app.services.project_ranking import PROMPT_TOP_K
 
 app = FastAPI(title="AI Server", version="1.0.0")
 
@@ -36,8 +49,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 세션 저장소 (메모리 기반, 프로덕션에서는 Redis 등 사용 권장)
-sessions: Dict[str, Dict[str, Any]] = {}
+# 세션은 공유 저장소(SQLite)에 두어 여러 워커 프로세스가 같은 대화를 이어감
+# (프로젝트 수정 챗봇: RefineSession, 자기소개서 어시스턴트: CoverLetterSession)
+# 이전 버전의 종료 시 스냅샷 파일은 시작할 때 공유 저장소로 옮김
+SESSION_SNAPSHOT_PATH = Path(os.getenv("SESSION_SNAPSHOT_PATH", str(files_dir / "sessions.snapshot")))
+
+# 백엔드(게이트웨이)와 공유하는 내부 호출 토큰 (X-User-Id 헤더를 믿을지 판단, 미설정이면 사용자별 기능 비활성화)
+INTERNAL_API_TOKEN = os.getenv("INTERNAL_API_TOKEN")
+
+# 선행 생성 작업은 실행 중인 Future라 저장소에 넣을 수 없으므로 이 프로세스에만 보관
+# (다음 턴이 다른 워커로 가면 선행 생성 없이 새로 생성)
+MAX_LOCAL_SPECULATIONS = int(os.getenv("MAX_LOCAL_SPECULATIONS", "64"))
+speculations: "OrderedDict[str, Speculation]" = OrderedDict()
+
+# 종료 시 백그라운드 작업(렌더링, 인덱싱, 분석)을 기다리는 최대 시간 (gunicorn graceful_timeout보다 짧게)
+SHUTDOWN_DRAIN_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "30"))
+
+# 동일한 입력의 분석 요청 병합 (더블 클릭, 프록시 재시도)
+analysis_flight = SingleFlight()
 
 # 요청 모델
 class Project(BaseModel):
@@ -56,6 +85,7 @@ class StartRequest(BaseModel):
     state: str
     purpose: str
     projects: List[Project]
+    draft_variants: Optional[bool] = None  # 여러 문체 초안을 한 번에 생성 (기본값: DRAFT_VARIANTS)
 
 class ChatRequest(BaseModel):
     answer: str
@@ -73,7 +103,8 @@ class ProjectRefineChatRequest(BaseModel):
 class AssistantResponse(BaseModel):
     message: str
     session_id: Optional[str] = None
-    url: Optional[str] = None  # Word 파일 다운로드 URL (AI 서버 URL)
+    url: Optional[str] = None  # Word/PDF 파일 다운로드 URL (AI 서버 URL)
+    exports: Optional[Dict[str, str]] = None  # 형식별(docx/pdf/html/md) 내보내기 URL
 
 def merge_projects_to_cover_letter_data(projects: List[Project]) -> Dict[str, Any]:
     """여러 프로젝트를 자기소개서 데이터로 통합합니다."""
@@ -86,7 +117,7 @@ def merge_projects_to_cover_letter_data(projects: List[Project]) -> Dict[str, An
         "strengths": [],
         "personality": None,
         "future_plans": None,
-        "projects": []  # 각 프로젝트 정보를 배열로 저장
+        "projects": []  # 각 프로젝트 정보를 ProjectRecord 배열로 저장
     }
     
     all_skills = set()
@@ -96,19 +127,7 @@ def merge_projects_to_cover_letter_data(projects: List[Project]) -> Dict[str, An
     
     # 각 프로젝트를 개별적으로 저장
     for project in projects:
-        project_dict = {
-            "title": project.title,
-            "category": project.category,
-            "tags": project.tags or [],
-            "summary": project.summary,
-            "start_date": project.start_date,
-            "end_date": project.end_date,
-            "roles": project.roles or [],
-            "achievements": project.achievements or [],
-            "tools": project.tools or [],
-            "description": project.description
-        }
-        cover_letter_data["projects"].append(project_dict)
+        cover_letter_data["projects"].append(ProjectRecord.from_dict(project.model_dump()))
         
         # tools → skills 통합
         if project.tools:
@@ -163,6 +182,105 @@ def merge_projects_to_cover_letter_data(projects: List[Project]) -> Dict[str, An
     
     return cover_letter_data
 
+def get_user_id(request: Request) -> Optional[str]:
+    """
+    요청한 사용자 ID (프로젝트 인덱스 구분용)
+    
+    X-User-Id는 백엔드(게이트웨이)가 인증한 사용자로 설정하는 헤더이므로,
+    백엔드와 공유한 X-Internal-Token이 INTERNAL_API_TOKEN과 일치할 때만 믿습니다.
+    브라우저에서 직접 보낸 헤더나 토큰이 설정되지 않은 서버에서는 None (사용자별 인덱싱/검색 비활성화)
+    """
+    user_id = request.headers.get("X-User-Id")
+    token = request.headers.get("X-Internal-Token")
+    if not user_id or not token or not INTERNAL_API_TOKEN:
+        return None
+    if not hmac.compare_digest(token.encode("utf-8"), INTERNAL_API_TOKEN.encode("utf-8")):
+        return None
+    return user_id
+
+def projects_from_index(user_id: str, query: str) -> List[Project]:
+    """사용자 프로젝트 인덱스에서 query와 관련 있는 프로젝트를 찾아 Project 목록으로 만듭니다."""
+    # 인덱스에는 요약 전 원본 필드가 저장되어 있음 (프롬프트용 요약은 자기소개서 생성 단계에서 수행)
+    return [Project(**hit["project"]) for hit in search_projects(user_id, query, top_k=PROMPT_TOP_K)]
+
+def attach_speculation(session_id: str, session: CoverLetterSession) -> None:
+    """이 프로세스에 남겨 둔 선행 생성 작업을 세션에 다시 연결합니다."""
+    session.speculative_draft = speculations.pop(session_id, None)
+
+def keep_speculation(session_id: str, session: CoverLetterSession) -> None:
+    """턴이 끝난 뒤에도 진행 중인 선행 생성 작업을 다음 턴까지 보관합니다 (오래된 작업부터 폐기)."""
+    if session.speculative_draft is None:
+        return
+    speculations[session_id] = session.speculative_draft
+    session.speculative_draft = None
+    while len(speculations) > MAX_LOCAL_SPECULATIONS:
+        _, stale = speculations.popitem(last=False)
+        stale.discard()
+
+def track_export(session_id: str, session: CoverLetterSession, future, draft_hash: str, export_format: str) -> None:
+    """
+    백그라운드 내보내기 상태를 세션에 기록합니다 (실패 시 다음 응답에서 사용자에게 알림).
+    
+    렌더링이 끝나면 공유 저장소의 세션도 갱신하여 다른 워커가 다음 턴을 처리해도 결과를 알 수 있습니다.
+    """
+    export = {
+        "draft_hash": draft_hash,
+        "format": export_format,
+        "url": build_export_url(draft_hash, export_format),
+        "status": "pending",
+        "file_id": None,
+        "error": None,
+        "notified": False
+    }
+    session.export = export
+    
+    def on_done(done):
+        if done.cancelled() or done.exception() is not None:
+            error = "작업이 취소되었습니다." if done.cancelled() else str(done.exception())
+            changes = {"status": "failed", "error": error}
+            print(f"❌ 백그라운드 내보내기 실패 ({export_format}): {error}")
+        else:
+            changes = {"status": "completed", "file_id": done.result()}
+        export.update(changes)
+        
+        def apply(stored: CoverLetterSession) -> None:
+            # 그사이 새 초안을 내보냈다면 이전 결과로 덮어쓰지 않음
+            if stored.export and stored.export.get("draft_hash") == draft_hash and stored.export.get("format") == export_format:
+                stored.export.update(changes)
+        
+        try:
+            get_shared_store().update_session(session_id, apply)
+        except Exception as e:
+            print(f"내보내기 상태 저장 오류: {str(e)}")
+    
+    future.add_done_callback(on_done)
+
+def save_assistant_session(session_id: str, session: CoverLetterSession) -> None:
+    """
+    턴이 끝난 세션을 저장합니다.
+    
+    턴을 처리하는 동안 백그라운드 내보내기가 저장소에 완료/실패를 기록했다면 그 상태를 유지합니다.
+    """
+    def merge(stored: CoverLetterSession) -> CoverLetterSession:
+        export, stored_export = session.export, stored.export
+        if (export and stored_export and export.get("status") == "pending"
+                and stored_export.get("status") != "pending"
+                and (stored_export.get("draft_hash"), stored_export.get("format")) == (export.get("draft_hash"), export.get("format"))):
+            export.update(status=stored_export["status"], file_id=stored_export.get("file_id"), error=stored_export.get("error"))
+        return session
+    
+    store = get_shared_store()
+    if store.update_session(session_id, merge) is None:
+        store.put_session(session_id, session)
+
+def pop_export_notice(session: CoverLetterSession) -> Optional[str]:
+    """아직 알리지 않은 내보내기 실패가 있으면 안내 문구를 반환합니다."""
+    export = session.export
+    if not export or export.get("status") != "failed" or export.get("notified"):
+        return None
+    export["notified"] = True
+    return f"⚠️ 파일 생성에 실패했습니다: {export.get('error')}\n다운로드 링크를 다시 열면 한 번 더 시도합니다."
+
 @app.post("/ai/projects/assistant")
 async def projects_assistant(request: Request):
     """프로젝트 기반 자기소개서 작성 어시스턴트"""
@@ -174,32 +292,24 @@ async def projects_assistant(request: Request):
         if body.get("state") == "start":
             start_req = StartRequest(**body)
             
+            # 프로젝트를 보내지 않았으면 사용자 프로젝트 인덱스에서 목적과 관련 있는 프로젝트만 가져옴
+            user_id = get_user_id(request)
+            if not start_req.projects and user_id:
+                try:
+                    start_req.projects = await asyncio.to_thread(projects_from_index, user_id, start_req.purpose)
+                except Exception as e:
+                    print(f"프로젝트 인덱스 검색 오류: {str(e)}")
+            
             # 프로젝트들을 자기소개서 데이터로 변환
             cover_letter_data = merge_projects_to_cover_letter_data(start_req.projects)
             
             # 세션 ID 생성
             session_id = str(uuid.uuid4())
             
-            # 챗봇 처리 (초기 상태)
-            result = process_cover_letter_chatbot(
-                user_message=None,
-                cover_letter_data=cover_letter_data,
-                conversation_history=[],
-                current_state="intent_confirmation",
-                writing_style=None,
-                draft_cover_letter=None,
-                metadata=None
-            )
-            
-            # 세션 저장
-            sessions[session_id] = {
-                "cover_letter_data": result.get("updated_data", cover_letter_data),
-                "conversation_history": [],
-                "current_state": result.get("next_state", "intent_confirmation"),
-                "writing_style": result.get("writing_style"),
-                "draft_cover_letter": result.get("draft_cover_letter"),
-                "created_at": datetime.now().isoformat()
-            }
+            # 세션 생성 후 챗봇 처리 (초기 상태)
+            session = CoverLetterSession(data=cover_letter_data, variants_mode=start_req.draft_variants)
+            run_cover_letter_turn(session)
+            get_shared_store().put_session(session_id, session)
             
             # 응답 생성
             return {
@@ -209,81 +319,71 @@ async def projects_assistant(request: Request):
         # 대화 진행 요청 처리
         elif "answer" in body:
             # 가장 최근 세션 자동 사용 (유저가 1명이므로)
-            if sessions:
-                session_id = max(sessions.keys(), key=lambda k: sessions[k].get("created_at", ""))
-            else:
+            store = get_shared_store()
+            latest = store.latest_session(CoverLetterSession.kind)
+            if latest is None:
                 raise HTTPException(status_code=400, detail="세션을 찾을 수 없습니다. 먼저 START 요청을 보내주세요.")
-            
-            session = sessions[session_id]
+            session_id, session = latest
+            attach_speculation(session_id, session)
             
             # 사용자 답변 가져오기
             user_answer = body.get("answer", "")
             
             # 대화 히스토리 업데이트
             if user_answer:
-                session["conversation_history"].append({
-                    "role": "user",
-                    "content": user_answer
-                })
+                session.history.append(Turn.user(user_answer))
             
-            # 챗봇 처리
-            result = process_cover_letter_chatbot(
-                user_message=user_answer,
-                cover_letter_data=session["cover_letter_data"],
-                conversation_history=session["conversation_history"],
-                current_state=session["current_state"],
-                writing_style=session.get("writing_style"),
-                draft_cover_letter=session.get("draft_cover_letter"),
-                metadata=None
-            )
-            
-            # 세션 업데이트
-            session["cover_letter_data"] = result.get("updated_data", session["cover_letter_data"])
-            session["current_state"] = result.get("next_state", session["current_state"])
-            session["writing_style"] = result.get("writing_style", session.get("writing_style"))
-            session["draft_cover_letter"] = result.get("draft_cover_letter", session.get("draft_cover_letter"))
+            # 챗봇 처리 (상태/데이터/초안/선행 생성 작업은 세션에서 제자리 갱신)
+            # LLM 호출이 끝날 때까지 이벤트 루프를 막지 않도록 스레드에서 실행
+            result = await asyncio.to_thread(run_cover_letter_turn, session, user_answer)
+            keep_speculation(session_id, session)
             
             # AI 응답을 대화 히스토리에 추가
             if result.get("message"):
-                session["conversation_history"].append({
-                    "role": "assistant",
-                    "content": result.get("message")
-                })
+                session.history.append(Turn.assistant(result["message"]))
             
             response_data = {
                 "message": result.get("message", "응답을 생성하는 중 오류가 발생했습니다.")
             }
             
-            # Word 파일 생성 및 URL 생성 (완료 상태일 때)
+            # 최종 초안 내보내기 (완료 상태일 때): 렌더링은 백그라운드에서 진행하고 URL을 바로 반환
             if result.get("status") == "completed" and result.get("draft_cover_letter"):
                 try:
-                    print("📝 Word 파일 생성 및 URL 변환 시작...")
+                    print("📝 자기소개서 내보내기 시작...")
                     
-                    # Word 파일 생성 및 AI 서버 URL 생성
-                    word_result = create_word_file_and_url(
-                        result["draft_cover_letter"],
-                        session["cover_letter_data"]
-                    )
+                    # 초안을 등록하고 요청 형식을 렌더링 스레드 풀에 예약 (초안 해시/형식/템플릿 단위 캐시)
+                    draft_hash = register_draft(result["draft_cover_letter"], session.data)
+                    export_format = result.get("export_format", "docx")
+                    if export_format == "pdf" and not pdf_available():
+                        # PDF용 글꼴이 없으면 Word로 대체
+                        print("⚠️ PDF용 글꼴이 없어 Word로 대체합니다.")
+                        export_format = "docx"
+                    future = submit_export(draft_hash, export_format, base_dir=resumes_dir)
+                    track_export(session_id, session, future, draft_hash, export_format)
                     
-                    if word_result.get("status") == "completed" and word_result.get("url"):
-                        response_data["url"] = word_result["url"]
-                        response_data["filename"] = word_result.get("filename")  # 파일명도 함께 반환
-                        
-                        # 성공 메시지 업데이트
-                        filename = word_result.get("filename", "자기소개서.docx")
-                        response_data["message"] = f"완료 ✅\n\nWord 파일을 생성했습니다.\n\n파일명: {filename}\n\n다음에는 Settings에 '활동·공모전 수상 내역'도 추가하면 더 풍부한 자기소개서가 만들어질 거예요."
-                        
-                        print(f"✅ Word 파일 URL 생성 완료: {word_result.get('url')}")
-                    else:
-                        print(f"⚠️ Word 파일 URL 생성 실패: {word_result.get('error', '알 수 없는 오류')}")
-                        # 실패해도 기본 메시지는 유지
+                    # URL은 렌더링이 끝나면 열림 (다운로드 요청이 완료를 기다리거나 202 응답)
+                    response_data["url"] = session.export["url"]
+                    # 다른 형식은 다운로드 시점에 렌더링 (한 번 만든 결과는 캐시)
+                    response_data["exports"] = {fmt: build_export_url(draft_hash, fmt) for fmt in EXPORT_FORMATS}
+                    
+                    # 성공 메시지 업데이트
+                    label = "PDF" if export_format == "pdf" else "Word"
+                    response_data["message"] = f"완료 ✅\n\n{label} 파일을 만들고 있어요. 링크에서 바로 다운로드할 수 있습니다.\n\n다음에는 Settings에 '활동·공모전 수상 내역'도 추가하면 더 풍부한 자기소개서가 만들어질 거예요."
+                    
+                    print(f"✅ 내보내기 예약 완료: {response_data['url']}")
                         
                 except Exception as e:
                     print(f"❌ 파일 생성/URL 생성 오류: {str(e)}")
                     import traceback
                     traceback.print_exc()
-                    # 파일 생성 실패해도 메시지는 반환
-                    pass
+                    session.export = {"status": "failed", "error": str(e), "notified": False}
+            
+            # 이전 턴의 백그라운드 내보내기가 실패했다면 이번 응답에서 알림
+            notice = pop_export_notice(session)
+            if notice:
+                response_data["message"] = f"{notice}\n\n{response_data['message']}"
+            
+            save_assistant_session(session_id, session)
             
             # 응답 반환 (session_id를 body에 포함)
             return response_data
@@ -303,10 +403,14 @@ def parse_multipart_manually(body: bytes, boundary: str) -> tuple:
     """
     multipart/form-data를 수동으로 파싱
     Supabase Edge Function Proxy를 통한 요청 처리
+    
+    Returns:
+        (file_data, url_data, text_data, mode_data)
     """
     file_data = None
     url_data = None
     text_data = None
+    mode_data = None
     
     # boundary로 분리
     boundary_bytes = f"--{boundary}".encode()
@@ -350,12 +454,76 @@ def parse_multipart_manually(body: bytes, boundary: str) -> tuple:
                 
                 elif 'name="text"' in headers:
                     text_data = content.decode('utf-8', errors='ignore').strip()
+                
+                elif 'name="mode"' in headers:
+                    mode_data = content.decode('utf-8', errors='ignore').strip()
         
         except Exception as e:
             print(f"파트 파싱 오류: {e}")
             continue
     
-    return file_data, url_data, text_data
+    return file_data, url_data, text_data, mode_data
+
+def upload_from_multipart(file_data: Optional[Dict[str, Any]]):
+    """수동 파싱한 파일 파트를 UploadFile처럼 사용할 수 있는 파일 객체로 감쌉니다."""
+    if not file_data:
+        return None
+    file_like = io.BytesIO(file_data['content'])
+    file_like.name = file_data.get('filename') or 'uploaded_file'
+    file_like.filename = file_data.get('filename') or 'uploaded_file'
+    file_like.file = file_like  # shutil.copyfileobj를 위해 자기 자신을 file 속성으로 설정
+    return file_like
+
+async def read_analyze_inputs(request: Request) -> tuple:
+    """
+    요청에서 분석 입력(file, url, text, mode)을 읽습니다.
+    
+    multipart는 python-multipart 파서를 우회하여 직접 파싱하고,
+    JSON과 일반 form-data도 같은 형태로 반환합니다.
+    """
+    content_type = request.headers.get("content-type", "")
+    
+    boundary = None
+    if "boundary=" in content_type:
+        boundary = content_type.split("boundary=")[1].strip()
+    
+    # multipart/form-data인 경우: 원시 body를 직접 읽어 파싱
+    if "multipart/form-data" in content_type:
+        if not boundary:
+            raise HTTPException(status_code=400, detail="boundary not found")
+        body = await request.body()
+        file_data, url, text, mode = parse_multipart_manually(body, boundary)
+        return upload_from_multipart(file_data), url, text, mode
+    
+    # JSON인 경우
+    if "application/json" in content_type:
+        data = await request.json()
+        return None, data.get("url"), data.get("text"), data.get("mode")
+    
+    # 일반 form-data인 경우 (기존 방식 - Direct 호출)
+    try:
+        form = await request.form()
+        return form.get("file"), form.get("url"), form.get("text"), form.get("mode")
+    except Exception as form_error:
+        print(f"Form 파싱 실패, multipart 수동 파싱 시도: {form_error}")
+        # Form 파싱 실패 시 multipart 수동 파싱 시도
+        if not boundary:
+            raise form_error
+        body = await request.body()
+        file_data, url, text, mode = parse_multipart_manually(body, boundary)
+        return upload_from_multipart(file_data), url, text, mode
+
+def hash_upload(file) -> Optional[str]:
+    """업로드 파일 내용의 SHA-256을 계산하고 읽기 위치를 되돌립니다."""
+    if not file or not getattr(file, "filename", None):
+        return None
+    stream = file.file
+    position = stream.tell()
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+        digest.update(chunk)
+    stream.seek(position)
+    return digest.hexdigest()
 
 @app.post("/ai/projects/analyze")
 async def analyze_project(request: Request):
@@ -369,6 +537,10 @@ async def analyze_project(request: Request):
     - file: 업로드된 파일
     - url: 분석할 URL
     - text: 분석할 텍스트
+    - mode: "combined"이면 제공된 모든 소스를 동시에 분석하여 병합
+            (쿼리 파라미터 ?mode=combined 또는 JSON "mode" 키도 가능)
+    
+    기본 모드에서는 file > url > text 우선순위로 하나만 분석합니다.
     
     Returns:
         {
@@ -381,101 +553,38 @@ async def analyze_project(request: Request):
                 "achievements": ["개발 효율 30% 증가", "성과2"],
                 "tools": ["React", "Node.js"],
                 "description": "상세 내용"
-            }
+            },
+            "provenance": {"title": "file", "tools": ["file", "url"], ...},  # combined 모드
+            "sources": {"file": "analyzed", "url": "analyzed"}  # combined 모드
         }
     """
     try:
-        # Content-Type 헤더 확인
-        content_type = request.headers.get("content-type", "")
+        file, url, text, mode = await read_analyze_inputs(request)
+        mode = request.query_params.get("mode") or mode
         
-        # multipart/form-data인 경우
-        if "multipart/form-data" in content_type:
-            # 원시 body를 직접 읽기
-            body = await request.body()
-            
-            # boundary 추출
-            boundary = None
-            if "boundary=" in content_type:
-                boundary = content_type.split("boundary=")[1].strip()
-            
-            if not boundary:
-                raise HTTPException(status_code=400, detail="boundary not found")
-            
-            # multipart 데이터를 수동으로 파싱
-            file_data, url_data, text_data = parse_multipart_manually(body, boundary)
-            
-            # analyze_project_from_formdata 호출
-            if file_data:
-                # bytes를 파일처럼 처리
-                file_like = io.BytesIO(file_data['content'])
-                file_like.name = file_data.get('filename', 'uploaded_file')
-                file_like.filename = file_data.get('filename', 'uploaded_file')
-                file_like.file = file_like  # shutil.copyfileobj를 위해 자기 자신을 file 속성으로 설정
-                metadata = analyze_project_from_formdata(
-                    file=file_like,
-                    url=None,
-                    text=None
-                )
-            elif url_data:
-                metadata = analyze_project_from_formdata(
-                    file=None,
-                    url=url_data,
-                    text=None
-                )
-            elif text_data:
-                metadata = analyze_project_from_formdata(
-                    file=None,
-                    url=None,
-                    text=text_data
-                )
-            else:
-                raise HTTPException(status_code=400, detail="No file, url, or text provided")
+        if not ((file and getattr(file, "filename", None)) or url or text):
+            raise HTTPException(status_code=400, detail="No file, url, or text provided")
         
-        # JSON인 경우
-        elif "application/json" in content_type:
-            data = await request.json()
-            metadata = analyze_project_from_formdata(
-                file=None,
-                url=data.get("url"),
-                text=data.get("text")
-            )
+        # 파일 분석 모듈(LangChain, 링크 수집, HTML 추출)은 첫 분석 요청에서 import (서버 시작 시간 단축)
+        from app.services.file_analysis import analyze_project_from_formdata
         
-        # 일반 form-data인 경우 (기존 방식 - Direct 호출)
-        else:
-            try:
-                form = await request.form()
-                file = form.get("file")
-                url = form.get("url")
-                text = form.get("text")
-                metadata = analyze_project_from_formdata(file, url, text)
-            except Exception as form_error:
-                print(f"Form 파싱 실패, multipart 수동 파싱 시도: {form_error}")
-                # Form 파싱 실패 시 multipart 수동 파싱 시도
-                body = await request.body()
-                boundary = None
-                if "boundary=" in content_type:
-                    boundary = content_type.split("boundary=")[1].strip()
-                
-                if boundary:
-                    file_data, url_data, text_data = parse_multipart_manually(body, boundary)
-                    if file_data:
-                        file_like = io.BytesIO(file_data['content'])
-                        file_like.name = file_data.get('filename', 'uploaded_file')
-                        file_like.filename = file_data.get('filename', 'uploaded_file')
-                        file_like.file = file_like  # shutil.copyfileobj를 위해 자기 자신을 file 속성으로 설정
-                        metadata = analyze_project_from_formdata(file=file_like, url=None, text=None)
-                    elif url_data:
-                        metadata = analyze_project_from_formdata(file=None, url=url_data, text=None)
-                    elif text_data:
-                        metadata = analyze_project_from_formdata(file=None, url=None, text=text_data)
-                    else:
-                        raise HTTPException(status_code=400, detail="No file, url, or text provided")
-                else:
-                    raise form_error
+        # 같은 입력(파일 내용 해시, 파일명, url, text, mode)의 분석이 진행 중이면 그 결과를 함께 사용
+        # 업로드 전체를 읽는 해시 계산은 이벤트 루프를 막지 않도록 스레드에서 실행
+        upload_hash = await asyncio.to_thread(hash_upload, file)
+        key = make_key("analyze", upload_hash, getattr(file, "filename", None), url, text, mode)
+        metadata = await analysis_flight.do(
+            key, asyncio.to_thread, analyze_project_from_formdata, file, url, text, mode
+        )
         
         # 응답 형식 맞추기 (status 제거하고 project만 반환)
         if "project" in metadata:
-            return {"project": metadata["project"]}
+            # 사용자 프로젝트 인덱스에 백그라운드로 반영
+            schedule_index_project(get_user_id(request), metadata["project"])
+            response_data = {"project": metadata["project"]}
+            if mode == "combined":
+                response_data["provenance"] = metadata.get("provenance", {})
+                response_data["sources"] = metadata.get("sources", {})
+            return response_data
         else:
             # 에러가 발생한 경우
             return {
@@ -533,19 +642,19 @@ async def refine_project(request: Request):
             session_id = str(uuid.uuid4())
             
             # 챗봇 처리 (첫 메시지)
-            result = process_project_refine_chatbot(
+            result = await asyncio.to_thread(
+                process_project_refine_chatbot,
                 project=refine_req.project,
                 user_message=None,
                 conversation_history=[]
             )
             
             # 세션 저장 (내부 관리용)
-            sessions[session_id] = {
-                "project": result.get("project", refine_req.project),
-                "conversation_history": [],
-                "status": result.get("status", "conversing"),
-                "created_at": datetime.now().isoformat()
-            }
+            get_shared_store().put_session(session_id, RefineSession(
+                project=result.get("project", refine_req.project),
+                user_id=get_user_id(request),
+                status=result.get("status", "conversing")
+            ))
             
             # 응답: message만 반환 (session_id 없음)
             return {
@@ -565,39 +674,35 @@ async def refine_project(request: Request):
             if not session_id:
                 session_id = request.cookies.get("session_id")
             
+            store = get_shared_store()
+            session = store.get_session(session_id) if session_id else None
+            
             # 여전히 없으면 가장 최근 세션 사용 (임시 해결책)
-            if not session_id or session_id not in sessions:
-                # 가장 최근 세션 찾기
-                if sessions:
-                    session_id = max(sessions.keys(), key=lambda k: sessions[k].get("created_at", ""))
-                else:
+            if not isinstance(session, RefineSession):
+                latest = store.latest_session(RefineSession.kind)
+                if latest is None:
                     raise HTTPException(status_code=400, detail="세션을 찾을 수 없습니다. 먼저 START 요청을 보내주세요.")
-            
-            session = sessions[session_id]
+                session_id, session = latest
             
             # 대화 히스토리 업데이트
             if body.get("answer"):
-                session["conversation_history"].append({
-                    "role": "user",
-                    "content": body.get("answer")
-                })
+                session.history.append(Turn.user(body["answer"]))
             
             # 챗봇 처리
-            result = process_project_refine_chatbot(
-                project=session["project"],
+            result = await asyncio.to_thread(
+                process_project_refine_chatbot,
+                project=session.project,
                 user_message=body.get("answer"),
-                conversation_history=session["conversation_history"]
+                conversation_history=session.history
             )
             
             # 세션 업데이트
-            session["project"] = result.get("project", session["project"])
+            session.project = result.get("project", session.project)
             
             # AI 응답을 대화 히스토리에 추가
             if result.get("message"):
-                session["conversation_history"].append({
-                    "role": "assistant",
-                    "content": result.get("message")
-                })
+                session.history.append(Turn.assistant(result["message"]))
+            store.put_session(session_id, session)
             
             # 응답 구성
             response_data = {
@@ -608,6 +713,8 @@ async def refine_project(request: Request):
             message = result.get("message", "")
             if result.get("project") and ("보강했어" in message or "저장되었습니다" in message):
                 response_data["project"] = result.get("project")
+                # 수정이 끝난 프로젝트를 사용자 인덱스에 반영
+                schedule_index_project(session.user_id or get_user_id(request), result.get("project"))
             
             return response_data
         
@@ -622,6 +729,82 @@ async def refine_project(request: Request):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"서버 오류: {str(e)}")
 
+@app.get("/ai/projects/search")
+async def search_user_projects(request: Request, q: str, k: int = 5):
+    """
+    사용자 프로젝트 인덱스에서 q와 관련 있는 프로젝트를 검색합니다.
+    백엔드를 거친 요청만 허용합니다 (X-User-Id + X-Internal-Token, get_user_id 참고).
+    
+    Returns:
+        {"results": [{"key", "score", "project": 저장된 프로젝트}]}
+    """
+    user_id = get_user_id(request)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="인증된 사용자 정보가 필요합니다.")
+    try:
+        results = await asyncio.to_thread(search_projects, user_id, q, max(1, min(k, 20)))
+        return {"results": results}
+    except Exception as e:
+        print(f"프로젝트 검색 오류: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"프로젝트 검색 오류: {str(e)}")
+
+@app.on_event("startup")
+async def start_file_gc():
+    """생성 파일의 만료 정리(GC) 스레드를 시작합니다."""
+    get_file_storage(resumes_dir).start_sweeper()
+
+@app.on_event("shutdown")
+async def stop_file_gc():
+    get_file_storage(resumes_dir).stop_sweeper()
+
+@app.on_event("startup")
+async def check_pdf_font():
+    """PDF용 한글 글꼴이 없으면 시작할 때 알립니다 (PDF 요청은 Word로 대체됨)."""
+    if not pdf_available():
+        print("❌ PDF용 한글 글꼴이 없습니다. PDF 내보내기는 Word로 대체됩니다. "
+              "fonts-nanum을 설치하거나(nixpacks.toml) PDF_FONT_PATH로 TrueType 글꼴을 지정해주세요.")
+
+@app.on_event("startup")
+async def prepare_shared_store():
+    """만료된 세션/캐시를 정리하고, 이전 버전의 세션 스냅샷이 있으면 공유 저장소로 옮깁니다."""
+    store = get_shared_store()
+    try:
+        removed = store.expire()
+        if removed:
+            print(f"만료된 세션/캐시 {removed}개 삭제")
+    except Exception as e:
+        print(f"공유 저장소 정리 오류: {str(e)}")
+    
+    # 여러 워커가 동시에 시작해도 파일 이름을 먼저 바꾼 한 워커만 옮김
+    migrating_path = SESSION_SNAPSHOT_PATH.with_suffix(".migrating")
+    try:
+        os.replace(SESSION_SNAPSHOT_PATH, migrating_path)
+    except OSError:
+        return
+    try:
+        restored = load_sessions(migrating_path)
+        for session_id, session in restored.items():
+            store.put_session(session_id, session)
+        migrating_path.unlink()
+        print(f"세션 스냅샷 {len(restored)}개를 공유 저장소로 옮김")
+    except Exception as e:
+        print(f"세션 스냅샷 이전 오류: {str(e)}")
+
+@app.on_event("shutdown")
+async def drain_background_work():
+    """
+    진행 중인 백그라운드 작업(렌더링, 인덱싱, 분석)이 끝나기를 기다린 뒤 종료합니다.
+    
+    처리 중인 요청은 서버가 먼저 기다려 주므로(gunicorn graceful_timeout), 여기서는 요청과 분리된 작업만 정리합니다.
+    선행 생성은 결과를 쓸 턴이 없으므로 버립니다.
+    """
+    for speculation in speculations.values():
+        speculation.discard()
+    speculations.clear()
+    result = await asyncio.to_thread(drain_pools, SHUTDOWN_DRAIN_SECONDS)
+    if not result["drained"]:
+        print(f"⚠️ 백그라운드 작업이 {SHUTDOWN_DRAIN_SECONDS:.0f}초 안에 끝나지 않아 종료합니다: {result['pools']}")
+
 @app.get("/")
 async def root():
     return {"message": "AI Server is running"}
@@ -630,29 +813,95 @@ async def root():
 async def health():
     return {"status": "healthy"}
 
+@app.get("/ai/stats")
+async def stats():
+    """요청 병합 등 서버 내부 통계"""
+    return {
+        "analysis": {**analysis_flight.stats, "inflight": analysis_flight.inflight},
+        "files": get_file_storage(resumes_dir).usage(),
+        "exports": export_stats(),
+        "speculation": speculation_stats(),
+        "chatbot": transition_stats(),
+        "sessions": get_shared_store().usage(),
+        "worker": os.getpid()
+    }
+
 # 파일 다운로드 엔드포인트
-@app.get("/files/resumes/{filename}")
-async def download_resume(filename: str):
+@app.get("/files/resumes/{file_id}")
+async def download_resume(file_id: str, request: Request):
     """
     Word 파일 다운로드 엔드포인트
+    
+    인덱스에서 저장 키로 바로 조회하고(만료/제거된 파일은 404),
+    내용 해시 ETag로 재다운로드는 304, Range 요청은 206 부분 응답으로 처리합니다.
+    내용 주소 파일은 immutable 캐시 헤더를 붙여 브라우저/CDN이 반복 요청을 흡수하게 합니다.
     """
     try:
-        file_path = resumes_dir / filename
+        storage = get_file_storage(resumes_dir)
+        entry = storage.get(file_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
         
-        if not file_path.exists():
+        content_hash = await asyncio.to_thread(storage.content_hash, file_id)
+        if content_hash is None:
             raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
         
-        # 파일명에 한글이 포함되어 있을 수 있으므로 FileResponse 사용
-        return FileResponse(
-            path=str(file_path),
-            filename=filename,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        )
+        return build_download_response(request, entry, content_hash, lambda: storage.open(file_id))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"파일 다운로드 오류: {str(e)}")
 
+@app.get("/files/exports/{draft_hash}/{export_format}")
+async def download_export(
+    draft_hash: str,
+    export_format: str,
+    request: Request,
+    template: Optional[str] = None,
+    wait: float = EXPORT_WAIT_SECONDS
+):
+    """
+    자기소개서 형식별 내보내기 엔드포인트 (docx, pdf, html, md)
+    
+    처음 요청된 (초안, 형식, 템플릿)만 렌더링 스레드 풀에서 생성하고,
+    이후 요청과 형식 변경은 캐시된 파일을 그대로 전송합니다.
+    렌더링 중이면 최대 wait초 기다리고, 그래도 끝나지 않으면 202와 Retry-After를 반환합니다 (wait=0이면 바로 확인).
+    """
+    try:
+        future = submit_export(draft_hash, export_format, template, base_dir=resumes_dir)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except KeyError:
+        raise HTTPException(status_code=404, detail="내보낼 자기소개서를 찾을 수 없습니다.")
+    
+    try:
+        wait = min(max(wait, 0.0), EXPORT_WAIT_SECONDS)
+        if not future.done():
+            try:
+                # shield: 대기 시간이 지나도 렌더링 작업은 계속 진행
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout=wait)
+            except asyncio.TimeoutError:
+                return JSONResponse(
+                    status_code=202,
+                    content={"status": "pending", "message": "파일을 생성하고 있습니다. 잠시 후 다시 요청해주세요."},
+                    headers={"Retry-After": "1", "Location": str(request.url)}
+                )
+        file_id = future.result()
+        storage = get_file_storage(resumes_dir)
+        entry = storage.get(file_id)
+        if entry is None:
+            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+        
+        content_hash = await asyncio.to_thread(storage.content_hash, file_id)
+        if content_hash is None:
+            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+        
+        return build_download_response(request, entry, content_hash, lambda: storage.open(file_id))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"내보내기 오류: {str(e)}")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
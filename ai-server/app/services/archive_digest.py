@@ -0,0 +1,293 @@
+"""
+소스 코드 압축 파일 요약 서비스
+업로드된 .zip / .tar.gz 저장소 스냅샷을 디스크에 풀지 않고 항목을 스트리밍으로 순회하며
+언어별 LOC 통계, 매니페스트 기반 프레임워크 감지, README와 핵심 파일 발췌로 이루어진
+요약(digest)을 만듭니다. LLM에는 이 요약만 전달합니다.
+"""
+
+import re
+import json
+import tarfile
+import zipfile
+import posixpath
+from typing import Dict, Any, List, Optional, Iterator, Tuple, BinaryIO
+
+from app.services.token_estimate import estimate_tokens, truncate_to_tokens
+
+# 확장자 → 언어
+LANGUAGE_EXTENSIONS = {
+    ".py": "Python", ".ipynb": "Jupyter Notebook",
+    ".js": "JavaScript", ".jsx": "JavaScript", ".mjs": "JavaScript", ".cjs": "JavaScript",
+    ".ts": "TypeScript", ".tsx": "TypeScript",
+    ".vue": "Vue", ".svelte": "Svelte",
+    ".java": "Java", ".kt": "Kotlin", ".kts": "Kotlin", ".scala": "Scala",
+    ".go": "Go", ".rs": "Rust", ".rb": "Ruby", ".php": "PHP",
+    ".cs": "C#", ".cpp": "C++", ".cc": "C++", ".hpp": "C++", ".c": "C", ".h": "C",
+    ".swift": "Swift", ".m": "Objective-C", ".dart": "Dart", ".r": "R",
+    ".html": "HTML", ".css": "CSS", ".scss": "SCSS", ".sass": "SCSS",
+    ".sql": "SQL", ".sh": "Shell", ".ps1": "PowerShell",
+}
+
+# 통계/발췌에서 제외하는 디렉토리
+SKIP_DIRS = {
+    "node_modules", ".git", "dist", "build", "out", "venv", ".venv", "env", "__pycache__",
+    ".next", ".nuxt", "target", ".idea", ".vscode", "vendor", ".gradle", "Pods", "coverage", "__MACOSX"
+}
+
+# 의존성 매니페스트 파일
+MANIFEST_FILES = {
+    "package.json", "requirements.txt", "pyproject.toml", "Pipfile", "setup.py",
+    "pom.xml", "build.gradle", "build.gradle.kts", "go.mod", "Cargo.toml",
+    "Gemfile", "composer.json", "pubspec.yaml"
+}
+
+# 진입점/핵심 파일 이름
+ENTRYPOINT_FILES = {
+    "main.py", "app.py", "manage.py", "server.py", "wsgi.py", "asgi.py",
+    "index.js", "index.ts", "server.js", "server.ts", "app.js", "app.ts", "main.js", "main.ts",
+    "App.jsx", "App.tsx", "App.vue", "main.go", "main.rs", "lib.rs",
+    "Application.java", "Main.java", "Program.cs", "main.dart",
+    "Dockerfile", "docker-compose.yml", "docker-compose.yaml"
+}
+
+README_PATTERN = re.compile(r"^readme(\.(md|markdown|rst|txt))?$", re.IGNORECASE)
+
+# 매니페스트 의존성 이름 → 프레임워크/라이브러리 표시 이름
+NPM_FRAMEWORKS = {
+    "react": "React", "next": "Next.js", "vue": "Vue.js", "nuxt": "Nuxt", "@angular/core": "Angular",
+    "svelte": "Svelte", "express": "Express", "@nestjs/core": "NestJS", "react-native": "React Native",
+    "expo": "Expo", "electron": "Electron", "vite": "Vite", "tailwindcss": "Tailwind CSS",
+    "typescript": "TypeScript", "redux": "Redux", "@reduxjs/toolkit": "Redux Toolkit", "recoil": "Recoil",
+    "zustand": "Zustand", "@tanstack/react-query": "React Query", "prisma": "Prisma", "mongoose": "Mongoose",
+    "socket.io": "Socket.IO", "three": "Three.js", "graphql": "GraphQL", "firebase": "Firebase",
+    "@supabase/supabase-js": "Supabase", "styled-components": "styled-components", "jest": "Jest"
+}
+PYTHON_FRAMEWORKS = {
+    "django": "Django", "fastapi": "FastAPI", "flask": "Flask", "streamlit": "Streamlit",
+    "torch": "PyTorch", "tensorflow": "TensorFlow", "keras": "Keras", "scikit-learn": "scikit-learn",
+    "pandas": "pandas", "numpy": "NumPy", "langchain": "LangChain", "openai": "OpenAI API",
+    "sqlalchemy": "SQLAlchemy", "celery": "Celery", "transformers": "Hugging Face Transformers",
+    "pytest": "pytest", "selenium": "Selenium", "beautifulsoup4": "BeautifulSoup"
+}
+# 매니페스트 본문에 포함된 문자열로 감지 (Java/Go/Rust/Ruby/PHP/Dart)
+TEXT_FRAMEWORKS = {
+    "pom.xml": {"spring-boot": "Spring Boot", "hibernate": "Hibernate", "mybatis": "MyBatis", "junit": "JUnit"},
+    "build.gradle": {"spring-boot": "Spring Boot", "com.android": "Android", "mybatis": "MyBatis", "junit": "JUnit"},
+    "build.gradle.kts": {"spring-boot": "Spring Boot", "com.android": "Android", "ktor": "Ktor"},
+    "go.mod": {"gin-gonic/gin": "Gin", "labstack/echo": "Echo", "gofiber/fiber": "Fiber", "gorm.io": "GORM"},
+    "Cargo.toml": {"actix-web": "Actix Web", "axum": "Axum", "rocket": "Rocket", "tokio": "Tokio"},
+    "Gemfile": {"rails": "Ruby on Rails", "sinatra": "Sinatra"},
+    "composer.json": {"laravel/framework": "Laravel", "symfony/": "Symfony"},
+    "pubspec.yaml": {"flutter": "Flutter", "firebase": "Firebase"},
+}
+
+PYTHON_REQUIREMENT_PATTERN = re.compile(r"^\s*([A-Za-z0-9_.\-]+)", re.MULTILINE)
+
+# 순회/읽기 상한
+MAX_ENTRIES = 20000
+MAX_FILE_BYTES = 5 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+# 발췌 예산 (토큰 수는 token_estimate 기준으로 어림)
+TOKEN_BUDGET = 6000
+# 남은 예산이 이보다 작으면 더 발췌하지 않음
+MIN_EXCERPT_TOKENS = 50
+README_MAX_CHARS = 8000
+KEY_FILE_MAX_CHARS = 3000
+
+
+def _iter_zip(file_path: str) -> Iterator[Tuple[str, int, BinaryIO]]:
+    """zip 항목을 (경로, 크기, 스트림)으로 순회합니다."""
+    with zipfile.ZipFile(file_path) as archive:
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            with archive.open(info) as stream:
+                yield info.filename, info.file_size, stream
+
+
+def _iter_tar(file_path: str) -> Iterator[Tuple[str, int, BinaryIO]]:
+    """tar(.gz/.bz2/.xz) 항목을 스트리밍 모드로 (경로, 크기, 스트림) 순회합니다."""
+    with tarfile.open(file_path, mode="r|*") as archive:
+        for member in archive:
+            if not member.isfile():
+                continue
+            stream = archive.extractfile(member)
+            if stream is None:
+                continue
+            yield member.name, member.size, stream
+
+
+def _is_skipped(parts: List[str]) -> bool:
+    """의존성/빌드 산출물/숨김 디렉토리 아래 항목인지 확인합니다."""
+    return any(part in SKIP_DIRS or (part.startswith(".") and part != ".github") for part in parts[:-1])
+
+
+def _key_file_priority(name: str) -> Optional[int]:
+    """발췌할 핵심 파일의 우선순위 (작을수록 우선, 대상이 아니면 None)."""
+    if README_PATTERN.match(name):
+        return 0
+    if name in MANIFEST_FILES:
+        return 1
+    if name in ENTRYPOINT_FILES:
+        return 2
+    return None
+
+
+def _detect_frameworks(name: str, content: str) -> List[str]:
+    """매니페스트 내용에서 프레임워크/라이브러리를 감지합니다."""
+    found = []
+    if name == "package.json":
+        try:
+            package = json.loads(content)
+        except ValueError:
+            return found
+        dependencies = {}
+        for key in ("dependencies", "devDependencies", "peerDependencies"):
+            if isinstance(package.get(key), dict):
+                dependencies.update(package[key])
+        found.extend(label for dep, label in NPM_FRAMEWORKS.items() if dep in dependencies)
+    elif name in ("requirements.txt", "pyproject.toml", "Pipfile", "setup.py"):
+        names = {match.lower().replace("_", "-") for match in PYTHON_REQUIREMENT_PATTERN.findall(content)}
+        lowered = content.lower()
+        for dep, label in PYTHON_FRAMEWORKS.items():
+            if dep in names or f'"{dep}' in lowered or f"'{dep}" in lowered:
+                found.append(label)
+    elif name in TEXT_FRAMEWORKS:
+        lowered = content.lower()
+        found.extend(label for marker, label in TEXT_FRAMEWORKS[name].items() if marker.lower() in lowered)
+    return found
+
+
+def build_archive_digest(file_path: str, archive_format: Optional[str] = None, token_budget: int = TOKEN_BUDGET) -> Dict[str, Any]:
+    """
+    소스 코드 압축 파일을 한 번 순회하여 요약을 만듭니다.
+
+    Args:
+        file_path: 압축 파일 경로
+        archive_format: "zip" 또는 "tar" (없으면 zip 여부로 판별)
+        token_budget: README/핵심 파일 발췌에 사용할 토큰 예산
+
+    Returns:
+        {
+            "digest": LLM에 전달할 요약 텍스트,
+            "languages": {언어: LOC},
+            "frameworks": [감지된 프레임워크],
+            "file_count": 파일 수,
+            "loc": 전체 LOC
+        }
+    """
+    if archive_format is None:
+        archive_format = "zip" if zipfile.is_zipfile(file_path) else "tar"
+    entries = _iter_zip(file_path) if archive_format == "zip" else _iter_tar(file_path)
+
+    languages: Dict[str, int] = {}
+    directories: Dict[Tuple[str, ...], int] = {}
+    frameworks: List[str] = []
+    candidates: List[Dict[str, Any]] = []
+    file_count = 0
+    min_depth = None
+
+    for index, (path, size, stream) in enumerate(entries):
+        if index >= MAX_ENTRIES:
+            break
+        parts = [part for part in path.replace("\\", "/").split("/") if part and part != "."]
+        if not parts or _is_skipped(parts):
+            continue
+
+        file_count += 1
+        depth = len(parts)
+        min_depth = depth if min_depth is None else min(min_depth, depth)
+        # 저장소 루트 폴더("repo-main/") 유무를 모르므로 상위 두 단계까지 집계 후 정리
+        directory_key = tuple(parts[:min(depth - 1, 2)])
+        if directory_key:
+            directories[directory_key] = directories.get(directory_key, 0) + 1
+
+        name = parts[-1]
+        extension = posixpath.splitext(name)[1].lower()
+        language = LANGUAGE_EXTENSIONS.get(extension)
+        priority = _key_file_priority(name)
+        if (language is None and priority is None) or size > MAX_FILE_BYTES or name.endswith(".min.js"):
+            continue
+
+        # 한 번 읽으면서 LOC 계산과 발췌용 앞부분 보관을 함께 처리
+        # (매니페스트는 JSON 파싱/프레임워크 감지를 위해 전체를 보관, 크기는 MAX_FILE_BYTES 이하)
+        keep_chars = README_MAX_CHARS if priority == 0 else KEY_FILE_MAX_CHARS
+        head_limit = MAX_FILE_BYTES if priority == 1 else keep_chars * 4
+        head = bytearray()
+        lines = 0
+        while True:
+            chunk = stream.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            lines += chunk.count(b"\n")
+            if priority is not None and len(head) < head_limit:
+                head.extend(chunk[:head_limit - len(head)])
+
+        if language:
+            languages[language] = languages.get(language, 0) + lines
+
+        if priority is not None:
+            content = head.decode("utf-8", errors="replace")
+            if priority == 1:
+                frameworks.extend(label for label in _detect_frameworks(name, content) if label not in frameworks)
+            candidates.append({
+                "parts": parts,
+                "priority": priority,
+                "depth": depth,
+                "content": content[:keep_chars]
+            })
+
+    total_loc = sum(languages.values())
+
+    # 모든 파일이 하나의 루트 폴더 아래 있으면 그 다음 단계를 최상위 디렉토리로 사용
+    root_depth = (min_depth or 1) - 1
+    top_directories: Dict[str, int] = {}
+    for key, count in directories.items():
+        if len(key) > root_depth:
+            top_directories[key[root_depth]] = top_directories.get(key[root_depth], 0) + count
+
+    # 발췌: 우선순위 → 얕은 경로 순으로 예산 안에서 선택
+    excerpts = []
+    remaining_tokens = token_budget
+    readme_taken = False
+    for candidate in sorted(candidates, key=lambda c: (c["priority"], c["depth"], c["parts"])):
+        if candidate["priority"] == 0:
+            if readme_taken:
+                continue
+            readme_taken = True
+        content = candidate["content"].strip()
+        if not content or remaining_tokens <= MIN_EXCERPT_TOKENS:
+            continue
+        content = truncate_to_tokens(content, remaining_tokens)
+        remaining_tokens -= estimate_tokens(content)
+        path = "/".join(candidate["parts"][root_depth:])
+        excerpts.append(f"[{path}]\n{content}")
+
+    summary_lines = [
+        "[저장소 구조 요약]",
+        f"파일 수: {file_count}, 총 코드 라인 수: {total_loc}",
+    ]
+    if languages:
+        language_stats = ", ".join(
+            f"{language} {loc} ({100 * loc // max(total_loc, 1)}%)"
+            for language, loc in sorted(languages.items(), key=lambda item: item[1], reverse=True)
+        )
+        summary_lines.append(f"언어별 코드 라인 수: {language_stats}")
+    if frameworks:
+        summary_lines.append(f"감지된 프레임워크/라이브러리: {', '.join(frameworks)}")
+    if top_directories:
+        ranked = sorted(top_directories.items(), key=lambda item: item[1], reverse=True)[:10]
+        summary_lines.append(f"주요 디렉토리: {', '.join(f'{name}/ ({count})' for name, count in ranked)}")
+
+    digest = "\n".join(summary_lines)
+    if excerpts:
+        digest += "\n\n" + "\n\n".join(excerpts)
+
+    return {
+        "digest": digest,
+        "languages": languages,
+        "frameworks": frameworks,
+        "file_count": file_count,
+        "loc": total_loc
+    }
@@ -0,0 +1,139 @@
+"""
+생성 파일 저장소 서비스
+자기소개서 등 생성된 파일(바이트)을 저장하고 다운로드 시 스트림으로 돌려주는 저장소입니다.
+RESUME_STORAGE 환경 변수로 로컬 디스크("disk", 기본값)와 메모리("memory") 중에서 선택합니다.
+메모리 저장소는 프로세스마다 따로 있으므로 단일 워커에서만 사용합니다 (gunicorn 다중 워커에서는 disk로 바뀜, gunicorn.conf.py).
+"""
+
+import io
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, BinaryIO
+
+# 다운로드 스트리밍 청크 크기
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _is_safe_name(name: str) -> bool:
+    """경로 조작이 없는 단일 파일명인지 확인합니다."""
+    return bool(name) and name not in (".", "..") and os.path.basename(name) == name and "\\" not in name
+
+
+class LocalBlobStore:
+    """로컬 디렉토리에 파일로 저장하는 저장소"""
+
+    def __init__(self, base_dir: Path):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def put(self, name: str, data: bytes) -> None:
+        """데이터를 임시 파일에 쓴 뒤 원자적으로 교체합니다."""
+        if not _is_safe_name(name):
+            raise ValueError(f"잘못된 파일명입니다: {name}")
+        fd, temp_path = tempfile.mkstemp(dir=self.base_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.base_dir / name)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def open(self, name: str) -> Optional[BinaryIO]:
+        path = self.local_path(name)
+        return open(path, "rb") if path else None
+
+    def size(self, name: str) -> Optional[int]:
+        path = self.local_path(name)
+        return path.stat().st_size if path else None
+
+    def local_path(self, name: str) -> Optional[Path]:
+        """파일이 있으면 디스크 경로를 반환합니다 (FileResponse로 바로 전송 가능)."""
+        if not _is_safe_name(name):
+            return None
+        path = self.base_dir / name
+        return path if path.is_file() else None
+
+    def delete(self, name: str) -> None:
+        path = self.local_path(name)
+        if path:
+            path.unlink(missing_ok=True)
+
+
+class MemoryBlobStore:
+    """프로세스 메모리에 바이트로 보관하는 저장소 (디스크 쓰기/읽기 없음)"""
+
+    def __init__(self):
+        self._blobs: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def put(self, name: str, data: bytes) -> None:
+        if not _is_safe_name(name):
+            raise ValueError(f"잘못된 파일명입니다: {name}")
+        with self._lock:
+            self._blobs[name] = bytes(data)
+
+    def open(self, name: str) -> Optional[BinaryIO]:
+        data = self._blobs.get(name)
+        return io.BytesIO(data) if data is not None else None
+
+    def size(self, name: str) -> Optional[int]:
+        data = self._blobs.get(name)
+        return len(data) if data is not None else None
+
+    def local_path(self, name: str) -> Optional[Path]:
+        return None
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self._blobs.pop(name, None)
+
+
+def iter_blob(stream: BinaryIO, start: int = 0, length: Optional[int] = None, chunk_size: int = STREAM_CHUNK_BYTES):
+    """
+    저장소 스트림을 청크 단위로 읽고 끝나면 닫습니다 (StreamingResponse용).
+
+    Args:
+        stream: 저장소에서 연 스트림
+        start: 읽기 시작 위치 (Range 요청)
+        length: 읽을 바이트 수 (None이면 끝까지)
+    """
+    try:
+        if start:
+            stream.seek(start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            chunk = stream.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+    finally:
+        stream.close()
+
+
+_stores: Dict[str, object] = {}
+_stores_lock = threading.Lock()
+
+
+def get_blob_store(base_dir: Path = None):
+    """
+    RESUME_STORAGE 설정에 맞는 저장소를 반환합니다 (디렉토리별로 하나씩 재사용).
+
+    Args:
+        base_dir: 디스크 저장소의 기본 디렉토리 (기본값: files/resumes)
+    """
+    if base_dir is None:
+        base_dir = Path("files") / "resumes"
+    backend = os.getenv("RESUME_STORAGE", "disk").lower()
+    key = f"{backend}:{Path(base_dir).resolve()}"
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = MemoryBlobStore() if backend == "memory" else LocalBlobStore(base_dir)
+            _stores[key] = store
+        return store
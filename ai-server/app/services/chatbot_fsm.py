@@ -0,0 +1,126 @@
+"""
+챗봇 상태 기계(FSM) 엔진
+상태별 분기를 if/elif 대신 선언적 전이 표(Transition 목록)로 정의하고, 한 턴마다 현재 상태의 전이를
+순서대로 검사해 처음 조건(guard)이 맞는 전이의 동작(action)을 실행합니다.
+전이마다 소요 시간을 훅으로 전달하며(기본 훅은 전이별 통계 기록), 세션 상태(CoverLetterSession)는
+session_models의 __slots__ 데이터 클래스로 두어 msgpack 바이너리로 바로 스냅샷/복원할 수 있습니다.
+"""
+
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from app.services.session_models import CoverLetterSession
+
+
+@dataclass(slots=True)
+class TurnContext:
+    """한 턴의 입력과 조건/동작 사이에서 공유하는 값 (같은 LLM 호출을 여러 조건에서 반복하지 않도록)"""
+
+    session: CoverLetterSession
+    message: Optional[str]
+    scratch: Dict[str, Any] = field(default_factory=dict)
+
+
+# 동작은 응답 메시지 또는 {"message", ...추가 응답 키}를 반환
+Action = Callable[[TurnContext], Union[str, Dict[str, Any]]]
+Guard = Callable[[TurnContext], bool]
+
+
+def always(turn: TurnContext) -> bool:
+    return True
+
+
+def has_message(turn: TurnContext) -> bool:
+    return bool(turn.message)
+
+
+@dataclass(frozen=True, slots=True)
+class Transition:
+    """전이 표의 한 행: source 상태에서 guard가 참이면 action을 실행하고 target 상태로 이동"""
+
+    source: str
+    name: str
+    guard: Guard
+    action: Action
+    target: str
+    status: Optional[str] = None  # 응답 status (없으면 target)
+
+
+# 전이 훅: (source, 전이 이름, target, 소요 초)
+TransitionHook = Callable[[str, str, str, float], None]
+
+
+class StateMachine:
+    """전이 표 기반 상태 기계"""
+
+    def __init__(self, transitions: List[Transition]):
+        self.table: Dict[str, Tuple[Transition, ...]] = {}
+        for transition in transitions:
+            self.table[transition.source] = self.table.get(transition.source, ()) + (transition,)
+        self.hooks: List[TransitionHook] = [record_transition]
+
+    @property
+    def states(self) -> List[str]:
+        return list(self.table)
+
+    def add_hook(self, hook: TransitionHook) -> None:
+        """전이가 끝날 때마다 호출할 훅을 등록합니다 (예: 지연 시간 로깅)."""
+        self.hooks.append(hook)
+
+    def step(self, session: CoverLetterSession, message: Optional[str]) -> Dict[str, Any]:
+        """
+        현재 상태의 전이 중 처음 조건이 맞는 전이를 실행하고 세션 상태를 옮깁니다.
+
+        Raises:
+            KeyError: 전이 표에 없는 상태
+            LookupError: 조건이 맞는 전이가 없음 (전이 표의 마지막 행은 always로 두는 것을 권장)
+        """
+        source = session.state
+        transitions = self.table[source]
+        turn = TurnContext(session, message)
+        started = time.perf_counter()
+        for transition in transitions:
+            if not transition.guard(turn):
+                continue
+            reply = transition.action(turn)
+            extra = reply if isinstance(reply, dict) else {"message": reply}
+            session.state = transition.target
+            result = session.result(status=transition.status, **extra)
+            elapsed = time.perf_counter() - started
+            for hook in self.hooks:
+                try:
+                    hook(source, transition.name, transition.target, elapsed)
+                except Exception as e:
+                    print(f"전이 훅 오류: {str(e)}")
+            return result
+        raise LookupError(f"'{source}' 상태에서 실행할 전이가 없습니다.")
+
+
+_stats_lock = threading.Lock()
+_transition_stats: Dict[str, Dict[str, Any]] = {}
+
+
+def record_transition(source: str, name: str, target: str, seconds: float) -> None:
+    """기본 훅: 전이별 실행 횟수와 소요 시간을 기록합니다."""
+    key = f"{source}:{name}"
+    with _stats_lock:
+        entry = _transition_stats.setdefault(key, {"target": target, "count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        entry["count"] += 1
+        entry["total_seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+
+def transition_stats() -> Dict[str, Dict[str, Any]]:
+    """전이별 횟수, 평균/최대 소요 시간(ms)을 반환합니다."""
+    with _stats_lock:
+        return {
+            key: {
+                "target": entry["target"],
+                "count": entry["count"],
+                "avg_ms": round(entry["total_seconds"] / entry["count"] * 1000, 2),
+                "max_ms": round(entry["max_seconds"] * 1000, 2),
+            }
+            for key, entry in _transition_stats.items()
+        }
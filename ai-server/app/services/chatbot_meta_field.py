@@ -1,22 +1,12 @@
 ## 프로젝트 메타데이터 챗봇 AI
 ## file_analysis.py를 통해 분석된 메타데이터를 기반으로 대화를 통해 보완하는 챗봇
 
-import os
 import json
 import re
 from typing import Dict, Any, Optional, List
-from dotenv import load_dotenv
-from openai import OpenAI
 
-# .env 파일 로드
-load_dotenv(verbose=True)
-
-# OpenAI API 키 확인
-openai_api_key = os.getenv("OPENAI_API_KEY")
-if not openai_api_key:
-    raise ValueError("OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다.")
-
-client = OpenAI(api_key=openai_api_key)
+from app.services.openai_client import get_client
+from app.services.state_patch import PATCH_INSTRUCTIONS, format_state, apply_patch
 
 # 필드별 한글 이름 매핑
 FIELD_NAMES = {
@@ -29,6 +19,10 @@ FIELD_NAMES = {
     "description": "상세 설명"
 }
 
+# 대화로 수정하는 필드 (FIELD_NAMES 순서)와 그중 목록 필드
+EDITABLE_FIELDS = list(FIELD_NAMES)
+EDITABLE_LIST_FIELDS = ["tags", "roles", "achievements", "tools"]
+
 # 완료를 나타내는 키워드 (대화 종료 및 최종 확인 요청)
 COMPLETION_KEYWORDS = ["완료", "끝", "종료", "done", "finish", "complete", "미리보기", "끝낼래", "끝내", "끝내기", "그만", "종료할래"]
 # 주의: "저장"과 "save"는 제외 (확인 단계에서 저장 처리하기 위함)
@@ -227,10 +221,15 @@ def extract_and_update_metadata_with_llm(
     conversation_history: List[Dict[str, str]],
     style_change_request: bool = False
 ) -> Dict[str, Any]:
-    """LLM을 사용하여 사용자 메시지에서 메타데이터를 추출하고 업데이트합니다."""
+    """
+    LLM을 사용하여 사용자 메시지에서 메타데이터를 추출하고 업데이트합니다.
+    
+    LLM은 바뀐 필드만 패치로 돌려주고(state_patch), 서버에서 원본을 바꾸지 않고 적용합니다.
+    """
     try:
         project = metadata.get("project", {})
-        current_metadata_str = json.dumps(project, ensure_ascii=False, indent=2)
+        # 수정 대상 필드만 한 줄 JSON으로 전달
+        current_metadata_str = format_state(project, EDITABLE_FIELDS)
         
         # 대화 히스토리 요약
         history_summary = "\n".join([
@@ -275,17 +274,17 @@ def extract_and_update_metadata_with_llm(
 5. description은 "문제→해결→결과" 형식으로 구조화
 6. 기존 값 유지, 새 정보만 업데이트
 
+목록 필드: tags, roles, achievements, tools (나머지는 문자열)
+{PATCH_INSTRUCTIONS}
+
 JSON 응답:
 {{
-  "updated_metadata": {{
-    "title": "...", "category": "...", "tags": [], "roles": [],
-    "achievements": [], "tools": [], "description": "..."
-  }},
+  "patch": {{"set": {{}}, "add": {{}}, "remove": {{}}}},
   "response_message": "자연스러운 대화 메시지 (인사이트형 질문 포함)",
   "needs_more_info": true/false
 }}"""
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "user", "content": prompt}
@@ -297,23 +296,9 @@ JSON 응답:
         
         result = json.loads(response.choices[0].message.content)
         
-        # 메타데이터 업데이트 (null이 아닌 값만 업데이트)
-        updated_metadata = json.loads(json.dumps(metadata))
-        project = updated_metadata.get("project", {})
-        
-        llm_metadata = result.get("updated_metadata", {})
-        
-        for field, value in llm_metadata.items():
-            if value is not None:
-                if isinstance(value, list) and len(value) > 0:
-                    # 배열 필드: 기존 값과 병합 (중복 제거)
-                    existing = set(project.get(field, []))
-                    new_values = set(value)
-                    project[field] = list(existing | new_values)
-                elif not isinstance(value, list) and value != "":
-                    # 단일 값 필드
-                    project[field] = value
-        
+        # 바뀐 필드만 적용 (원본은 그대로, 바뀐 목록만 새로 만듦)
+        project, _ = apply_patch(project, result.get("patch") or {}, EDITABLE_FIELDS, EDITABLE_LIST_FIELDS)
+        updated_metadata = dict(metadata)
         updated_metadata["project"] = project
         
         return {
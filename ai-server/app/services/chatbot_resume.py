@@ -3,25 +3,15 @@
 ## 넥스터(자기소개서 챗봇)를 통해 사용자와 대화하며 자기소개서를 작성합니다.
 
 import os
+import re
 import json
-import uuid
-from datetime import datetime
 from typing import Dict, Any, Optional, List
-from pathlib import Path
-from dotenv import load_dotenv
-from openai import OpenAI
-from fpdf import FPDF
-from docx import Document
-
-# .env 파일 로드
-load_dotenv(verbose=True)
-
-# OpenAI API 키 확인
-openai_api_key = os.getenv("OPENAI_API_KEY")
-if not openai_api_key:
-    raise ValueError("OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다.")
-
-client = OpenAI(api_key=openai_api_key)
+from app.services.openai_client import get_client
+from app.services.project_ranking import build_prompt_data
+from app.services.state_patch import PATCH_INSTRUCTIONS, format_state, copy_state, apply_patch
+from app.services.draft_speculation import Speculation, start_speculation, speculation_executor
+from app.services.chatbot_fsm import StateMachine, Transition, TurnContext, always, has_message
+from app.services.session_models import CoverLetterSession, Turn
 
 # 자기소개서 필드 정의
 COVER_LETTER_FIELDS = {
@@ -35,12 +25,63 @@ COVER_LETTER_FIELDS = {
     "future_plans": "향후 계획"
 }
 
+# 목록 값을 갖는 자기소개서 필드
+COVER_LETTER_LIST_FIELDS = ["skills", "achievements", "strengths"]
+
 # 완료를 나타내는 키워드
 COMPLETION_KEYWORDS = ["완료", "저장", "끝", "종료", "done", "save", "finish", "complete"]
 
 # 확인을 나타내는 키워드
 CONFIRMATION_KEYWORDS = ["맞아", "네", "예", "ok", "okay", "좋아", "맞아요", "네요", "예요", "그래", "그래요", "확인", "yes", "y"]
 
+# 초안 생성 실패 시 반환하는 문구
+DRAFT_ERROR_MESSAGE = "자기소개서 초안 생성 중 오류가 발생했습니다."
+
+# 기본 문체 (문체 선택 단계에 들어서면 이 문체로 초안을 미리 생성)
+DEFAULT_WRITING_STYLE = "자연스럽고 전문적인"
+
+# 여러 문체 초안 모드에서 한 번에 생성하는 문체 (DRAFT_VARIANTS=1이면 항상 사용)
+STYLE_VARIANTS = ["자연스럽고 전문적인", "격식 있는", "친근한"]
+VARIANTS_MODE_DEFAULT = os.getenv("DRAFT_VARIANTS", "0") == "1"
+
+# 문체 이름 대신 쓰는 표현 (예: "친근하게" → 친근한)
+STYLE_ALIASES = {
+    "자연스럽고 전문적인": ["자연스럽", "전문적"],
+    "격식 있는": ["격식", "공식적"],
+    "친근한": ["친근", "편안"],
+}
+
+# 초안 수정 단계에서 문체 전환으로 보는 표현: 문체를 가리키는 말 전체 (공백 제거 후 비교)
+STYLE_SWITCH_NAMES = {
+    "자연스럽고 전문적인": ["자연스럽고전문적인", "자연스럽고전문적", "기본", "기본문체"],
+    "격식 있는": ["격식있는", "격식있게", "격식체", "공식적인"],
+    "친근한": ["친근한", "친근하게", "친근체"],
+}
+# "친근한 버전으로 바꿔줘", "격식 있는 걸로 보여줘", "친근하게 바꿔줘"처럼 명시적으로 전환을 요청하는 문장
+STYLE_SWITCH_PATTERN = re.compile(r"^(?P<style>.+?)(버전|문체|스타일|초안|걸|것)?(으?로)?(바꿔|보여|전환|변경)")
+# 초안 내용을 고쳐 달라는 요청 (문체 이름이 들어 있어도 전환하지 않고 수정)
+MODIFICATION_KEYWORDS = ["수정", "고쳐", "빼", "넣어", "추가", "삭제", "줄여", "늘려", "다듬", "강조", "표현", "느낌"]
+
+# 여러 문체 초안을 요청하는 표현 ("프로젝트 경험을 모두 강조해줘"처럼 문체와 무관한 "모두"는 제외)
+VARIANTS_REQUEST_PATTERN = re.compile(
+    r"(여러|모든|세|3|전부|다양한)\s*(가지|개)?\s*(의\s*)?(문체|스타일|버전|초안)"
+    r"|(문체|스타일|버전|초안)\S*\s*(별로|마다|모두|전부|다|(여러|세|3)\s*(가지|개))?\s*(보여|비교|만들어)"
+    r"|^(다|전부|모두)\s*(보여|비교)"
+)
+
+# 문체를 맡기는 응답 키워드 (메시지 어디에 있어도 기본 문체 사용)
+ANY_STYLE_KEYWORDS = ["아무거나", "아무 거나", "상관없", "알아서"]
+
+# 메시지 전체가 이 표현일 때만 기본 문체로 봄 ("기본적인 톤으로", "company culture"처럼 다른 말의 일부는 제외)
+DEFAULT_STYLE_REPLY_PATTERN = re.compile(
+    r"^(기본|기본값|기본\s*문체|기본\s*스타일|default|any|anything)"
+    r"(\s*으?로)?(\s*(해\s*줘|해\s*주세요|할게요|요|please))?[\s.!~]*$",
+    re.IGNORECASE
+)
+
+# PDF 내보내기를 나타내는 키워드
+PDF_EXPORT_KEYWORDS = ["pdf", "피디에프"]
+
 # 자기소개서 작성 의도 확인 키워드
 COVER_LETTER_INTENT_KEYWORDS = ["자기소개서", "자소서", "지원서", "cover letter", "이력서", "resume"]
 
@@ -65,6 +106,73 @@ def is_confirmation(user_message: str) -> bool:
     message_lower = user_message.strip().lower()
     return any(keyword in message_lower for keyword in CONFIRMATION_KEYWORDS)
 
+def is_default_style_choice(user_message: Optional[str]) -> bool:
+    """사용자가 기본 문체를 골랐거나 문체를 맡겼는지 확인합니다."""
+    if not user_message:
+        return False
+    message = user_message.strip().lower()
+    compact = message.replace(" ", "")
+    return (compact.startswith(DEFAULT_WRITING_STYLE.replace(" ", ""))
+            or bool(DEFAULT_STYLE_REPLY_PATTERN.match(message))
+            or any(keyword in message for keyword in ANY_STYLE_KEYWORDS))
+
+def is_variants_request(user_message: Optional[str]) -> bool:
+    """사용자가 여러 문체의 초안을 한 번에 보고 싶어 하는지 확인합니다."""
+    if not user_message:
+        return False
+    return bool(VARIANTS_REQUEST_PATTERN.search(user_message.strip()))
+
+def match_variant_style(user_message: Optional[str], styles) -> Optional[str]:
+    """사용자 메시지가 가리키는 문체를 styles 중에서 찾습니다 (없으면 None)."""
+    if not user_message or not styles:
+        return None
+    compact = user_message.replace(" ", "")
+    for style in styles:
+        aliases = STYLE_ALIASES.get(style, []) + [style.replace(" ", "")]
+        if any(alias in compact for alias in aliases):
+            return style
+    return None
+
+def requested_variant_style(user_message: Optional[str], styles) -> Optional[str]:
+    """
+    초안 수정 단계에서 다른 문체로 전환을 명시적으로 요청했으면 그 문체를 반환합니다.
+
+    문체 이름만 보내거나("친근한") "…로 바꿔줘/보여줘" 형태일 때만 전환하고,
+    "격식 있는 표현은 빼줘", "더 전문적으로 고쳐줘"처럼 내용을 고치는 요청이면 None입니다.
+    """
+    if not user_message or not styles:
+        return None
+    if any(keyword in user_message for keyword in MODIFICATION_KEYWORDS):
+        return None
+    compact = re.sub(r"[\s.,!?~]", "", user_message)
+    match = STYLE_SWITCH_PATTERN.match(compact)
+    target = match.group("style") if match else compact
+    for style in styles:
+        if target == style.replace(" ", "") or target in STYLE_SWITCH_NAMES.get(style, []):
+            return style
+    return None
+
+def speculate_default_draft(cover_letter_data: Dict[str, Any]) -> Optional[Speculation]:
+    """기본 문체 초안을 백그라운드에서 미리 생성합니다 (문체 선택 대기 시간 활용)."""
+    return start_speculation(
+        DEFAULT_WRITING_STYLE,
+        generate_cover_letter_draft,
+        copy_state(cover_letter_data),
+        DEFAULT_WRITING_STYLE
+    )
+
+def detect_export_format(user_message: Optional[str]) -> str:
+    """사용자 메시지에서 내보낼 파일 형식을 판단합니다 ("pdf" 또는 기본값 "docx")."""
+    if not user_message:
+        return "docx"
+    message_lower = user_message.strip().lower()
+    return "pdf" if any(keyword in message_lower for keyword in PDF_EXPORT_KEYWORDS) else "docx"
+
+def export_progress_message(export_format: str) -> str:
+    """파일 생성 중 안내 메시지를 반환합니다."""
+    label = "PDF" if export_format == "pdf" else "Word"
+    return f"완료✅\n\n{label} 파일을 생성 중입니다..."
+
 def detect_user_intent_with_llm(user_message: str, conversation_context: Optional[str] = None) -> Dict[str, Any]:
     """LLM을 사용하여 사용자의 의도를 파악합니다."""
     try:
@@ -91,7 +199,7 @@ JSON 형식으로 응답하세요:
   "reasoning": "판단 근거"
 }}"""
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "user", "content": prompt}
@@ -210,9 +318,14 @@ def extract_and_update_cover_letter_data_with_llm(
     user_message: str,
     conversation_history: List[Dict[str, str]]
 ) -> Dict[str, Any]:
-    """LLM을 사용하여 사용자 메시지에서 자기소개서 정보를 추출하고 업데이트합니다."""
+    """
+    LLM을 사용하여 사용자 메시지에서 자기소개서 정보를 추출하고 업데이트합니다.
+    
+    LLM은 바뀐 필드만 패치로 돌려주고(state_patch), 서버에서 원본을 바꾸지 않고 적용합니다.
+    """
     try:
-        current_data_str = json.dumps(cover_letter_data, ensure_ascii=False, indent=2)
+        # 수집 대상 필드만 한 줄 JSON으로 전달 (프로젝트 목록 등은 제외)
+        current_data_str = format_state(cover_letter_data, COVER_LETTER_FIELDS)
         
         # 대화 히스토리 요약
         history_summary = "\n".join([
@@ -242,25 +355,19 @@ def extract_and_update_cover_letter_data_with_llm(
 
 사용자가 불완전한 정보를 제공했거나 기억이 안 난다고 하면, 대화를 통해 자연스럽게 추가 정보를 물어보세요.
 
+목록 필드: skills, achievements, strengths (나머지는 문자열)
+{PATCH_INSTRUCTIONS}
+
 JSON 형식으로 응답하세요:
 {{
-  "updated_data": {{
-    "position": "직무 또는 null",
-    "skills": ["기술1", "기술2"] 또는 [],
-    "experience": "경력/경험 또는 null",
-    "achievements": ["성과1", "성과2"] 또는 [],
-    "motivation": "지원 동기 또는 null",
-    "strengths": ["강점1", "강점2"] 또는 [],
-    "personality": "성격/특징 또는 null",
-    "future_plans": "향후 계획 또는 null"
-  }},
+  "patch": {{"set": {{}}, "add": {{}}, "remove": {{}}}},
   "response_message": "사용자에게 자연스럽게 대화를 이어갈 수 있는 메시지",
   "needs_more_info": true/false
 }}
 
-기존 값이 있으면 유지하되, 새로운 정보가 제공되면 업데이트하세요."""
+기존 값은 유지되므로 새로 알게 된 정보만 패치에 넣으세요."""
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "user", "content": prompt}
@@ -271,21 +378,13 @@ JSON 형식으로 응답하세요:
         
         result = json.loads(response.choices[0].message.content)
         
-        # 데이터 업데이트 (null이 아닌 값만 업데이트)
-        updated_data = json.loads(json.dumps(cover_letter_data))
-        
-        llm_data = result.get("updated_data", {})
-        
-        for field, value in llm_data.items():
-            if value is not None:
-                if isinstance(value, list) and len(value) > 0:
-                    # 배열 필드: 기존 값과 병합 (중복 제거)
-                    existing = set(updated_data.get(field, []))
-                    new_values = set(value)
-                    updated_data[field] = list(existing | new_values)
-                elif not isinstance(value, list) and value != "":
-                    # 단일 값 필드
-                    updated_data[field] = value
+        # 바뀐 필드만 적용 (원본은 그대로, 바뀐 목록만 새로 만듦)
+        updated_data, _ = apply_patch(
+            cover_letter_data,
+            result.get("patch") or {},
+            COVER_LETTER_FIELDS,
+            COVER_LETTER_LIST_FIELDS
+        )
         
         return {
             "updated_data": updated_data,
@@ -301,19 +400,23 @@ JSON 형식으로 응답하세요:
             "needs_more_info": True
         }
 
-def generate_cover_letter_draft(cover_letter_data: Dict[str, Any], writing_style: str = "자연스럽고 전문적인") -> str:
+def generate_cover_letter_draft(cover_letter_data: Dict[str, Any], writing_style: str = DEFAULT_WRITING_STYLE) -> str:
     """수집된 정보를 바탕으로 자기소개서 초안을 생성합니다."""
     try:
-        data_str = json.dumps(cover_letter_data, ensure_ascii=False, indent=2)
+        # 직무 관련도 상위 프로젝트만 요약해서 프롬프트에 포함 (토큰 예산 적용)
+        prompt_data = build_prompt_data(cover_letter_data)
+        data_str = json.dumps(prompt_data, ensure_ascii=False, indent=2)
         
         # 프로젝트가 여러 개인지 확인
-        projects = cover_letter_data.get("projects", [])
+        projects = prompt_data.get("projects", [])
         project_instruction = ""
         
         if len(projects) > 1:
             project_instruction = "\n\n**중요: 데이터에 포함된 프로젝트들을 각각 구분해서 자기소개서에 반영하세요. 프로젝트가 여러 개인 경우, 각 프로젝트를 별도 문단으로 작성하거나 구분해서 설명해주세요.**"
         elif len(projects) == 1:
             project_instruction = "\n\n**중요: 데이터에 포함된 프로젝트 정보를 활용하여 자기소개서를 작성하세요.**"
+        if prompt_data.get("omitted_projects"):
+            project_instruction += "\n(지원 직무와 관련도가 높은 프로젝트만 골라 제공했습니다. 제공된 프로젝트를 중심으로 작성하세요.)"
         
         prompt = f"""다음 정보를 바탕으로 {writing_style} 문체로 자기소개서 초안을 작성해주세요.
 
@@ -331,7 +434,7 @@ def generate_cover_letter_draft(cover_letter_data: Dict[str, Any], writing_style
 문체는 {writing_style} 느낌으로 작성해주세요.
 구체적이고 설득력 있게 작성하되, 자연스럽게 표현해주세요."""
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-4o-mini",  # 속도 우선으로 변경
             messages=[
                 {"role": "user", "content": prompt}
@@ -344,7 +447,50 @@ def generate_cover_letter_draft(cover_letter_data: Dict[str, Any], writing_style
         
     except Exception as e:
         print(f"자기소개서 초안 생성 오류: {str(e)}")
-        return "자기소개서 초안 생성 중 오류가 발생했습니다."
+        return DRAFT_ERROR_MESSAGE
+
+def generate_cover_letter_variants(
+    cover_letter_data: Dict[str, Any],
+    styles: Optional[List[str]] = None,
+    speculative_draft: Optional[Speculation] = None
+) -> Dict[str, str]:
+    """
+    여러 문체의 초안을 병렬 요청으로 한 번에 생성합니다.
+    
+    문체마다 프롬프트가 달라 n 파라미터 대신 문체별 요청을 동시에 보내며,
+    같은 문체를 미리 생성 중인 초안(speculative_draft)이 있으면 새로 요청하지 않고 그 결과를 사용합니다.
+    
+    Returns:
+        {문체: 초안} (생성에 실패한 문체는 제외, styles 순서 유지)
+    """
+    styles = styles or STYLE_VARIANTS
+    data_copy = copy_state(cover_letter_data)
+    reused_style = speculative_draft.style if speculative_draft and speculative_draft.style in styles else None
+    
+    futures = {
+        style: speculation_executor.submit(generate_cover_letter_draft, data_copy, style)
+        for style in styles if style != reused_style
+    }
+    
+    variants = {}
+    if reused_style:
+        variants[reused_style] = speculative_draft.claim()
+        if variants[reused_style] in (None, DRAFT_ERROR_MESSAGE):
+            variants[reused_style] = generate_cover_letter_draft(data_copy, reused_style)
+    elif speculative_draft:
+        speculative_draft.discard()
+    for style, future in futures.items():
+        variants[style] = future.result()
+    
+    return {style: variants[style] for style in styles if variants[style] != DRAFT_ERROR_MESSAGE}
+
+def format_draft_preview(draft: str, writing_style: Optional[str] = None, draft_variants: Optional[Dict[str, str]] = None) -> str:
+    """초안 미리보기 메시지를 만듭니다 (다른 문체 초안이 있으면 바로 바꿀 수 있다고 안내)."""
+    message = f"AI 초안 미리보기✅\n\n\"{draft}\"\n\n---\n\n어때요? 마음에 드시나요?\n수정하고 싶거나 추가하고 싶은 내용이 있으면 알려주세요!\n완성했다면 '완료' 또는 '저장'이라고 말씀해주세요."
+    others = [style for style in (draft_variants or {}) if style != writing_style]
+    if others:
+        message += f"\n\n다른 문체({', '.join(others)}) 초안도 준비되어 있어요. 문체 이름을 말씀하시면 바로 바꿔드릴게요."
+    return message
 
 def modify_cover_letter(cover_letter_text: str, modification_request: str) -> str:
     """사용자의 수정 요청을 반영하여 자기소개서를 수정합니다."""
@@ -371,7 +517,7 @@ def modify_cover_letter(cover_letter_text: str, modification_request: str) -> st
 
 수정된 자기소개서 전문만 출력하세요. 설명이나 추가 코멘트는 불필요합니다."""
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "user", "content": prompt}
@@ -386,434 +532,212 @@ def modify_cover_letter(cover_letter_text: str, modification_request: str) -> st
         print(f"자기소개서 수정 오류: {str(e)}")
         return cover_letter_text
 
-def save_cover_letter_as_pdf(cover_letter_text: str, cover_letter_data: Dict[str, Any]) -> Dict[str, Any]:
-    """자기소개서를 PDF 파일로 저장합니다."""
-    try:
-        # 저장 디렉토리 생성
-        output_dir = Path("output/cover_letters")
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # 고유 ID 생성
-        cover_letter_id = str(uuid.uuid4())
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 파일명 생성
-        position = cover_letter_data.get("position", "자기소개서")
-        # 파일명에 사용할 수 없는 문자 제거
-        position_clean = "".join(c for c in position if c.isalnum() or c in (' ', '-', '_')).strip()
-        filename = f"자기소개서_{position_clean}_{timestamp}.pdf"
-        filepath = output_dir / filename
-        
-        # PDF 생성
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_auto_page_break(auto=True, margin=15)
-        
-        # 한글 폰트 설정 (한글 지원을 위해)
-        try:
-            # Windows의 경우 기본 폰트 사용
-            pdf.set_font("Arial", size=12)
-        except:
-            pdf.set_font("Arial", size=12)
-        
-        # 텍스트를 줄 단위로 분리하여 추가
-        lines = cover_letter_text.split('\n')
-        for line in lines:
-            if line.strip():
-                # 한글 인코딩 처리
-                try:
-                    pdf.multi_cell(0, 8, line.encode('latin-1', 'replace').decode('latin-1'))
-                except:
-                    # 한글이 포함된 경우 다른 방식으로 처리
-                    pdf.multi_cell(0, 8, line)
+def merge_metadata_into_data(cover_letter_data: Dict[str, Any], metadata: Optional[Dict[str, Any]]) -> None:
+    """분석된 메타데이터를 자기소개서 데이터에 병합합니다 (목록은 합치고, 단일 값은 비어 있을 때만 채움)."""
+    if not metadata or metadata.get("status") != "analyzed":
+        return
+    metadata_based_data = convert_metadata_to_cover_letter_data(metadata)
+    for key, value in metadata_based_data.items():
+        if value is not None and value != []:
+            if isinstance(value, list):
+                # 리스트인 경우 병합
+                existing = cover_letter_data.get(key, [])
+                if not isinstance(existing, list):
+                    existing = []
+                cover_letter_data[key] = list(set(existing + value))
             else:
-                pdf.ln(4)
-        
-        # PDF 저장
-        pdf.output(str(filepath))
-        
-        # 메타데이터 생성
-        metadata = {
-            "id": cover_letter_id,
-            "filename": filename,
-            "filepath": str(filepath),
-            "url": f"/cover_letters/{filename}",
-            "created_at": datetime.now().isoformat(),
-            "data": cover_letter_data,
-            "status": "completed"
-        }
-        
-        # 메타데이터 JSON 파일로 저장
-        metadata_filepath = output_dir / f"{cover_letter_id}_metadata.json"
-        with open(metadata_filepath, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
-        
-        return metadata
-        
-    except Exception as e:
-        print(f"PDF 저장 오류: {str(e)}")
-        return {
-            "error": str(e),
-            "status": "error"
-        }
+                # 단일 값인 경우 메타데이터 값 사용
+                if not cover_letter_data.get(key):
+                    cover_letter_data[key] = value
+
+def has_basic_info(cover_letter_data: Dict[str, Any]) -> bool:
+    """직무 목표가 있고 기술 스택 또는 경력 중 하나라도 있으면 초안을 쓸 수 있습니다."""
+    return bool(cover_letter_data.get("position")) and bool(cover_letter_data.get("skills") or cover_letter_data.get("experience"))
+
+def last_assistant_message(conversation_history: List[Turn]) -> str:
+    for msg in reversed(conversation_history):
+        if msg.get("role") == "assistant":
+            return msg.get("content", "")
+    return ""
+
+def take_speculation(session: CoverLetterSession) -> Optional[Speculation]:
+    """세션에서 선행 생성 작업을 꺼냅니다 (꺼낸 쪽이 사용하거나 폐기)."""
+    speculation = session.speculative_draft
+    session.speculative_draft = None
+    return speculation
+
+GREETING_MESSAGE = "안녕하세요! 저는 자기소개서 작성을 도와주는 넥스터입니다. 자기소개서 작성을 원하시나요?"
+STYLE_QUESTION_MESSAGE = "문체는 어떤 스타일로 원하시나요? (예: 자연스럽고 전문적인, 격식 있는, 친근한 등)"
+FINAL_CONFIRMATION_MESSAGE = "최종 자기소개서를 확인하시겠어요? (Word 파일로 저장하려면 '예' 또는 '저장', PDF로 받으려면 'PDF'라고 말씀해주세요)"
+REVISION_QUESTION = "이게 맞나요"
+
+# ---- 전이 조건 (guard) ----
+
+def wants_cover_letter(turn: TurnContext) -> bool:
+    """LLM과 키워드로 자기소개서 작성 의도를 확인합니다 (턴 안에서 한 번만 호출)."""
+    if not turn.message:
+        return False
+    if "wants" not in turn.scratch:
+        intent_result = detect_user_intent_with_llm(turn.message)
+        turn.scratch["wants"] = intent_result.get("wants_cover_letter", False) or is_cover_letter_intent(turn.message)
+    return turn.scratch["wants"]
+
+def wants_cover_letter_with_info(turn: TurnContext) -> bool:
+    return wants_cover_letter(turn) and has_basic_info(turn.session.data)
+
+def extracted_info(turn: TurnContext) -> Dict[str, Any]:
+    """사용자 답변에서 정보를 추출합니다 (턴 안에서 한 번만 호출)."""
+    if "extracted" not in turn.scratch:
+        turn.scratch["extracted"] = extract_and_update_cover_letter_data_with_llm(
+            turn.session.data,
+            turn.message,
+            turn.session.history
+        )
+    return turn.scratch["extracted"]
 
-def save_cover_letter_as_word(cover_letter_text: str, cover_letter_data: Dict[str, Any]) -> Dict[str, Any]:
-    """자기소개서를 Word 파일로 저장합니다."""
-    try:
-        # 현재 폴더에 저장
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 파일명 생성
-        position = cover_letter_data.get("position", "자기소개서")
-        # 파일명에 사용할 수 없는 문자 제거
-        position_clean = "".join(c for c in position if c.isalnum() or c in (' ', '-', '_')).strip()
-        filename = f"자기소개서_{position_clean}_{timestamp}.docx"
-        filepath = Path(filename)  # 현재 폴더에 저장
-        
-        # Word 문서 생성
-        doc = Document()
-        
-        # 한글 폰트 설정
-        from docx.shared import Pt
-        from docx.oxml.ns import qn
-        
-        # 기본 스타일 설정
-        style = doc.styles['Normal']
-        style.font.name = '맑은 고딕'
-        style.font.size = Pt(11)
-        style._element.rPr.rFonts.set(qn('w:eastAsia'), '맑은 고딕')
-        
-        # 제목 추가
-        heading = doc.add_heading('자기소개서', 0)
-        for run in heading.runs:
-            run.font.name = '맑은 고딕'
-            run._element.rPr.rFonts.set(qn('w:eastAsia'), '맑은 고딕')
-        
-        # 본문 추가
-        paragraphs = cover_letter_text.split('\n')
-        for para in paragraphs:
-            if para.strip():
-                p = doc.add_paragraph()
-                run = p.add_run(para.strip())
-                run.font.name = '맑은 고딕'
-                run._element.rPr.rFonts.set(qn('w:eastAsia'), '맑은 고딕')
-            else:
-                doc.add_paragraph()  # 빈 줄
-        
-        # 문서 저장
-        doc.save(str(filepath))
-        
-        # 메타데이터 생성
-        cover_letter_id = str(uuid.uuid4())
-        metadata = {
-            "id": cover_letter_id,
-            "filename": filename,
-            "filepath": str(filepath.absolute()),
-            "url": f"/cover_letters/{filename}",
-            "created_at": datetime.now().isoformat(),
-            "data": cover_letter_data,
-            "status": "completed"
-        }
-        
-        return metadata
-        
-    except Exception as e:
-        print(f"Word 파일 저장 오류: {str(e)}")
-        return {
-            "error": str(e),
-            "status": "error"
-        }
+def info_complete(turn: TurnContext) -> bool:
+    if not turn.message:
+        return False
+    result = extracted_info(turn)
+    return has_basic_info(result["updated_data"]) and not result["needs_more_info"]
 
-def process_cover_letter_chatbot(
-    user_message: Optional[str] = None,
-    cover_letter_data: Optional[Dict[str, Any]] = None,
-    conversation_history: Optional[List[Dict[str, str]]] = None,
-    current_state: str = "intent_confirmation",
-    writing_style: Optional[str] = None,
-    draft_cover_letter: Optional[str] = None,
-    metadata: Optional[Dict[str, Any]] = None  # file_analysis.py의 메타데이터 추가
-) -> Dict[str, Any]:
-    """자기소개서 챗봇 메시지를 처리하고 응답을 반환합니다."""
+def wants_variants(turn: TurnContext) -> bool:
+    return bool(turn.message) and bool(turn.session.variants_mode or is_variants_request(turn.message))
+
+def no_message(turn: TurnContext) -> bool:
+    return not turn.message
+
+def switches_variant(turn: TurnContext) -> bool:
+    """이미 생성해 둔 다른 문체를 요청했는지 확인합니다."""
+    variant_style = requested_variant_style(turn.message, turn.session.draft_variants)
+    return bool(variant_style) and variant_style != turn.session.writing_style
+
+def asked_revision(turn: TurnContext) -> bool:
+    return REVISION_QUESTION in last_assistant_message(turn.session.history)
+
+def confirms_revision(turn: TurnContext) -> bool:
+    # "이게 맞나요?" 메시지 이후 "네" 응답이면 바로 완료
+    message = turn.message
+    return asked_revision(turn) and (is_confirmation(message) or "네" in message or "맞아요" in message)
+
+def requests_revision(turn: TurnContext) -> bool:
+    return "수정" in turn.message.lower() and asked_revision(turn)
+
+def approves_draft(turn: TurnContext) -> bool:
+    return is_confirmation(turn.message) or "좋아" in turn.message
+
+def requests_export(turn: TurnContext) -> bool:
+    message = turn.message
+    if not message:
+        return False
+    message_lower = message.lower()
+    return (is_confirmation(message) or "pdf" in message_lower or "다운로드" in message
+            or "word" in message_lower or "docx" in message_lower or "저장" in message)
+
+# ---- 전이 동작 (action) ----
+
+def greet(turn: TurnContext) -> str:
+    return GREETING_MESSAGE
+
+def start_style_selection(turn: TurnContext) -> str:
+    """기본 정보를 보여주고 문체를 묻습니다 (기다리는 동안 기본 문체 초안을 미리 생성)."""
+    session = turn.session
+    if "extracted" in turn.scratch:
+        session.data = turn.scratch["extracted"]["updated_data"]
+    session.speculative_draft = speculate_default_draft(session.data)
+    basic_info = format_basic_info_summary(session.data)
+    return f"확인된 기본 정보\n\n{basic_info}\n\n이 정보를 기반으로 자기소개서를 작성할게요.\n\n문체는 어떤 스타일로 원하시나요?"
+
+def start_collecting_info(turn: TurnContext) -> str:
+    basic_info = format_basic_info_summary(turn.session.data)
+    if basic_info != "아직 입력된 정보가 없습니다.":
+        return f"안녕하세요! 저는 자기소개서 작성을 도와주는 넥스터입니다.\n\n분석된 정보를 확인했습니다:\n\n{basic_info}\n\n추가로 필요한 정보를 빠르게 수집하겠습니다."
+    return "안녕하세요! 저는 자기소개서 작성을 도와주는 넥스터입니다.\n\n자기소개서 작성을 위해 몇 가지 정보가 필요합니다.\n\n먼저 지원하시는 직무 목표를 알려주세요. (예: 마케팅/기획, 개발자, 디자이너 등)"
+
+def collect_info(turn: TurnContext) -> str:
+    result = extracted_info(turn)
+    turn.session.data = result["updated_data"]
+    return result["response_message"]
+
+def ask_position(turn: TurnContext) -> str:
+    return "지원하시는 직무 목표를 알려주세요."
+
+def draft_all_styles(turn: TurnContext) -> str:
+    """여러 문체 초안을 한 번에 생성하고, 고른 문체(없으면 기본 문체)를 먼저 보여줍니다."""
+    session = turn.session
+    writing_style = match_variant_style(turn.message, STYLE_VARIANTS)
+    if writing_style is None:
+        wants_default = is_default_style_choice(turn.message) or is_variants_request(turn.message)
+        writing_style = DEFAULT_WRITING_STYLE if wants_default else turn.message
+    styles = [writing_style] + [style for style in STYLE_VARIANTS if style != writing_style]
+    session.draft_variants = generate_cover_letter_variants(session.data, styles, take_speculation(session))
+    session.draft = session.draft_variants.get(writing_style) or generate_cover_letter_draft(session.data, writing_style)
+    session.writing_style = writing_style
+    return format_draft_preview(session.draft, writing_style, session.draft_variants)
+
+def draft_chosen_style(turn: TurnContext) -> str:
+    """고른 문체로 초안을 만듭니다 (기본 문체면 미리 생성한 초안 사용, 아니면 선행 생성 폐기)."""
+    session = turn.session
+    writing_style = turn.message
+    draft = None
+    speculative_draft = take_speculation(session)
+    if speculative_draft and is_default_style_choice(turn.message):
+        writing_style = speculative_draft.style
+        draft = speculative_draft.claim()
+        if draft == DRAFT_ERROR_MESSAGE:
+            draft = None
+    elif speculative_draft:
+        speculative_draft.discard()
+    
+    if draft is None:
+        draft = generate_cover_letter_draft(session.data, writing_style or DEFAULT_WRITING_STYLE)
+    session.draft = draft
+    session.writing_style = writing_style
+    return format_draft_preview(draft)
+
+def ask_style(turn: TurnContext) -> str:
+    # 선행 생성은 다음 턴까지 유지
+    return STYLE_QUESTION_MESSAGE
+
+def preview_draft(turn: TurnContext) -> str:
+    session = turn.session
+    if not session.draft:
+        session.draft = generate_cover_letter_draft(session.data, session.writing_style or DEFAULT_WRITING_STYLE)
+    return format_draft_preview(session.draft, session.writing_style, session.draft_variants)
+
+def ask_revision(turn: TurnContext) -> str:
+    return "수정이 필요하시면 알려주세요. 그렇지 않으면 '좋아' 또는 '확인'이라고 말씀해주세요."
+
+def switch_variant(turn: TurnContext) -> str:
+    """생성해 둔 다른 문체 초안으로 새 생성 없이 바로 전환합니다."""
+    session = turn.session
+    session.writing_style = requested_variant_style(turn.message, session.draft_variants)
+    session.draft = session.draft_variants[session.writing_style]
+    return format_draft_preview(session.draft, session.writing_style, session.draft_variants)
+
+def revise_draft(turn: TurnContext) -> str:
+    session = turn.session
+    session.draft = modify_cover_letter(session.draft, turn.message)
+    return f"수정 완료✅\n\n{session.draft}\n\n{REVISION_QUESTION}? 맞다면 네 라고 말해주시고 다시 수정을 원하면 수정이라고 말해주세요"
+
+def ask_final_confirmation(turn: TurnContext) -> str:
+    return FINAL_CONFIRMATION_MESSAGE
+
+def export_draft(turn: TurnContext) -> Dict[str, Any]:
+    # 파일 생성은 main.py에서 처리하므로 여기서는 메시지와 형식만 반환 ("PDF로"라고 답하면 PDF로 내보냄)
+    export_format = detect_export_format(turn.message)
+    return {"message": export_progress_message(export_format), "export_format": export_format}
+
+def answer_followup(turn: TurnContext) -> str:
+    """완료 후 추가 질의응답을 처리합니다."""
+    draft_cover_letter = turn.session.draft
     try:
-        # 초기 데이터 설정
-        if cover_letter_data is None:
-            cover_letter_data = {
-                "position": None,
-                "skills": [],
-                "experience": None,
-                "achievements": [],
-                "motivation": None,
-                "strengths": [],
-                "personality": None,
-                "future_plans": None
-            }
-        
-        # 메타데이터가 제공된 경우, 메타데이터를 기반으로 초기 데이터 설정
-        if metadata and metadata.get("status") == "analyzed":
-            metadata_based_data = convert_metadata_to_cover_letter_data(metadata)
-            # 기존 데이터와 병합 (메타데이터 값이 있으면 우선 사용)
-            for key, value in metadata_based_data.items():
-                if value is not None and value != []:
-                    if isinstance(value, list):
-                        # 리스트인 경우 병합
-                        existing = cover_letter_data.get(key, [])
-                        if not isinstance(existing, list):
-                            existing = []
-                        cover_letter_data[key] = list(set(existing + value))
-                    else:
-                        # 단일 값인 경우 메타데이터 값 사용
-                        if not cover_letter_data.get(key):
-                            cover_letter_data[key] = value
-        
-        if conversation_history is None:
-            conversation_history = []
-        
-        # 상태별 처리
-        if current_state == "intent_confirmation":
-            # 의도 확인 단계 - LLM을 사용하여 의도 파악
-            if user_message:
-                # LLM으로 의도 파악
-                intent_result = detect_user_intent_with_llm(user_message)
-                wants_cover_letter = intent_result.get("wants_cover_letter", False)
-                
-                if wants_cover_letter or is_cover_letter_intent(user_message):
-                    # 메타데이터 기반 정보가 있으면 표시
-                    basic_info = format_basic_info_summary(cover_letter_data)
-                    if basic_info != "아직 입력된 정보가 없습니다.":
-                        # 메타데이터 기반 정보가 충분한지 확인
-                        has_position = cover_letter_data.get("position")
-                        has_skills = cover_letter_data.get("skills") and len(cover_letter_data.get("skills", [])) > 0
-                        has_experience = cover_letter_data.get("experience")
-                        
-                        # position이 있고, (skills 또는 experience) 중 하나만 있어도 바로 문체 선택으로
-                        if has_position and (has_skills or has_experience):
-                            message = f"확인된 기본 정보\n\n{basic_info}\n\n이 정보를 기반으로 자기소개서를 작성할게요.\n\n문체는 어떤 스타일로 원하시나요?"
-                            return {
-                                "message": message,
-                                "updated_data": cover_letter_data,
-                                "status": "style_selection",
-                                "next_state": "style_selection"
-                            }
-                        else:
-                            message = f"안녕하세요! 저는 자기소개서 작성을 도와주는 넥스터입니다.\n\n분석된 정보를 확인했습니다:\n\n{basic_info}\n\n추가로 필요한 정보를 빠르게 수집하겠습니다."
-                    else:
-                        message = "안녕하세요! 저는 자기소개서 작성을 도와주는 넥스터입니다.\n\n자기소개서 작성을 위해 몇 가지 정보가 필요합니다.\n\n먼저 지원하시는 직무 목표를 알려주세요. (예: 마케팅/기획, 개발자, 디자이너 등)"
-                    
-                    return {
-                        "message": message,
-                        "updated_data": cover_letter_data,
-                        "status": "collecting_info",
-                        "next_state": "collecting_info"
-                    }
-                else:
-                    return {
-                        "message": "안녕하세요! 저는 자기소개서 작성을 도와주는 넥스터입니다. 자기소개서 작성을 원하시나요?",
-                        "updated_data": cover_letter_data,
-                        "status": "intent_confirmation",
-                        "next_state": "intent_confirmation"
-                    }
-            else:
-                return {
-                    "message": "안녕하세요! 저는 자기소개서 작성을 도와주는 넥스터입니다. 자기소개서 작성을 원하시나요?",
-                    "updated_data": cover_letter_data,
-                    "status": "intent_confirmation",
-                    "next_state": "intent_confirmation"
-                }
-        
-        elif current_state == "collecting_info":
-            # 정보 수집 단계
-            if user_message:
-                result = extract_and_update_cover_letter_data_with_llm(
-                    cover_letter_data,
-                    user_message,
-                    conversation_history
-                )
-                
-                updated_data = result["updated_data"]
-                response_message = result["response_message"]
-                needs_more_info = result["needs_more_info"]
-                
-                # 필수 정보 확인 조건 완화 (position + skills 또는 experience 중 하나만 있어도 진행)
-                has_position = updated_data.get("position")
-                has_skills = updated_data.get("skills") and len(updated_data.get("skills", [])) > 0
-                has_experience = updated_data.get("experience")
-                
-                # position이 있고, (skills 또는 experience) 중 하나만 있어도 진행
-                if has_position and (has_skills or has_experience) and not needs_more_info:
-                    # 기본 정보가 충분히 수집됨 - 기본 정보 확인 단계로
-                    basic_info = format_basic_info_summary(updated_data)
-                    return {
-                        "message": f"확인된 기본 정보\n\n{basic_info}\n\n이 정보를 기반으로 자기소개서를 작성할게요.\n\n문체는 어떤 스타일로 원하시나요?",
-                        "updated_data": updated_data,
-                        "status": "style_selection",
-                        "next_state": "style_selection"
-                    }
-                else:
-                    # 추가 정보 필요
-                    return {
-                        "message": response_message,
-                        "updated_data": updated_data,
-                        "status": "collecting_info",
-                        "next_state": "collecting_info"
-                    }
-            else:
-                return {
-                    "message": "지원하시는 직무 목표를 알려주세요.",
-                    "updated_data": cover_letter_data,
-                    "status": "collecting_info",
-                    "next_state": "collecting_info"
-                }
-        
-        elif current_state == "style_selection":
-            # 문체 선택 단계
-            if user_message:
-                # 문체 저장하고 바로 초안 생성
-                writing_style = user_message
-                
-                # 초안 즉시 생성
-                draft = generate_cover_letter_draft(cover_letter_data, writing_style or "자연스럽고 전문적인")
-                
-                return {
-                    "message": f"AI 초안 미리보기✅\n\n\"{draft}\"\n\n---\n\n어때요? 마음에 드시나요?\n수정하고 싶거나 추가하고 싶은 내용이 있으면 알려주세요!\n완성했다면 '완료' 또는 '저장'이라고 말씀해주세요.",
-                    "updated_data": cover_letter_data,
-                    "status": "draft_preview",
-                    "next_state": "draft_revision",
-                    "draft_cover_letter": draft,
-                    "writing_style": writing_style
-                }
-            else:
-                return {
-                    "message": "문체는 어떤 스타일로 원하시나요? (예: 자연스럽고 전문적인, 격식 있는, 친근한 등)",
-                    "updated_data": cover_letter_data,
-                    "status": "style_selection",
-                    "next_state": "style_selection"
-                }
-        
-        elif current_state == "draft_preview":
-            # 초안 미리보기 단계
-            if not draft_cover_letter:
-                # 초안 생성
-                draft = generate_cover_letter_draft(cover_letter_data, writing_style or "자연스럽고 전문적인")
-                return {
-                    "message": f"AI 초안 미리보기✅\n\n\"{draft}\"\n\n---\n\n어때요? 마음에 드시나요?\n수정하고 싶거나 추가하고 싶은 내용이 있으면 알려주세요!\n완성했다면 '완료' 또는 '저장'이라고 말씀해주세요.",
-                    "updated_data": cover_letter_data,
-                    "status": "draft_preview",
-                    "next_state": "draft_revision",
-                    "draft_cover_letter": draft,
-                    "writing_style": writing_style
-                }
-            else:
-                # 이미 초안이 있음
-                return {
-                    "message": f"AI 초안 미리보기✅\n\n\"{draft_cover_letter}\"\n\n---\n\n어때요? 마음에 드시나요?\n수정하고 싶거나 추가하고 싶은 내용이 있으면 알려주세요!\n완성했다면 '완료' 또는 '저장'이라고 말씀해주세요.",
-                    "updated_data": cover_letter_data,
-                    "status": "draft_preview",
-                    "next_state": "draft_revision",
-                    "draft_cover_letter": draft_cover_letter,
-                    "writing_style": writing_style
-                }
-        
-        elif current_state == "draft_revision":
-            # 초안 수정 단계
-            if user_message:
-                # 이전 AI 메시지 확인
-                last_ai_message = ""
-                if conversation_history:
-                    for msg in reversed(conversation_history):
-                        if msg.get("role") == "assistant":
-                            last_ai_message = msg.get("content", "")
-                            break
-                
-                # "이게 맞나요?" 메시지 이후 "네" 응답이면 바로 완료
-                if ("이게 맞나요" in last_ai_message) and (is_confirmation(user_message) or "네" in user_message or "맞아요" in user_message):
-                    # 바로 완료 상태로
-                    return {
-                        "message": "완료✅\n\nWord 파일을 생성 중입니다...",
-                        "updated_data": cover_letter_data,
-                        "status": "completed",
-                        "next_state": "completed",
-                        "draft_cover_letter": draft_cover_letter,
-                        "writing_style": writing_style
-                    }
-                
-                # "수정" 키워드가 있으면 수정 처리
-                elif "수정" in user_message.lower() and ("이게 맞나요" in last_ai_message):
-                    # 수정 요청
-                    modified_draft = modify_cover_letter(draft_cover_letter, user_message)
-                    return {
-                        "message": f"수정 완료✅\n\n{modified_draft}\n\n이게 맞나요? 맞다면 네 라고 말해주시고 다시 수정을 원하면 수정이라고 말해주세요",
-                        "updated_data": cover_letter_data,
-                        "status": "draft_revision",
-                        "next_state": "draft_revision",
-                        "draft_cover_letter": modified_draft,
-                        "writing_style": writing_style
-                    }
-                
-                # 일반 확인 (초안에서 수정 없이 확인)
-                elif is_confirmation(user_message) or "좋아" in user_message or "좋아요" in user_message:
-                    # 수정 없이 확인 → final_confirmation
-                    return {
-                        "message": "최종 자기소개서를 확인하시겠어요?",
-                        "updated_data": cover_letter_data,
-                        "status": "final_confirmation",
-                        "next_state": "final_confirmation",
-                        "draft_cover_letter": draft_cover_letter,
-                        "writing_style": writing_style
-                    }
-                
-                else:
-                    # 수정 요청
-                    modified_draft = modify_cover_letter(draft_cover_letter, user_message)
-                    return {
-                        "message": f"수정 완료✅\n\n{modified_draft}\n\n이게 맞나요? 맞다면 네 라고 말해주시고 다시 수정을 원하면 수정이라고 말해주세요",
-                        "updated_data": cover_letter_data,
-                        "status": "draft_revision",
-                        "next_state": "draft_revision",
-                        "draft_cover_letter": modified_draft,
-                        "writing_style": writing_style
-                    }
-            else:
-                return {
-                    "message": "수정이 필요하시면 알려주세요. 그렇지 않으면 '좋아' 또는 '확인'이라고 말씀해주세요.",
-                    "updated_data": cover_letter_data,
-                    "status": "draft_revision",
-                    "next_state": "draft_revision",
-                    "draft_cover_letter": draft_cover_letter,
-                    "writing_style": writing_style
-                }
-        
-        elif current_state == "final_confirmation":
-            # 최종 확인 단계
-            if user_message and (is_confirmation(user_message) or "pdf" in user_message.lower() or "다운로드" in user_message or "word" in user_message.lower() or "docx" in user_message.lower() or "저장" in user_message):
-                # 파일 생성은 main.py에서 처리하므로 여기서는 메시지만 반환
-                return {
-                    "message": "완료✅\n\nWord 파일을 생성 중입니다...",
-                    "updated_data": cover_letter_data,
-                    "status": "completed",
-                    "next_state": "completed",
-                    "draft_cover_letter": draft_cover_letter
-                }
-            else:
-                return {
-                    "message": "최종 자기소개서를 확인하시겠어요? (Word 파일로 저장하려면 '예' 또는 '저장'이라고 말씀해주세요)",
-                    "updated_data": cover_letter_data,
-                    "status": "final_confirmation",
-                    "next_state": "final_confirmation",
-                    "draft_cover_letter": draft_cover_letter,
-                    "writing_style": writing_style
-                }
-        
-        elif current_state == "completed":
-            # 완료 후 추가 질의응답 처리
-            if user_message:
-                # 간단한 질의응답 처리
-                try:
-                    prompt = f"""사용자가 자기소개서 작성을 완료했습니다.
+        prompt = f"""사용자가 자기소개서 작성을 완료했습니다.
 
 현재 생성된 자기소개서:
 {draft_cover_letter[:500] if draft_cover_letter else "없음"}...
 
-사용자의 추가 질문: {user_message}
+사용자의 추가 질문: {turn.message}
 
 사용자의 질문에 친절하게 답변해주세요.
 - 자기소개서를 다시 수정하고 싶다면: "새로운 자기소개서를 작성하려면 처음부터 다시 시작해주세요"라고 안내
@@ -821,55 +745,127 @@ def process_cover_letter_chatbot(
 - 일반적인 질문이면 친절하게 답변
 - 자기소개서 작성 팁이나 조언을 요청하면 구체적으로 답변"""
 
-                    response = client.chat.completions.create(
-                        model="gpt-4o-mini",
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.7,
-                        max_tokens=500
-                    )
-                    
-                    return {
-                        "message": response.choices[0].message.content,
-                        "updated_data": cover_letter_data,
-                        "status": "completed",
-                        "next_state": "completed",
-                        "draft_cover_letter": draft_cover_letter
-                    }
-                    
-                except Exception as e:
-                    print(f"완료 후 질의응답 오류: {str(e)}")
-                    return {
-                        "message": "질문에 답변하는 중 오류가 발생했습니다. 다시 질문해주세요.",
-                        "updated_data": cover_letter_data,
-                        "status": "completed",
-                        "next_state": "completed",
-                        "draft_cover_letter": draft_cover_letter
-                    }
-            else:
-                return {
-                    "message": "자기소개서가 완성되었습니다! 추가로 궁금한 점이 있으시면 언제든 물어보세요.",
-                    "updated_data": cover_letter_data,
-                    "status": "completed",
-                    "next_state": "completed",
-                    "draft_cover_letter": draft_cover_letter
-                }
-        
+        response = get_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.7,
+            max_tokens=500
+        )
+        return response.choices[0].message.content
+    except Exception as e:
+        print(f"완료 후 질의응답 오류: {str(e)}")
+        return "질문에 답변하는 중 오류가 발생했습니다. 다시 질문해주세요."
+
+def announce_completed(turn: TurnContext) -> str:
+    return "자기소개서가 완성되었습니다! 추가로 궁금한 점이 있으시면 언제든 물어보세요."
+
+# 자기소개서 챗봇 전이 표: 상태마다 위에서부터 처음 조건이 맞는 행을 실행 (마지막 행은 기본 동작)
+COVER_LETTER_TRANSITIONS = [
+    Transition("intent_confirmation", "ready", wants_cover_letter_with_info, start_style_selection, "style_selection"),
+    Transition("intent_confirmation", "collect", wants_cover_letter, start_collecting_info, "collecting_info"),
+    Transition("intent_confirmation", "greet", always, greet, "intent_confirmation"),
+
+    Transition("collecting_info", "ready", info_complete, start_style_selection, "style_selection"),
+    Transition("collecting_info", "collect", has_message, collect_info, "collecting_info"),
+    Transition("collecting_info", "ask", always, ask_position, "collecting_info"),
+
+    Transition("style_selection", "variants", wants_variants, draft_all_styles, "draft_revision", "draft_preview"),
+    Transition("style_selection", "draft", has_message, draft_chosen_style, "draft_revision", "draft_preview"),
+    Transition("style_selection", "ask", always, ask_style, "style_selection"),
+
+    Transition("draft_preview", "preview", always, preview_draft, "draft_revision", "draft_preview"),
+
+    Transition("draft_revision", "ask", no_message, ask_revision, "draft_revision"),
+    Transition("draft_revision", "switch_style", switches_variant, switch_variant, "draft_revision", "draft_preview"),
+    Transition("draft_revision", "confirm", confirms_revision, export_draft, "completed"),
+    Transition("draft_revision", "revise_again", requests_revision, revise_draft, "draft_revision"),
+    Transition("draft_revision", "approve", approves_draft, ask_final_confirmation, "final_confirmation"),
+    Transition("draft_revision", "revise", always, revise_draft, "draft_revision"),
+
+    Transition("final_confirmation", "export", requests_export, export_draft, "completed"),
+    Transition("final_confirmation", "ask", always, ask_final_confirmation, "final_confirmation"),
+
+    Transition("completed", "followup", has_message, answer_followup, "completed"),
+    Transition("completed", "done", always, announce_completed, "completed"),
+]
+
+COVER_LETTER_FSM = StateMachine(COVER_LETTER_TRANSITIONS)
+
+def run_cover_letter_turn(session: CoverLetterSession, user_message: Optional[str] = None) -> Dict[str, Any]:
+    """
+    세션에서 챗봇 한 턴을 실행합니다 (세션의 상태/데이터/초안은 제자리에서 갱신).
+    
+    사용자 메시지는 호출 전에, 응답 메시지는 호출 후에 호출 측이 session.history에 추가합니다.
+    문체 선택 단계를 벗어나면서 쓰이지 않은 선행 생성은 여기서 폐기합니다.
+    """
+    if session.variants_mode is None:
+        session.variants_mode = VARIANTS_MODE_DEFAULT
+    try:
+        if session.state in COVER_LETTER_FSM.table:
+            result = COVER_LETTER_FSM.step(session, user_message)
         else:
-            return {
-                "message": "처리 중 오류가 발생했습니다.",
-                "updated_data": cover_letter_data,
-                "status": "error",
-                "next_state": "intent_confirmation"
-            }
-        
+            session.state = "intent_confirmation"
+            result = session.result("처리 중 오류가 발생했습니다.", status="error")
     except Exception as e:
         print(f"챗봇 처리 오류: {str(e)}")
-        return {
-            "message": "죄송합니다. 처리 중 오류가 발생했습니다.",
-            "updated_data": cover_letter_data if cover_letter_data else {},
-            "status": "error",
-            "next_state": "intent_confirmation"
+        session.state = "intent_confirmation"
+        result = session.result("죄송합니다. 처리 중 오류가 발생했습니다.", status="error")
+    
+    if session.speculative_draft is not None and session.state != "style_selection":
+        take_speculation(session).discard()
+        result.pop("speculative_draft", None)
+    return result
+
+def process_cover_letter_chatbot(
+    user_message: Optional[str] = None,
+    cover_letter_data: Optional[Dict[str, Any]] = None,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    current_state: str = "intent_confirmation",
+    writing_style: Optional[str] = None,
+    draft_cover_letter: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,  # file_analysis.py의 메타데이터 추가
+    speculative_draft: Optional[Speculation] = None,  # 문체 선택 단계에서 미리 생성 중인 기본 문체 초안
+    draft_variants: Optional[Dict[str, str]] = None,  # 문체별 초안 (여러 문체 초안 모드)
+    variants_mode: Optional[bool] = None  # 문체 선택 시 STYLE_VARIANTS를 한 번에 생성 (기본값: DRAFT_VARIANTS)
+) -> Dict[str, Any]:
+    """
+    자기소개서 챗봇 메시지를 처리하고 응답을 반환합니다 (세션 객체 없이 값으로 호출하는 인터페이스).
+    
+    문체 선택 단계로 넘어갈 때 결과의 "speculative_draft"로 기본 문체 초안의 선행 생성 작업을 돌려주며,
+    호출 측은 다음 호출에 그대로 넘겨야 합니다 (사용하지 않으면 이 함수에서 취소/폐기).
+    여러 문체 초안 모드에서는 결과의 "draft_variants"를 세션에 보관해 다음 호출에 넘기면
+    초안 수정 단계에서 문체 이름만으로 새 생성 없이 바로 전환합니다.
+    """
+    # 초기 데이터 설정
+    if cover_letter_data is None:
+        cover_letter_data = {
+            "position": None,
+            "skills": [],
+            "experience": None,
+            "achievements": [],
+            "motivation": None,
+            "strengths": [],
+            "personality": None,
+            "future_plans": None
         }
+    
+    # 메타데이터가 제공된 경우, 메타데이터를 기반으로 초기 데이터 설정 (메타데이터 값이 있으면 우선 사용)
+    try:
+        merge_metadata_into_data(cover_letter_data, metadata)
+    except Exception as e:
+        print(f"메타데이터 병합 오류: {str(e)}")
+    
+    session = CoverLetterSession(
+        state=current_state,
+        data=cover_letter_data,
+        history=conversation_history if conversation_history is not None else [],
+        writing_style=writing_style,
+        draft=draft_cover_letter,
+        draft_variants=draft_variants,
+        variants_mode=variants_mode,
+        speculative_draft=speculative_draft
+    )
+    return run_cover_letter_turn(session, user_message)
 
 def main():
     """메인 함수 - 테스트용"""
@@ -908,6 +904,7 @@ def main():
     current_state = "intent_confirmation"
     writing_style = None
     draft_cover_letter = None
+    speculative_draft = None
     
     # 맨 처음 넥스터 인사 메시지 출력
     initial_result = process_cover_letter_chatbot(
@@ -940,10 +937,12 @@ def main():
             current_state,
             writing_style,
             draft_cover_letter,
-            metadata  # 메타데이터 전달
+            metadata,  # 메타데이터 전달
+            speculative_draft
         )
         
         # 상태 업데이트
+        speculative_draft = result.get("speculative_draft")
         current_state = result.get("next_state", current_state)
         cover_letter_data = result.get("updated_data", cover_letter_data)
         writing_style = result.get("writing_style", writing_style)
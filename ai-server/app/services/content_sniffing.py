@@ -0,0 +1,269 @@
+"""
+콘텐츠 스니핑 서비스
+파일 앞부분(수 KB)의 시그니처(매직 바이트)로 실제 파일 형식을 판별합니다.
+확장자가 없거나 잘못된 업로드도 올바른 분석기로 보낼 수 있도록 MIME 타입을 반환합니다.
+텍스트 파일은 한 번만 읽으면서 인코딩을 판별하고 디코딩합니다.
+"""
+
+import io
+import os
+import struct
+import zipfile
+import codecs
+from typing import List, Optional, BinaryIO, Tuple, Union
+
+# 스니핑에 사용하는 앞부분 크기
+SNIFF_BYTES = 8192
+
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+PPTX_MIME = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# (시그니처, MIME 타입) - 앞에서부터 순서대로 비교
+MAGIC_SIGNATURES = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-ole-storage"),  # 구형 .doc/.ppt/.xls
+    (b"\x1f\x8b", "application/gzip"),
+]
+
+# ZIP 로컬 파일 헤더 (시그니처, ..., 압축 크기 @18, 파일명 길이 @26, 추가 필드 길이 @28)
+ZIP_LOCAL_HEADER = b"PK\x03\x04"
+ZIP_LOCAL_HEADER_SIZE = 30
+
+# ZIP 컨테이너 안의 경로 접두사로 OOXML 문서 종류 판별 (항목 이름의 시작과 비교)
+OOXML_PREFIXES = [
+    ("word/", DOCX_MIME),
+    ("ppt/", PPTX_MIME),
+    ("xl/", XLSX_MIME),
+]
+
+# 텍스트 BOM
+TEXT_BOMS = [
+    codecs.BOM_UTF32_LE,
+    codecs.BOM_UTF32_BE,
+    codecs.BOM_UTF8,
+    codecs.BOM_UTF16_LE,
+    codecs.BOM_UTF16_BE,
+]
+
+# BOM → 인코딩 (BOM을 제거하는 코덱 사용)
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# BOM이 없을 때 시도하는 인코딩 (순서대로, 최종 폴백은 latin-1)
+TEXT_ENCODINGS = ["utf-8", "cp949", "latin-1"]
+
+# 인코딩 판별용 샘플 크기와 이후 스트리밍 디코딩 청크 크기
+DECODE_SAMPLE_BYTES = 64 * 1024
+DECODE_CHUNK_BYTES = 256 * 1024
+
+# 텍스트 판별 시 허용하는 제어 문자 (탭, 줄바꿈, 폼피드, 이스케이프 등)
+ALLOWED_CONTROL_BYTES = {0x08, 0x09, 0x0a, 0x0c, 0x0d, 0x1b}
+
+
+def _zip_head_names(head: bytes) -> List[str]:
+    """앞부분에 들어 있는 ZIP 로컬 파일 헤더를 차례로 따라가며 항목 이름을 읽습니다."""
+    names = []
+    offset = 0
+    while head[offset:offset + 4] == ZIP_LOCAL_HEADER and offset + ZIP_LOCAL_HEADER_SIZE <= len(head):
+        flags, = struct.unpack_from("<H", head, offset + 6)
+        compressed_size, = struct.unpack_from("<I", head, offset + 18)
+        name_length, extra_length = struct.unpack_from("<HH", head, offset + 26)
+        name_start = offset + ZIP_LOCAL_HEADER_SIZE
+        if name_start + name_length > len(head):
+            break
+        names.append(head[name_start:name_start + name_length].decode("utf-8", errors="replace"))
+        if flags & 0x08:
+            # 크기가 데이터 뒤(data descriptor)에 있으면 다음 헤더 위치를 알 수 없음
+            break
+        offset = name_start + name_length + extra_length + compressed_size
+    return names
+
+
+def _ooxml_mime(names: List[str]) -> Optional[str]:
+    for prefix, mime_type in OOXML_PREFIXES:
+        if any(name.startswith(prefix) for name in names):
+            return mime_type
+    return None
+
+
+def _sniff_zip(head: bytes, source: Union[str, BinaryIO, None] = None) -> Optional[str]:
+    """
+    ZIP 컨테이너가 OOXML 문서인지 항목 이름으로 확인합니다.
+
+    앞부분의 로컬 파일 헤더에서 찾지 못하면 source(파일 경로 또는 seek 가능한 파일 객체)의
+    중앙 디렉토리를 확인합니다. 중앙 디렉토리를 읽지 못하면 판별 불가(None)로 두어 확장자로 판단하게 합니다.
+    """
+    mime_type = _ooxml_mime(_zip_head_names(head))
+    if mime_type or source is None:
+        return mime_type
+
+    position = None if isinstance(source, str) else source.tell()
+    try:
+        with zipfile.ZipFile(source) as archive:
+            names = archive.namelist()
+    except (zipfile.BadZipFile, OSError, ValueError):
+        return None
+    finally:
+        if position is not None:
+            source.seek(position)
+    return _ooxml_mime(names) or "application/zip"
+
+
+def _looks_like_text(head: bytes) -> bool:
+    """앞부분 바이트가 텍스트인지 판별합니다."""
+    if any(head.startswith(bom) for bom in TEXT_BOMS):
+        return True
+    if b"\x00" in head:
+        return False
+
+    # 끝에서 잘린 멀티바이트 문자는 허용 (final=False)
+    for encoding in ("utf-8", "cp949"):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+            return True
+        except UnicodeDecodeError:
+            continue
+
+    # 단일 바이트 인코딩: 제어 문자 비율이 낮으면 텍스트
+    control_count = sum(1 for byte in head if byte < 0x20 and byte not in ALLOWED_CONTROL_BYTES)
+    return control_count / len(head) < 0.05
+
+
+def sniff_mime_type(head: bytes, source: Union[str, BinaryIO, None] = None) -> Optional[str]:
+    """
+    파일 앞부분의 시그니처로 MIME 타입을 판별합니다.
+
+    Args:
+        head: 파일 앞부분 바이트 (SNIFF_BYTES 정도)
+        source: 파일 경로 또는 seek 가능한 파일 객체 (ZIP 컨테이너 세부 판별용, 선택)
+
+    Returns:
+        MIME 타입 문자열 또는 None (판별 불가)
+    """
+    if not head:
+        return None
+
+    for signature, mime_type in MAGIC_SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+
+    if head.startswith(b"BM") and len(head) > 10 and head[6:10] == b"\x00\x00\x00\x00":
+        return "image/bmp"
+
+    if head.startswith((b"PK\x03\x04", b"PK\x05\x06")):
+        return _sniff_zip(head, source)
+
+    # 비압축 tar: 첫 헤더 블록의 257번째 바이트부터 "ustar" 매직
+    if head[257:262] == b"ustar":
+        return "application/x-tar"
+
+    if _looks_like_text(head):
+        stripped = head.lstrip().lower()
+        if stripped.startswith((b"<!doctype html", b"<html")):
+            return "text/html"
+        return "text/plain"
+
+    return None
+
+
+def read_head(file_obj: BinaryIO, size: int = SNIFF_BYTES) -> bytes:
+    """파일 객체의 앞부분을 읽고 읽기 위치를 되돌립니다."""
+    position = file_obj.tell()
+    head = file_obj.read(size)
+    file_obj.seek(position)
+    return head
+
+
+def sniff_file(file_path: str) -> Optional[str]:
+    """파일 경로의 MIME 타입을 시그니처로 판별합니다."""
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        return None
+    return sniff_mime_type(head, file_path)
+
+
+def detect_text_encoding(sample: bytes) -> str:
+    """BOM과 샘플 디코딩으로 텍스트 인코딩을 판별합니다."""
+    for bom, encoding in BOM_ENCODINGS:
+        if sample.startswith(bom):
+            return encoding
+
+    # 샘플 끝에서 잘린 멀티바이트 문자는 허용 (final=False)
+    for encoding in TEXT_ENCODINGS:
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "latin-1"
+
+
+def _read_text_stream(stream: BinaryIO) -> Tuple[str, str]:
+    """스트림을 한 번만 읽으며 샘플로 인코딩을 정하고 나머지는 청크 단위로 디코딩합니다."""
+    sample = stream.read(DECODE_SAMPLE_BYTES)
+    encoding = detect_text_encoding(sample)
+
+    raw_chunks = [sample]
+    text_parts = []
+    decoder = codecs.getincrementaldecoder(encoding)()
+    try:
+        text_parts.append(decoder.decode(sample))
+        while True:
+            chunk = stream.read(DECODE_CHUNK_BYTES)
+            if not chunk:
+                break
+            raw_chunks.append(chunk)
+            text_parts.append(decoder.decode(chunk))
+        text_parts.append(decoder.decode(b"", final=True))
+        return "".join(text_parts), encoding
+    except UnicodeDecodeError:
+        pass
+
+    # 샘플 이후에서 디코딩 실패: 남은 부분까지 읽은 뒤 다음 후보 인코딩으로 디코딩
+    while True:
+        chunk = stream.read(DECODE_CHUNK_BYTES)
+        if not chunk:
+            break
+        raw_chunks.append(chunk)
+    data = b"".join(raw_chunks)
+
+    start = TEXT_ENCODINGS.index(encoding) + 1 if encoding in TEXT_ENCODINGS else 0
+    for fallback in TEXT_ENCODINGS[start:]:
+        try:
+            return data.decode(fallback), fallback
+        except UnicodeDecodeError:
+            continue
+    return data.decode("latin-1"), "latin-1"
+
+
+def read_text(source: Union[str, os.PathLike, bytes, bytearray, BinaryIO]) -> Tuple[str, str]:
+    """
+    텍스트를 한 번만 읽어 인코딩을 판별하고 디코딩합니다.
+
+    Args:
+        source: 파일 경로, 바이트, 또는 바이너리 파일 객체 (메모리 업로드 포함)
+
+    Returns:
+        (디코딩된 텍스트, 사용된 인코딩)
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return _read_text_stream(io.BytesIO(source))
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return _read_text_stream(f)
+    return _read_text_stream(source)
@@ -0,0 +1,132 @@
+"""
+Word 템플릿 엔진
+스타일(글꼴, 크기, 여백)이 적용된 기본 .docx를 템플릿별로 한 번만 만들어 캐시하고,
+내보내기 때마다 본문(word/document.xml)만 채워 넣어 .docx 바이트를 만듭니다.
+매 요청마다 Document()를 새로 만들고 모든 run에 글꼴을 지정하던 비용이 없어집니다.
+"""
+
+import io
+import re
+import threading
+import zipfile
+from typing import Dict, Any, Optional, Tuple
+from xml.sax.saxutils import escape
+
+# 템플릿 정의 (스타일만 다르고 요청당 비용은 같음)
+TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "default": {"font": "맑은 고딕", "size": 11, "title_size": 26, "margin_cm": None},
+    "compact": {"font": "맑은 고딕", "size": 10, "title_size": 20, "margin_cm": 1.8},
+    "classic": {"font": "바탕", "size": 11, "title_size": 24, "margin_cm": 2.5},
+}
+
+DEFAULT_TEMPLATE = "default"
+DOCUMENT_PART = "word/document.xml"
+BODY_OPEN = "<w:body>"
+
+# XML 1.0에서 허용되지 않는 제어 문자 (탭/줄바꿈 제외)
+INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# 템플릿 이름 → (본문을 뺀 패키지 zip 바이트, document.xml 앞부분, document.xml 뒷부분)
+_template_cache: Dict[str, Tuple[bytes, str, str]] = {}
+_template_lock = threading.Lock()
+
+
+def _set_style_font(style, font_name: str, size_pt: Optional[float] = None) -> None:
+    """스타일 글꼴을 라틴/동아시아 모두 지정합니다 (테마 글꼴 속성은 제거하여 우선 적용)."""
+    from docx.shared import Pt
+    from docx.oxml.ns import qn
+
+    style.font.name = font_name
+    if size_pt:
+        style.font.size = Pt(size_pt)
+    rFonts = style.element.rPr.rFonts
+    rFonts.set(qn("w:eastAsia"), font_name)
+    for theme_attr in ("w:asciiTheme", "w:hAnsiTheme", "w:eastAsiaTheme", "w:cstheme"):
+        rFonts.attrib.pop(qn(theme_attr), None)
+
+
+def _build_template(spec: Dict[str, Any]) -> Tuple[bytes, str, str]:
+    """python-docx로 스타일이 적용된 기본 문서를 만들고 본문을 제외한 파트를 분리합니다."""
+    from docx import Document
+    from docx.shared import Cm
+
+    doc = Document()
+    _set_style_font(doc.styles["Normal"], spec["font"], spec["size"])
+    _set_style_font(doc.styles["Title"], spec["font"], spec["title_size"])
+    if spec.get("margin_cm"):
+        for section in doc.sections:
+            margin = Cm(spec["margin_cm"])
+            section.top_margin = section.bottom_margin = margin
+            section.left_margin = section.right_margin = margin
+
+    buffer = io.BytesIO()
+    doc.save(buffer)
+
+    # document.xml을 <w:body> 기준으로 앞/뒤(sectPr 포함)로 나눔
+    static_zip = io.BytesIO()
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(static_zip, "w", zipfile.ZIP_DEFLATED) as target:
+        document_xml = source.read(DOCUMENT_PART).decode("utf-8")
+        for info in source.infolist():
+            if info.filename != DOCUMENT_PART:
+                target.writestr(info, source.read(info.filename), compress_type=zipfile.ZIP_DEFLATED)
+
+    split_at = document_xml.index(BODY_OPEN) + len(BODY_OPEN)
+    return static_zip.getvalue(), document_xml[:split_at], document_xml[split_at:]
+
+
+def get_template(name: str = DEFAULT_TEMPLATE) -> Tuple[bytes, str, str]:
+    """캐시된 템플릿을 반환합니다 (처음 사용할 때 한 번만 생성)."""
+    if name not in TEMPLATES:
+        raise ValueError(f"알 수 없는 템플릿입니다: {name}")
+    template = _template_cache.get(name)
+    if template is None:
+        with _template_lock:
+            template = _template_cache.get(name)
+            if template is None:
+                template = _build_template(TEMPLATES[name])
+                _template_cache[name] = template
+    return template
+
+
+def _paragraph_xml(text: str, style: Optional[str] = None) -> str:
+    """한 줄의 텍스트를 w:p XML로 만듭니다 (공백 유지, 탭은 w:tab)."""
+    properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    text = INVALID_XML_CHARS.sub("", text.replace("\r", ""))
+    if not text:
+        return f"<w:p>{properties}</w:p>"
+    runs = "<w:tab/>".join(
+        f'<w:t xml:space="preserve">{escape(part)}</w:t>' if part else "" for part in text.split("\t")
+    )
+    return f"<w:p>{properties}<w:r>{runs}</w:r></w:p>"
+
+
+def render_docx(
+    text: str,
+    template: str = DEFAULT_TEMPLATE,
+    title: Optional[str] = "자기소개서"
+) -> bytes:
+    """
+    템플릿에 제목과 본문을 채워 .docx 바이트를 만듭니다.
+
+    Args:
+        text: 본문 텍스트 (줄 단위로 문단 생성)
+        template: TEMPLATES의 템플릿 이름
+        title: 제목 문단 (None이면 생략)
+
+    Returns:
+        .docx 파일 바이트
+    """
+    static_zip, document_head, document_tail = get_template(template)
+
+    parts = [document_head]
+    if title:
+        parts.append(_paragraph_xml(title, style="Title"))
+    for line in text.split("\n"):
+        parts.append(_paragraph_xml(line))
+    parts.append(document_tail)
+
+    # 본문을 뺀 패키지 뒤에 document.xml만 추가
+    buffer = io.BytesIO(static_zip)
+    with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(DOCUMENT_PART, "".join(parts))
+    return buffer.getvalue()
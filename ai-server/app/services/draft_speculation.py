@@ -0,0 +1,121 @@
+"""
+초안 선행 생성(speculation) 서비스
+문체 선택 단계에 들어서는 순간 기본 문체 초안을 백그라운드에서 미리 생성해 두고,
+사용자가 기본 문체나 "아무거나"를 고르면 그 결과를 바로 사용합니다 (다른 문체면 취소/폐기).
+적중률과 버려진 선행 생성에 든 시간을 통계로 남깁니다.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import Future, CancelledError
+from typing import Any, Callable, Dict, Optional
+
+from app.services.worker_pool import WorkerPool
+
+# SPECULATIVE_DRAFT=0이면 선행 생성을 하지 않음
+SPECULATION_ENABLED = os.getenv("SPECULATIVE_DRAFT", "1") != "0"
+SPECULATION_WORKERS = int(os.getenv("SPECULATION_WORKERS", "4"))
+# 선행 생성은 버려도 되는 작업이므로 종료 시 대기 중인 작업은 취소
+speculation_executor = WorkerPool(max_workers=SPECULATION_WORKERS, thread_name_prefix="speculation", cancel_on_shutdown=True)
+
+_lock = threading.Lock()
+stats = {
+    "started": 0,
+    "hits": 0,
+    "misses": 0,
+    "cancelled": 0,  # 실행 전에 취소되어 비용이 들지 않은 선행 생성
+    "wasted": 0,  # 이미 실행되어 결과를 버린 선행 생성
+    "wasted_seconds": 0.0,
+    "saved_seconds": 0.0,  # 적중 시 사용자가 기다리지 않아도 된 생성 시간
+}
+
+
+def _count(name: str, amount=1) -> None:
+    with _lock:
+        stats[name] += amount
+
+
+class Speculation:
+    """백그라운드에서 미리 실행 중인 초안 생성 작업"""
+
+    def __init__(self, style: str, func: Callable[..., Any], *args: Any):
+        self.style = style
+        self.run_seconds: Optional[float] = None
+        self.settled = False  # 사용(claim) 또는 폐기(discard) 여부
+        self.future: Future = speculation_executor.submit(self._run, func, *args)
+
+    def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.run_seconds = time.perf_counter() - started
+
+    def claim(self, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        선행 생성 결과를 사용합니다 (아직 생성 중이면 완료를 기다림).
+
+        Returns:
+            생성 결과 (실패하거나 취소된 경우 None → 호출 측에서 새로 생성)
+        """
+        if self.settled:
+            return None
+        self.settled = True
+        waited = time.perf_counter()
+        try:
+            result = self.future.result(timeout)
+        except (CancelledError, Exception) as e:
+            print(f"선행 생성 결과를 사용할 수 없습니다: {str(e)}")
+            _count("misses")
+            return None
+        _count("hits")
+        # 기다린 시간을 제외한 만큼이 절약된 시간
+        _count("saved_seconds", max((self.run_seconds or 0.0) - (time.perf_counter() - waited), 0.0))
+        return result
+
+    def discard(self) -> None:
+        """선행 생성을 사용하지 않습니다 (실행 전이면 취소, 실행 중이면 끝난 뒤 소요 시간을 낭비로 기록)."""
+        if self.settled:
+            return
+        self.settled = True
+        _count("misses")
+        if self.future.cancel():
+            _count("cancelled")
+            return
+
+        def record(done: Future):
+            _count("wasted")
+            _count("wasted_seconds", self.run_seconds or 0.0)
+
+        self.future.add_done_callback(record)
+
+
+def start_speculation(style: str, func: Callable[..., Any], *args: Any) -> Optional[Speculation]:
+    """
+    func(*args)를 백그라운드에서 미리 실행합니다.
+
+    Args:
+        style: 선행 생성하는 문체 (사용자 선택과 비교용)
+        func: 초안 생성 함수
+        *args: func에 전달할 인자 (호출 측 데이터가 바뀌어도 영향이 없도록 복사본 전달)
+
+    Returns:
+        Speculation (SPECULATIVE_DRAFT=0이면 None)
+    """
+    if not SPECULATION_ENABLED:
+        return None
+    _count("started")
+    return Speculation(style, func, *args)
+
+
+def speculation_stats() -> Dict[str, Any]:
+    """선행 생성 적중률과 낭비 비용 통계를 반환합니다."""
+    with _lock:
+        settled = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "wasted_seconds": round(stats["wasted_seconds"], 3),
+            "saved_seconds": round(stats["saved_seconds"], 3),
+            "hit_rate": round(stats["hits"] / settled, 3) if settled else None,
+        }
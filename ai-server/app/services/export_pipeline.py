@@ -0,0 +1,250 @@
+"""
+자기소개서 내보내기 파이프라인
+최종 자기소개서(draft_cover_letter)를 DOCX/PDF/HTML/Markdown으로 필요할 때 렌더링합니다.
+결과는 (초안 해시, 형식, 템플릿) 단위로 캐시하여 반복 다운로드나 형식 변경 시 다시 렌더링하지 않으며,
+렌더링은 전용 스레드 풀에서 실행하고 같은 키의 동시 요청은 하나의 작업으로 합칩니다.
+초안과 렌더링 결과 키는 공유 저장소(shared_store)에도 기록하여, 초안을 등록한 워커가 아닌 다른 워커 프로세스도
+같은 다운로드 요청을 처리할 수 있습니다.
+"""
+
+import os
+import html
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+from urllib.parse import quote
+
+import ormsgpack
+
+from app.services.docx_template import TEMPLATES, DEFAULT_TEMPLATE
+from app.services.file_storage import get_file_storage, DOCX_MEDIA_TYPE
+from app.services.pdf_renderer import render_pdf
+from app.services.shared_store import get_shared_store
+from app.services.word_file_handler import render_word_document, build_word_filename, PDF_MEDIA_TYPE
+from app.services.worker_pool import WorkerPool
+
+# 렌더링 전용 스레드 풀 (요청 처리 스레드/이벤트 루프와 분리)
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "2"))
+export_executor = WorkerPool(max_workers=EXPORT_WORKERS, thread_name_prefix="export")
+
+# 최근 초안 보관 개수 (오래된 초안은 캐시와 함께 제거)
+MAX_DRAFTS = int(os.getenv("EXPORT_MAX_DRAFTS", "256"))
+
+# 다운로드 요청이 렌더링 완료를 기다리는 최대 시간 (초과하면 202 응답 후 재요청)
+EXPORT_WAIT_SECONDS = float(os.getenv("EXPORT_WAIT_SECONDS", "20"))
+
+HTML_STYLE = (
+    "body{font-family:'Malgun Gothic','Apple SD Gothic Neo','Noto Sans KR',sans-serif;"
+    "max-width:720px;margin:40px auto;padding:0 20px;line-height:1.7;color:#222}"
+    "h1{font-size:1.6em;margin-bottom:1em}p{margin:0 0 .8em}"
+)
+
+
+def _render_docx(text: str, template: str) -> bytes:
+    return render_word_document(text, template)
+
+
+def _render_pdf(text: str, template: str) -> bytes:
+    return render_pdf(text)
+
+
+def _render_html(text: str, template: str) -> bytes:
+    paragraphs = "\n".join(f"<p>{html.escape(line.strip())}</p>" for line in text.split("\n") if line.strip())
+    document = (
+        "<!DOCTYPE html>\n<html lang=\"ko\">\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>자기소개서</title>\n<style>{HTML_STYLE}</style>\n</head>\n"
+        f"<body>\n<h1>자기소개서</h1>\n{paragraphs}\n</body>\n</html>\n"
+    )
+    return document.encode("utf-8")
+
+
+def _render_markdown(text: str, template: str) -> bytes:
+    paragraphs = "\n\n".join(line.strip() for line in text.split("\n") if line.strip())
+    return f"# 자기소개서\n\n{paragraphs}\n".encode("utf-8")
+
+
+# 형식 → (확장자, Content-Type, 렌더러). 템플릿은 DOCX에만 적용
+EXPORT_FORMATS = {
+    "docx": ("docx", DOCX_MEDIA_TYPE, _render_docx),
+    "pdf": ("pdf", PDF_MEDIA_TYPE, _render_pdf),
+    "html": ("html", "text/html; charset=utf-8", _render_html),
+    "md": ("md", "text/markdown; charset=utf-8", _render_markdown),
+}
+
+# 초안 해시 → {"text", "data", "exports": {(형식, 템플릿): 저장 키}} (최근 사용 순서)
+_drafts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# 렌더링 중인 작업 (같은 키의 동시 요청 병합)
+_inflight: Dict[Tuple[str, str, str], Future] = {}
+_lock = threading.Lock()
+stats = {"requests": 0, "hits": 0, "renders": 0, "coalesced": 0, "failed": 0}
+
+
+def get_draft_hash(cover_letter_text: str) -> str:
+    """초안 텍스트의 해시를 반환합니다 (내보내기 URL과 캐시 키에 사용)."""
+    return hashlib.sha256(cover_letter_text.encode("utf-8")).hexdigest()[:32]
+
+
+def _store_draft(draft_hash: str, draft: Dict[str, Any]) -> None:
+    """초안 텍스트와 파일명에 쓰는 데이터를 공유 저장소에 기록합니다 (프로젝트 목록은 제외)."""
+    data = {key: value for key, value in draft["data"].items() if key != "projects"}
+    try:
+        get_shared_store().put_value("drafts", draft_hash, ormsgpack.packb({"text": draft["text"], "data": data}))
+    except Exception as e:
+        print(f"초안 공유 저장 오류: {str(e)}")
+
+
+def _load_draft(draft_hash: str) -> Optional[Dict[str, Any]]:
+    """다른 워커가 등록한 초안을 공유 저장소에서 읽습니다."""
+    try:
+        blob = get_shared_store().get_value("drafts", draft_hash)
+    except Exception as e:
+        print(f"초안 공유 조회 오류: {str(e)}")
+        return None
+    if blob is None:
+        return None
+    stored = ormsgpack.unpackb(blob)
+    return {"text": stored["text"], "data": stored["data"], "exports": {}}
+
+
+def _export_key(draft_hash: str, export_format: str, template: str) -> str:
+    return f"{draft_hash}:{export_format}:{template}"
+
+
+def register_draft(cover_letter_text: str, cover_letter_data: Dict[str, Any]) -> str:
+    """
+    최종 초안을 내보내기 대상으로 등록하고 초안 해시를 반환합니다.
+
+    같은 초안을 다시 등록하면 기존 렌더링 캐시를 그대로 사용합니다.
+    """
+    draft_hash = get_draft_hash(cover_letter_text)
+    with _lock:
+        draft = _drafts.get(draft_hash)
+        if draft is None:
+            draft = {"text": cover_letter_text, "exports": {}}
+            _drafts[draft_hash] = draft
+            while len(_drafts) > MAX_DRAFTS:
+                _drafts.popitem(last=False)
+        draft["data"] = dict(cover_letter_data or {})
+        _drafts.move_to_end(draft_hash)
+    _store_draft(draft_hash, draft)
+    return draft_hash
+
+
+def _normalize(export_format: str, template: Optional[str]) -> Tuple[str, str]:
+    export_format = (export_format or "docx").lower()
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {export_format} (지원: {', '.join(EXPORT_FORMATS)})")
+    template = template or DEFAULT_TEMPLATE
+    if export_format != "docx":
+        # 템플릿은 DOCX에만 적용되므로 다른 형식은 하나의 캐시 항목 사용
+        template = DEFAULT_TEMPLATE
+    elif template not in TEMPLATES:
+        raise ValueError(f"알 수 없는 템플릿입니다: {template} (지원: {', '.join(TEMPLATES)})")
+    return export_format, template
+
+
+def _render_and_store(draft: Dict[str, Any], export_format: str, template: str, storage) -> str:
+    """초안을 렌더링하여 파일 저장소에 보관하고 저장 키를 반환합니다 (export_executor에서 실행)."""
+    extension, media_type, render = EXPORT_FORMATS[export_format]
+    data = render(draft["text"], template)
+    filename = build_word_filename(draft["data"], extension=extension)
+    return storage.save(data, filename, media_type=media_type)
+
+
+def submit_export(
+    draft_hash: str,
+    export_format: str = "docx",
+    template: Optional[str] = None,
+    base_dir: Path = None
+) -> Future:
+    """
+    초안의 내보내기를 요청하고 저장 키(file_id)를 결과로 갖는 Future를 반환합니다.
+
+    캐시된 파일이 저장소에 남아 있으면 바로 완료된 Future를, 같은 키가 렌더링 중이면 그 Future를 반환합니다.
+
+    Args:
+        draft_hash: register_draft()가 반환한 초안 해시
+        export_format: "docx", "pdf", "html", "md"
+        template: DOCX 템플릿 이름 (docx_template.TEMPLATES, 기본값: default)
+        base_dir: 디스크 저장소의 기본 디렉토리 (기본값: files/resumes)
+
+    Raises:
+        ValueError: 지원하지 않는 형식/템플릿
+        KeyError: 등록되지 않았거나 보관 기간이 지난 초안
+    """
+    export_format, template = _normalize(export_format, template)
+    storage = get_file_storage(base_dir)
+    key = (draft_hash, export_format, template)
+    store = get_shared_store()
+
+    with _lock:
+        draft = _drafts.get(draft_hash)
+    if draft is None:
+        draft = _load_draft(draft_hash)
+
+    with _lock:
+        stats["requests"] += 1
+        if draft is None:
+            raise KeyError(draft_hash)
+        draft = _drafts.setdefault(draft_hash, draft)
+        _drafts.move_to_end(draft_hash)
+        while len(_drafts) > MAX_DRAFTS:
+            _drafts.popitem(last=False)
+
+        file_id = draft["exports"].get((export_format, template))
+        if file_id is None:
+            # 다른 워커가 렌더링한 결과
+            stored = store.get_value("exports", _export_key(*key))
+            file_id = stored.decode("utf-8") if stored else None
+        if file_id and storage.get(file_id) is not None:
+            draft["exports"][(export_format, template)] = file_id
+            stats["hits"] += 1
+            future = Future()
+            future.set_result(file_id)
+            return future
+
+        future = _inflight.get(key)
+        if future is not None:
+            stats["coalesced"] += 1
+            return future
+
+        stats["renders"] += 1
+        future = export_executor.submit(_render_and_store, draft, export_format, template, storage)
+        _inflight[key] = future
+
+    def finish(done: Future):
+        with _lock:
+            _inflight.pop(key, None)
+            if done.cancelled() or done.exception() is not None:
+                stats["failed"] += 1
+                if not done.cancelled():
+                    print(f"내보내기 렌더링 오류 ({export_format}): {str(done.exception())}")
+            else:
+                draft["exports"][(export_format, template)] = done.result()
+        if not done.cancelled() and done.exception() is None:
+            try:
+                store.put_value("exports", _export_key(*key), done.result().encode("utf-8"))
+            except Exception as e:
+                print(f"내보내기 결과 공유 저장 오류: {str(e)}")
+
+    future.add_done_callback(finish)
+    return future
+
+
+def export_stats() -> Dict[str, Any]:
+    """내보내기 캐시/렌더링 통계를 반환합니다."""
+    with _lock:
+        return {**stats, "inflight": len(_inflight), "drafts": len(_drafts)}
+
+
+def build_export_url(draft_hash: str, export_format: str, template: Optional[str] = None, server_url: str = None) -> str:
+    """초안의 형식별 온디맨드 내보내기 URL을 만듭니다."""
+    if server_url is None:
+        server_url = os.getenv("AI_SERVER_URL", "http://localhost:8000")
+    url = f"{server_url}/files/exports/{quote(draft_hash, safe='')}/{quote(export_format, safe='')}"
+    if template and template != DEFAULT_TEMPLATE:
+        url += f"?template={quote(template, safe='')}"
+    return url
@@ -8,28 +8,27 @@ import base64
 import mimetypes
 import tempfile
 import shutil
+import tarfile
+import zipfile
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
-from openai import OpenAI
-from langchain_community.document_loaders import PyPDFLoader, Docx2txtLoader, TextLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_community.vectorstores import Chroma
-from langchain_core.prompts import ChatPromptTemplate
-import requests
+from typing import Dict, Any, Optional, Union, BinaryIO
 from urllib.parse import urlparse
 from fastapi import UploadFile
 
-# .env 파일 로드
-load_dotenv(verbose=True)
+from app.config import OPENAI_API_KEY
+from app.services.openai_client import get_client
+from app.services.url_fetcher import fetch_url
+from app.services.html_extractor import extract_main_content
+from app.services.content_sniffing import sniff_mime_type, sniff_file, read_head, read_text, SNIFF_BYTES, DOCX_MIME, PPTX_MIME
+from app.services.ooxml_reader import read_docx, read_pptx
+from app.services.archive_digest import build_archive_digest
+from app.services.worker_pool import WorkerPool
 
-# OpenAI API 키 확인
-openai_api_key = os.getenv("OPENAI_API_KEY")
-if not openai_api_key:
-    raise ValueError("OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다.")
-
-client = OpenAI(api_key=openai_api_key)
+# LLM 호출을 병렬로 실행하는 공유 스레드 풀
+analysis_executor = WorkerPool(
+    max_workers=int(os.getenv("ANALYSIS_WORKERS", "8")),
+    thread_name_prefix="analysis"
+)
 
 
 def encode_image_to_base64(image_path: str) -> Optional[str]:
@@ -44,16 +43,31 @@ def encode_image_to_base64(image_path: str) -> Optional[str]:
 
 def analyze_image(file_path: str) -> str:
     """GPT-4o Vision으로 이미지를 상세 분석합니다."""
-    try:
-        base64_image = encode_image_to_base64(file_path)
-        if not base64_image:
-            return ""
-        
-        # 이미지 타입 자동 감지
+    base64_image = encode_image_to_base64(file_path)
+    if not base64_image:
+        return ""
+    
+    # 이미지 타입 자동 감지 (시그니처 우선, 없으면 확장자)
+    mime_type = sniff_file(file_path)
+    if not mime_type or not mime_type.startswith('image/'):
         mime_type, _ = mimetypes.guess_type(file_path)
-        if not mime_type or not mime_type.startswith('image/'):
-            mime_type = "image/jpeg"
-        
+    if not mime_type or not mime_type.startswith('image/'):
+        mime_type = "image/jpeg"
+    
+    return analyze_image_data(base64_image, mime_type)
+
+
+def analyze_image_data(base64_image: str, mime_type: str, context: Optional[str] = None, max_tokens: int = 4000) -> str:
+    """
+    base64로 인코딩된 이미지를 GPT-4o Vision으로 분석합니다.
+    
+    Args:
+        base64_image: base64 인코딩된 이미지
+        mime_type: 이미지 MIME 타입
+        context: 프롬프트 앞에 붙일 맥락 설명 (예: 문서에 포함된 이미지)
+        max_tokens: 응답 최대 토큰 수
+    """
+    try:
         prompt = """이 이미지를 분석하여 프로젝트/활동 메타데이터를 추출해주세요.
 
 다음 정보를 찾아주세요:
@@ -73,7 +87,10 @@ def analyze_image(file_path: str) -> str:
 - 발표 자료나 포스터인 경우 각 섹션의 내용을 모두 파악해주세요
 - UI/디자인 요소도 설명해주세요 (색상, 레이아웃, 브랜딩 등)"""
 
-        response = client.chat.completions.create(
+        if context:
+            prompt = f"{context}\n\n{prompt}"
+
+        response = get_client().chat.completions.create(
             model="gpt-4o",
             messages=[
                 {
@@ -89,7 +106,7 @@ def analyze_image(file_path: str) -> str:
                     ]
                 }
             ],
-            max_tokens=4000,
+            max_tokens=max_tokens,
             temperature=0.2,
             timeout=25.0
         )
@@ -134,7 +151,7 @@ def analyze_pdf(file_path: str) -> str:
 - 모든 숫자와 단위를 정확히 유지해주세요
 - 발표 자료나 포스터인 경우 각 슬라이드/섹션의 내용을 모두 파악해주세요"""
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-4o",
             messages=[
                 {
@@ -166,6 +183,9 @@ def analyze_pdf(file_path: str) -> str:
 def analyze_pdf_fallback(file_path: str) -> str:
     """PDF 파일을 텍스트로 추출하고 벡터화하여 분석합니다 (폴백 방식)."""
     try:
+        # LangChain 로더는 폴백 경로에서만 쓰므로 이때 import
+        from langchain_community.document_loaders import PyPDFLoader
+        
         # PDF 로딩
         loader = PyPDFLoader(file_path)
         documents = loader.load()
@@ -190,6 +210,12 @@ def analyze_pdf_fallback(file_path: str) -> str:
 def analyze_pdf_with_vector_db(file_path: str, documents: list) -> str:
     """벡터 DB를 사용하여 긴 PDF를 분석합니다."""
     try:
+        # LangChain/Chroma는 긴 PDF 분석에서만 쓰므로 이때 import (서버 시작 시간 단축)
+        from langchain_text_splitters import RecursiveCharacterTextSplitter
+        from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+        from langchain_community.vectorstores import Chroma
+        from langchain_core.prompts import ChatPromptTemplate
+        
         # 텍스트 분할
         text_splitter = RecursiveCharacterTextSplitter(
             chunk_size=1000,
@@ -206,7 +232,7 @@ def analyze_pdf_with_vector_db(file_path: str, documents: list) -> str:
         
         # RAG를 사용한 분석
         llm = ChatOpenAI(
-            openai_api_key=openai_api_key,
+            openai_api_key=OPENAI_API_KEY,
             model_name="gpt-4o-mini",
             temperature=0
         )
@@ -245,68 +271,184 @@ def analyze_pdf_with_vector_db(file_path: str, documents: list) -> str:
 
 
 def analyze_word(file_path: str) -> str:
-    """Word 문서를 분석합니다."""
+    """
+    Word 문서를 분석합니다.
+    
+    zip 컨테이너를 한 번만 읽어 본문 텍스트와 포함된 이미지(차트, 스크린샷 등)를 함께 추출하고,
+    본문 텍스트 분석과 이미지 분석을 동시에 실행한 뒤 하나의 분석 결과로 합칩니다.
+    """
     try:
-        loader = Docx2txtLoader(file_path)
-        documents = loader.load()
-        
-        if not documents:
-            return ""
-        
-        full_text = "\n\n".join([doc.page_content for doc in documents])
-        return analyze_text_with_llm(full_text)
-        
+        content = read_docx(file_path)
     except Exception as e:
         print(f"Word 문서 분석 오류: {str(e)}")
         return ""
+    
+    text = content["text"]
+    images = content["images"]
+    if not text.strip() and not images:
+        return ""
+    
+    print(f"Word 문서: 본문 {len(text)}자, 이미지 {len(images)}개 병렬 분석")
+    
+    # 본문 분석과 이미지 분석을 동시에 실행 (전체 소요 시간 ≈ 가장 느린 호출)
+    text_future = analysis_executor.submit(analyze_text_with_llm, text) if text.strip() else None
+    image_futures = [
+        analysis_executor.submit(
+            analyze_image_data,
+            base64.b64encode(image["data"]).decode('utf-8'),
+            image["mime_type"],
+            "다음은 프로젝트 Word 문서에 포함된 이미지입니다. 문서 본문은 별도로 분석됩니다.",
+            1500
+        )
+        for image in images
+    ]
+    
+    sections = []
+    if text_future is not None:
+        text_analysis = text_future.result()
+        if text_analysis:
+            sections.append(f"[문서 본문 분석]\n{text_analysis}")
+    for index, future in enumerate(image_futures, start=1):
+        image_analysis = future.result()
+        if image_analysis:
+            sections.append(f"[문서 내 이미지 {index} 분석]\n{image_analysis}")
+    
+    return "\n\n".join(sections)
+
+
+# 이미지 위주 슬라이드 판별 기준: 텍스트가 적고 큰 이미지가 있는 슬라이드
+IMAGE_HEAVY_SLIDE_MAX_TEXT = 200
+IMAGE_HEAVY_SLIDE_MIN_IMAGE_BYTES = 50 * 1024
 
+# 덱당 Vision으로 보낼 최대 슬라이드 수
+MAX_VISION_SLIDES = 8
 
-def analyze_text_file(file_path: str) -> str:
-    """텍스트 파일을 분석합니다."""
-    encodings = ['utf-8', 'utf-8-sig', 'cp949', 'latin-1']
+
+def analyze_pptx(file_path: str) -> str:
+    """
+    PowerPoint 발표 자료를 분석합니다.
     
-    for encoding in encodings:
-        try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                full_text = f.read()
-            
-            if not full_text.strip():
-                continue
-            
-            return analyze_text_with_llm(full_text)
-        except (UnicodeDecodeError, UnicodeError):
+    슬라이드 텍스트/발표자 노트/이미지를 패키지에서 직접 추출한 뒤,
+    텍스트 위주 슬라이드는 한 번의 텍스트 LLM 호출로 묶어 분석하고
+    이미지 위주 슬라이드만 Vision으로 동시에 분석하여 하나의 분석 결과로 합칩니다.
+    """
+    try:
+        slides = read_pptx(file_path)["slides"]
+    except Exception as e:
+        print(f"PowerPoint 문서 분석 오류: {str(e)}")
+        return ""
+    
+    if not slides:
+        return ""
+    
+    # 이미지 위주 슬라이드 선별 (이미지가 큰 순서로 최대 MAX_VISION_SLIDES개)
+    image_heavy = [
+        slide for slide in slides
+        if slide["images"]
+        and len(slide["text"]) <= IMAGE_HEAVY_SLIDE_MAX_TEXT
+        and len(slide["images"][0]["data"]) >= IMAGE_HEAVY_SLIDE_MIN_IMAGE_BYTES
+    ]
+    image_heavy = sorted(image_heavy, key=lambda slide: len(slide["images"][0]["data"]), reverse=True)[:MAX_VISION_SLIDES]
+    vision_indexes = {slide["index"] for slide in image_heavy}
+    
+    # 나머지 슬라이드는 텍스트를 묶어 한 번에 분석
+    text_blocks = []
+    for slide in slides:
+        if slide["index"] in vision_indexes:
             continue
-        except Exception as e:
-            print(f"텍스트 파일 분석 오류: {str(e)}")
-            return ""
+        block = [f"[슬라이드 {slide['index']}]"]
+        if slide["text"]:
+            block.append(slide["text"])
+        if slide["notes"]:
+            block.append(f"(발표자 노트) {slide['notes']}")
+        if len(block) > 1:
+            text_blocks.append("\n".join(block))
+    
+    print(f"PowerPoint 문서: 슬라이드 {len(slides)}장 (텍스트 {len(text_blocks)}장 일괄, 이미지 {len(image_heavy)}장 병렬 분석)")
     
-    print("텍스트 파일을 읽을 수 없습니다. 지원하지 않는 인코딩일 수 있습니다.")
-    return ""
+    text_future = None
+    if text_blocks:
+        text_future = analysis_executor.submit(
+            analyze_text_with_llm,
+            "다음은 발표 자료(PPT)의 슬라이드별 텍스트입니다.\n\n" + "\n\n".join(text_blocks)
+        )
+    
+    vision_futures = []
+    for slide in sorted(image_heavy, key=lambda slide: slide["index"]):
+        image = slide["images"][0]
+        context = f"다음은 발표 자료의 {slide['index']}번 슬라이드 이미지입니다."
+        if slide["text"]:
+            context += f"\n슬라이드 텍스트: {slide['text']}"
+        if slide["notes"]:
+            context += f"\n발표자 노트: {slide['notes']}"
+        future = analysis_executor.submit(
+            analyze_image_data,
+            base64.b64encode(image["data"]).decode('utf-8'),
+            image["mime_type"],
+            context,
+            1500
+        )
+        vision_futures.append((slide["index"], future))
+    
+    # 결과 취합 (reduce)
+    sections = []
+    if text_future is not None:
+        text_analysis = text_future.result()
+        if text_analysis:
+            sections.append(f"[슬라이드 텍스트 종합 분석]\n{text_analysis}")
+    for index, future in vision_futures:
+        slide_analysis = future.result()
+        if slide_analysis:
+            sections.append(f"[슬라이드 {index} 이미지 분석]\n{slide_analysis}")
+    
+    return "\n\n".join(sections)
+
+
+def analyze_archive(file_path: str) -> str:
+    """소스 코드 압축 파일(.zip, .tar.gz)을 분석합니다."""
+    try:
+        # 디스크에 풀지 않고 항목을 순회하며 언어 통계/프레임워크/핵심 파일 발췌로 요약
+        digest = build_archive_digest(file_path)
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+        print(f"압축 파일 분석 오류: {str(e)}")
+        return ""
+    
+    if not digest["file_count"]:
+        print("압축 파일에 분석할 파일이 없습니다.")
+        return ""
+    
+    print(f"압축 파일 요약: 파일 {digest['file_count']}개, 코드 {digest['loc']}줄, 프레임워크 {digest['frameworks']}")
+    return analyze_text_with_llm(f"다음은 업로드된 소스 코드 저장소(압축 파일)의 요약입니다.\n\n{digest['digest']}")
+
+
+def analyze_text_file(source: Union[str, BinaryIO]) -> str:
+    """텍스트 파일을 분석합니다 (파일 경로 또는 업로드된 파일 객체)."""
+    try:
+        # 한 번만 읽으면서 인코딩 판별 및 디코딩
+        full_text, encoding = read_text(source)
+    except Exception as e:
+        print(f"텍스트 파일 분석 오류: {str(e)}")
+        return ""
+    
+    if not full_text.strip():
+        print("텍스트 파일이 비어 있습니다.")
+        return ""
+    
+    return analyze_text_with_llm(full_text)
 
 
 def analyze_link(url: str) -> str:
     """링크의 내용을 가져와서 분석합니다."""
     try:
-        # 웹 페이지 내용 가져오기
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        # 웹 페이지 내용 가져오기 (스트리밍 + 크기 제한 + 조건부 요청 캐시)
+        fetched = fetch_url(url)
+        if fetched["from_cache"]:
+            print(f"캐시된 페이지 재사용 (304): {url}")
         
-        # HTML에서 텍스트 추출 (간단한 버전)
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 스크립트와 스타일 제거
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        text = soup.get_text()
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        # 텍스트가 너무 길면 앞부분만 사용
-        if len(text) > 50000:
-            text = text[:50000]
+        # 본문 추출 (네비게이션/푸터/쿠키 배너 제거, 제목/목록 구조 유지)
+        text = extract_main_content(fetched["content"], encoding=fetched["encoding"], max_chars=50000)
+        if not text:
+            return ""
         
         return analyze_text_with_llm(text)
         
@@ -333,7 +475,7 @@ def analyze_text_with_llm(text: str) -> str:
 
 위 텍스트를 분석하여 프로젝트 메타데이터를 추출해주세요."""
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "user", "content": prompt}
@@ -377,7 +519,7 @@ def extract_metadata_from_analysis(analysis_text: str, source_summary: str = Non
 배열 항목이 없으면 빈 배열 []로 설정하세요.
 반드시 유효한 JSON 형식으로만 응답하세요. 다른 설명은 하지 마세요."""
 
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "user", "content": prompt}
@@ -464,11 +606,57 @@ def is_url(input_string: str) -> bool:
         return False
 
 
-def detect_file_type(file_path: str) -> str:
-    """파일 타입을 감지합니다."""
+# MIME 타입 → 분석 파일 타입
+MIME_FILE_TYPES = {
+    "application/pdf": "pdf",
+    "application/msword": "word",
+    DOCX_MIME: "word",
+    PPTX_MIME: "pptx",
+    "application/zip": "archive",
+    "application/gzip": "archive",
+    "application/x-tar": "archive",
+}
+
+# 소스 코드 압축 파일 확장자 (.tar.gz는 접미사가 두 개이므로 파일명 끝으로 비교)
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz')
+
+
+def file_type_from_mime(mime_type: Optional[str]) -> Optional[str]:
+    """MIME 타입을 분석 파일 타입으로 변환합니다."""
+    if not mime_type:
+        return None
+    if mime_type.startswith('image/'):
+        return "image"
+    if mime_type.startswith('text/'):
+        return "text"
+    return MIME_FILE_TYPES.get(mime_type)
+
+
+def detect_file_type(file_path: str, head: Optional[bytes] = None, file_obj: Optional[BinaryIO] = None) -> str:
+    """
+    파일 타입을 감지합니다.
+    
+    파일 앞부분의 시그니처(매직 바이트)를 먼저 확인하고,
+    판별되지 않으면 MIME 타입 추측과 확장자로 감지합니다.
+    
+    Args:
+        file_path: 파일 경로, 파일명 또는 URL
+        head: 파일 앞부분 바이트 (없으면 file_path에서 읽음)
+        file_obj: 업로드 파일 객체 (ZIP 컨테이너의 중앙 디렉토리 확인용, 읽기 위치는 유지)
+    """
     if is_url(file_path):
         return "link"
     
+    # 시그니처 기반 감지
+    if head is None and os.path.isfile(file_path):
+        with open(file_path, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+    if head:
+        sniffed_source = file_obj if file_obj is not None else (file_path if os.path.isfile(file_path) else None)
+        sniffed_type = file_type_from_mime(sniff_mime_type(head, sniffed_source))
+        if sniffed_type:
+            return sniffed_type
+    
     mime_type, _ = mimetypes.guess_type(file_path)
     
     if mime_type:
@@ -478,6 +666,10 @@ def detect_file_type(file_path: str) -> str:
             return "pdf"
         elif mime_type in ['application/msword', 'application/vnd.openxmlformats-officedocument.wordprocessingml.document']:
             return "word"
+        elif mime_type == PPTX_MIME:
+            return "pptx"
+        elif mime_type in ['application/zip', 'application/x-tar']:
+            return "archive"
         elif mime_type.startswith('text/'):
             return "text"
     
@@ -489,15 +681,45 @@ def detect_file_type(file_path: str) -> str:
         return "pdf"
     elif ext in ['.doc', '.docx']:
         return "word"
+    elif ext == '.pptx':
+        return "pptx"
+    elif file_path.lower().endswith(ARCHIVE_EXTENSIONS):
+        return "archive"
     elif ext in ['.txt', '.md', '.py', '.js', '.html', '.css']:
         return "text"
     
     return "unknown"
 
 
-def extract_project_metadata(file_path: str, source_name: str = None) -> Dict[str, Any]:
-    """프로젝트 파일을 분석하여 메타데이터를 추출합니다."""
-    file_type = detect_file_type(file_path)
+# 파일 타입별 분석 함수
+FILE_ANALYZERS = {
+    "image": analyze_image,
+    "pdf": analyze_pdf,
+    "word": analyze_word,
+    "pptx": analyze_pptx,
+    "archive": analyze_archive,
+    "text": analyze_text_file,
+    "link": analyze_link,
+}
+
+
+def extract_project_metadata(
+    file_path: str,
+    source_name: str = None,
+    file_type: Optional[str] = None,
+    source: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    프로젝트 파일을 분석하여 메타데이터를 추출합니다.
+    
+    Args:
+        file_path: 파일 경로 또는 URL
+        source_name: 요약에 표시할 원본 파일명
+        file_type: 이미 판별된 파일 타입 (없으면 감지)
+        source: 분석기에 전달할 입력 (기본값: file_path, 메모리 업로드 파일 객체 등)
+    """
+    if file_type is None:
+        file_type = detect_file_type(file_path)
     
     # source_summary 생성
     if source_name:
@@ -510,7 +732,8 @@ def extract_project_metadata(file_path: str, source_name: str = None) -> Dict[st
     else:
         source_summary = f"{file_name} 업로드됨"
     
-    if file_type == "unknown":
+    analyzer = FILE_ANALYZERS.get(file_type)
+    if analyzer is None:
         return {
             "project": {
                 "title": "지원하지 않는 파일 형식",
@@ -530,18 +753,7 @@ def extract_project_metadata(file_path: str, source_name: str = None) -> Dict[st
     print(f"분석 중...")
     
     # 파일 타입별 분석
-    analysis_text = ""
-    
-    if file_type == "image":
-        analysis_text = analyze_image(file_path)
-    elif file_type == "pdf":
-        analysis_text = analyze_pdf(file_path)
-    elif file_type == "word":
-        analysis_text = analyze_word(file_path)
-    elif file_type == "text":
-        analysis_text = analyze_text_file(file_path)
-    elif file_type == "link":
-        analysis_text = analyze_link(file_path)
+    analysis_text = analyzer(source if source is not None else file_path)
     
     if not analysis_text:
         return {
@@ -565,10 +777,196 @@ def extract_project_metadata(file_path: str, source_name: str = None) -> Dict[st
     return metadata
 
 
-def analyze_project_from_formdata(
+def _error_metadata(title: str, error: str, summary: Optional[str] = None) -> Dict[str, Any]:
+    """분석 실패 시 반환할 기본 메타데이터를 만듭니다."""
+    return {
+        "project": {
+            "title": title,
+            "category": None,
+            "summary": summary,
+            "tags": [],
+            "roles": [],
+            "achievements": [],
+            "tools": [],
+            "description": None
+        },
+        "status": "error",
+        "error": error
+    }
+
+
+def analyze_uploaded_file(file: UploadFile) -> Dict[str, Any]:
+    """업로드된 파일을 분석하여 메타데이터를 추출합니다."""
+    # 업로드 앞부분의 시그니처로 파일 타입 판별 (확장자가 없거나 잘못된 경우 대비)
+    head = read_head(file.file)
+    file_type = detect_file_type(file.filename, head=head, file_obj=file.file)
+    
+    if file_type == "text":
+        # 텍스트는 임시 파일 없이 업로드 스트림에서 한 번만 읽어 분석
+        return extract_project_metadata(
+            file.filename,
+            source_name=file.filename,
+            file_type=file_type,
+            source=file.file
+        )
+    
+    # 파일을 임시 디렉토리에 저장
+    temp_dir = tempfile.mkdtemp()
+    try:
+        temp_file_path = os.path.join(temp_dir, os.path.basename(file.filename))
+        with open(temp_file_path, "wb") as f:
+            shutil.copyfileobj(file.file, f)
+        
+        # 파일 분석 (원본 파일명 전달)
+        return extract_project_metadata(temp_file_path, source_name=file.filename, file_type=file_type)
+    finally:
+        # 임시 파일 정리
+        try:
+            shutil.rmtree(temp_dir)
+        except Exception as e:
+            print(f"임시 파일 삭제 오류: {str(e)}")
+
+
+def analyze_input_text(text: str) -> Dict[str, Any]:
+    """직접 입력된 텍스트를 분석하여 메타데이터를 추출합니다."""
+    source_summary = "텍스트 직접 입력"
+    analysis_text = analyze_text_with_llm(text)
+    
+    if not analysis_text:
+        return _error_metadata("텍스트 분석 실패", "텍스트 분석에 실패했습니다.", source_summary)
+    
+    # 구조화된 메타데이터 추출
+    return extract_metadata_from_analysis(analysis_text, source_summary)
+
+
+# 통합 분석에서 단일 값 필드를 채택하는 소스 우선순위
+SOURCE_PRIORITY = ["file", "url", "text"]
+SCALAR_FIELDS = ["title", "category", "description"]
+LIST_FIELDS = ["tags", "roles", "achievements", "tools"]
+PROJECT_FIELDS = ["title", "category", "summary", "tags", "roles", "achievements", "tools", "description"]
+
+# 소스별 분석을 동시에 실행하는 스레드 풀
+# (analyze_word/analyze_pptx가 analysis_executor에서 결과를 기다리므로 별도 풀 사용)
+source_executor = WorkerPool(
+    max_workers=int(os.getenv("SOURCE_WORKERS", "6")),
+    thread_name_prefix="source"
+)
+
+
+def merge_project_metadata(results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    소스별 메타데이터를 하나의 project로 병합합니다.
+    
+    단일 값 필드는 SOURCE_PRIORITY 순서로 처음 값이 있는 소스를 채택하고,
+    목록 필드는 소스 순서대로 합집합(대소문자 무시 중복 제거)을 만듭니다.
+    
+    Args:
+        results: {"file" | "url" | "text": 메타데이터 딕셔너리}
+    
+    Returns:
+        {"project": 병합된 project, "provenance": {필드: 소스 또는 [소스]}, "status": "analyzed"}
+    """
+    sources = [name for name in SOURCE_PRIORITY if name in results]
+    projects = {name: results[name].get("project") or {} for name in sources}
+    
+    merged: Dict[str, Any] = {}
+    provenance: Dict[str, Any] = {}
+    
+    for field in SCALAR_FIELDS:
+        merged[field] = None
+        for name in sources:
+            value = projects[name].get(field)
+            if value:
+                merged[field] = value
+                provenance[field] = name
+                break
+    
+    for field in LIST_FIELDS:
+        merged[field] = []
+        seen = set()
+        contributors = []
+        for name in sources:
+            for item in projects[name].get(field) or []:
+                key = str(item).strip().lower()
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                merged[field].append(item)
+                if name not in contributors:
+                    contributors.append(name)
+        if contributors:
+            provenance[field] = contributors
+    
+    # 요약은 각 소스 요약을 이어 붙임 (예: "project.pdf 업로드됨 + URL: ...")
+    summaries = [projects[name].get("summary") for name in sources if projects[name].get("summary")]
+    merged["summary"] = " + ".join(summaries) if summaries else None
+    if summaries:
+        provenance["summary"] = [name for name in sources if projects[name].get("summary")]
+    
+    # 단일 소스 분석 결과와 같은 필드 순서로 정렬
+    project = {field: merged[field] for field in PROJECT_FIELDS}
+    return {"project": project, "provenance": provenance, "status": "analyzed"}
+
+
+def analyze_project_combined(
     file: Optional[UploadFile] = None,
     url: Optional[str] = None,
     text: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    제공된 file, url, text를 모두 동시에 분석하여 하나의 project로 병합합니다.
+    
+    전체 소요 시간은 소스별 분석 시간의 합이 아니라 가장 느린 소스의 시간이 됩니다.
+    실패한 소스는 제외하고 병합하며, 결과의 "sources"에 소스별 상태를 기록합니다.
+    
+    Returns:
+        {"project": ..., "provenance": {필드: 소스}, "sources": {소스: "analyzed" | 오류}, "status": ...}
+    """
+    tasks = {}
+    if file and file.filename:
+        tasks["file"] = (analyze_uploaded_file, file)
+    if url:
+        tasks["url"] = (extract_project_metadata, url)
+    if text:
+        tasks["text"] = (analyze_input_text, text)
+    
+    if not tasks:
+        return _error_metadata("입력 데이터 없음", "file, url, text 중 하나 이상을 제공해야 합니다.")
+    
+    futures = {name: source_executor.submit(func, arg) for name, (func, arg) in tasks.items()}
+    
+    results: Dict[str, Dict[str, Any]] = {}
+    source_status: Dict[str, str] = {}
+    for name, future in futures.items():
+        try:
+            metadata = future.result()
+        except Exception as e:
+            print(f"{name} 소스 분석 오류: {str(e)}")
+            source_status[name] = f"분석 중 오류가 발생했습니다: {str(e)}"
+            continue
+        if metadata.get("status") == "error":
+            source_status[name] = metadata.get("error", "분석에 실패했습니다.")
+            continue
+        results[name] = metadata
+        source_status[name] = "analyzed"
+    
+    if not results:
+        # 모든 소스가 실패하면 우선순위가 가장 높은 소스의 오류를 반환
+        first = next(name for name in SOURCE_PRIORITY if name in tasks)
+        failed = _error_metadata("분석 오류 발생", source_status[first])
+        failed["sources"] = source_status
+        return failed
+    
+    merged = merge_project_metadata(results)
+    merged["sources"] = source_status
+    return merged
+
+
+def analyze_project_from_formdata(
+    file: Optional[UploadFile] = None,
+    url: Optional[str] = None,
+    text: Optional[str] = None,
+    mode: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     FormData로 받은 file, url, text를 분석하여 프로젝트 메타데이터를 추출합니다.
@@ -577,100 +975,34 @@ def analyze_project_from_formdata(
         file: 업로드된 파일 (선택)
         url: 분석할 URL (선택)
         text: 분석할 텍스트 (선택)
+        mode: "combined"이면 제공된 모든 소스를 동시에 분석하여 병합,
+              그 외에는 file > url > text 우선순위로 하나만 분석
     
     Returns:
         프로젝트 메타데이터 딕셔너리
     """
-    temp_file_path = None
-    
     try:
+        if mode == "combined":
+            return analyze_project_combined(file, url, text)
+        
         # 우선순위: file > url > text
         if file and file.filename:
-            # 파일을 임시 디렉토리에 저장
-            temp_dir = tempfile.mkdtemp()
-            temp_file_path = os.path.join(temp_dir, file.filename)
-            
-            # 파일 저장
-            with open(temp_file_path, "wb") as f:
-                shutil.copyfileobj(file.file, f)
-            
-            # 파일 분석 (원본 파일명 전달)
-            metadata = extract_project_metadata(temp_file_path, source_name=file.filename)
-            return metadata
-            
+            return analyze_uploaded_file(file)
         elif url:
             # URL 분석
-            metadata = extract_project_metadata(url)
-            return metadata
-            
+            return extract_project_metadata(url)
         elif text:
             # 텍스트 직접 분석
-            source_summary = "텍스트 직접 입력"
-            analysis_text = analyze_text_with_llm(text)
-            
-            if not analysis_text:
-                return {
-                    "project": {
-                        "title": "텍스트 분석 실패",
-                        "category": None,
-                        "summary": source_summary,
-                        "tags": [],
-                        "roles": [],
-                        "achievements": [],
-                        "tools": [],
-                        "description": None
-                    },
-                    "status": "error",
-                    "error": "텍스트 분석에 실패했습니다."
-                }
-            
-            # 구조화된 메타데이터 추출
-            metadata = extract_metadata_from_analysis(analysis_text, source_summary)
-            return metadata
-            
+            return analyze_input_text(text)
         else:
             # 입력이 없는 경우
-            return {
-                "project": {
-                    "title": "입력 데이터 없음",
-                    "category": None,
-                    "summary": None,
-                    "tags": [],
-                    "roles": [],
-                    "achievements": [],
-                    "tools": [],
-                    "description": None
-                },
-                "status": "error",
-                "error": "file, url, text 중 하나 이상을 제공해야 합니다."
-            }
+            return _error_metadata("입력 데이터 없음", "file, url, text 중 하나 이상을 제공해야 합니다.")
             
     except Exception as e:
         print(f"FormData 분석 오류: {str(e)}")
         import traceback
         traceback.print_exc()
-        return {
-            "project": {
-                "title": "분석 오류 발생",
-                "category": None,
-                "summary": None,
-                "tags": [],
-                "roles": [],
-                "achievements": [],
-                "tools": [],
-                "description": None
-            },
-            "status": "error",
-            "error": f"분석 중 오류가 발생했습니다: {str(e)}"
-        }
-    finally:
-        # 임시 파일 정리
-        if temp_file_path and os.path.exists(temp_file_path):
-            try:
-                temp_dir = os.path.dirname(temp_file_path)
-                shutil.rmtree(temp_dir)
-            except Exception as e:
-                print(f"임시 파일 삭제 오류: {str(e)}")
+        return _error_metadata("분석 오류 발생", f"분석 중 오류가 발생했습니다: {str(e)}")
 
 
 def main():
@@ -0,0 +1,346 @@
+"""
+생성 파일 수명 관리 서비스
+생성된 파일을 내용 해시 기반 이름으로 저장소(blob_store)에 보관하고,
+인덱스로 O(1) 조회, 파일별 TTL 만료, 용량 한도 초과 시 LRU 제거, 백그라운드 GC를 담당합니다.
+디스크 저장소는 항목마다 메타데이터 파일(.meta/<키>.json)을 따로 두어, 여러 워커 프로세스가 잠금이나 전체 인덱스 재작성 없이
+자기가 저장/삭제한 항목만 씁니다. 다른 워커가 저장한 파일은 조회할 때 해당 메타데이터 파일 하나만 읽습니다.
+"""
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, BinaryIO
+
+from app.services.blob_store import get_blob_store, LocalBlobStore
+
+# 기본 보관 기간, 용량 한도, GC 주기
+DEFAULT_TTL_SECONDS = int(os.getenv("RESUME_TTL_SECONDS", str(7 * 24 * 3600)))
+DEFAULT_QUOTA_BYTES = int(os.getenv("RESUME_QUOTA_BYTES", str(500 * 1024 * 1024)))
+DEFAULT_GC_INTERVAL = int(os.getenv("RESUME_GC_INTERVAL", "600"))
+
+# 디스크 저장소의 항목별 메타데이터 디렉토리 (재시작 후에도 표시 파일명/만료 시각 유지)
+META_DIRNAME = ".meta"
+# 이전 버전의 단일 인덱스 파일 (시작할 때 항목별 메타데이터로 옮긴 뒤 삭제)
+LEGACY_INDEX_FILENAME = ".index.json"
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class FileStorageManager:
+    """TTL/용량 한도/LRU 제거를 적용하는 생성 파일 저장소 관리자"""
+
+    def __init__(self, store, ttl_seconds: int = DEFAULT_TTL_SECONDS, quota_bytes: int = DEFAULT_QUOTA_BYTES):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.quota_bytes = quota_bytes
+        # 파일 키 → 항목 (오래 사용하지 않은 순서, 마지막이 최근)
+        self._index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats = {"saved": 0, "deduplicated": 0, "expired": 0, "evicted": 0}
+
+        self._meta_dir = store.base_dir / META_DIRNAME if isinstance(store, LocalBlobStore) else None
+        if self._meta_dir:
+            self._meta_dir.mkdir(exist_ok=True)
+            self._load_index()
+
+    # ---- 인덱스 ----
+
+    def _load_index(self) -> None:
+        """항목별 메타데이터를 읽고, 메타데이터가 없는 기존 파일도 수정 시각 기준으로 등록합니다."""
+        legacy_path = self.store.base_dir / LEGACY_INDEX_FILENAME
+        legacy = {}
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        base_dir = self.store.base_dir
+        for path in sorted(base_dir.iterdir(), key=lambda p: p.stat().st_mtime):
+            if not path.is_file() or path.name.startswith(".") or path.suffix == ".tmp":
+                continue
+            entry = self._read_meta(path.name)
+            if entry is None:
+                entry = legacy.get(path.name)
+                if entry is None:
+                    # 이전 방식으로 저장된 파일 (자기소개서_{직무}_{시각}.docx)
+                    mtime = path.stat().st_mtime
+                    entry = {
+                        "filename": path.name,
+                        "media_type": DOCX_MEDIA_TYPE if path.suffix == ".docx" else "application/octet-stream",
+                        "size": path.stat().st_size,
+                        "created_at": mtime,
+                        "expires_at": mtime + self.ttl_seconds,
+                        "last_access": mtime,
+                    }
+                self._write_meta(path.name, entry)
+            self._index[path.name] = entry
+            self._total_bytes += entry["size"]
+
+        if legacy:
+            try:
+                legacy_path.unlink()
+            except OSError:
+                pass
+
+        # 최근 사용 순서 복원
+        for key in sorted(self._index, key=lambda k: self._index[k]["last_access"]):
+            self._index.move_to_end(key)
+
+    def _meta_path(self, key: str) -> Path:
+        return self._meta_dir / f"{key}.json"
+
+    def _read_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key: str, entry: Dict[str, Any]) -> None:
+        """항목 메타데이터를 임시 파일에 쓴 뒤 원자적으로 교체합니다 (디스크 저장소만)."""
+        if not self._meta_dir:
+            return
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self._meta_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, self._meta_path(key))
+        except OSError as e:
+            print(f"파일 메타데이터 저장 오류 ({key}): {str(e)}")
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _delete_meta(self, key: str) -> None:
+        if not self._meta_dir:
+            return
+        try:
+            self._meta_path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"파일 메타데이터 삭제 오류 ({key}): {str(e)}")
+
+    def _forget(self, key: str) -> None:
+        """파일이 이미 없어진 항목(다른 워커가 삭제)을 인덱스에서만 뺍니다."""
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry["size"]
+
+    def _remove(self, key: str) -> None:
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        self._total_bytes -= entry["size"]
+        try:
+            self.store.delete(key)
+        except OSError as e:
+            print(f"파일 삭제 오류 ({key}): {str(e)}")
+        self._delete_meta(key)
+
+    # ---- 공개 API ----
+
+    def save(
+        self,
+        data: bytes,
+        filename: str,
+        media_type: str = DOCX_MEDIA_TYPE,
+        ttl_seconds: Optional[int] = None
+    ) -> str:
+        """
+        파일을 내용 해시 기반 키로 저장하고 키를 반환합니다.
+
+        같은 내용이 이미 있으면 다시 쓰지 않고 만료 시각만 연장합니다.
+
+        Args:
+            data: 파일 바이트
+            filename: 다운로드 시 표시할 파일명
+            media_type: 다운로드 Content-Type
+            ttl_seconds: 파일별 보관 기간 (기본값: 관리자 설정)
+
+        Returns:
+            파일 키 (예: "3f2a...e1.docx")
+        """
+        extension = Path(filename).suffix.lower()
+        content_hash = hashlib.sha256(data).hexdigest()
+        key = content_hash[:32] + extension
+        now = time.time()
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is not None and self.store.size(key) is not None:
+                entry.update({"filename": filename, "expires_at": max(entry["expires_at"], now + ttl), "last_access": now})
+                self._index.move_to_end(key)
+                self.stats["deduplicated"] += 1
+                self._write_meta(key, entry)
+            else:
+                if entry is not None:
+                    self._remove(key)
+                self._evict_for(len(data))
+                self.store.put(key, data)
+                self._index[key] = {
+                    "filename": filename,
+                    "media_type": media_type,
+                    "size": len(data),
+                    "sha256": content_hash,
+                    "content_addressed": True,
+                    "created_at": now,
+                    "expires_at": now + ttl,
+                    "last_access": now,
+                }
+                self._total_bytes += len(data)
+                self.stats["saved"] += 1
+                self._write_meta(key, self._index[key])
+        return key
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """키의 항목(표시 파일명, 크기 등)을 반환하고 최근 사용으로 표시합니다 (만료되었으면 None)."""
+        with self._lock:
+            entry = self._index.get(key)
+            if self._meta_dir and self.store.size(key) is None:
+                # 다른 워커가 이미 삭제한 파일
+                self._forget(key)
+                return None
+            if entry is None and self._meta_dir:
+                # 다른 워커가 저장한 파일이면 그 항목의 메타데이터만 읽어 등록
+                entry = self._read_meta(key)
+                if entry is not None:
+                    self._index[key] = entry
+                    self._total_bytes += entry["size"]
+            if entry is None:
+                return None
+            if entry["expires_at"] <= time.time():
+                self._remove(key)
+                self.stats["expired"] += 1
+                return None
+            entry["last_access"] = time.time()
+            self._index.move_to_end(key)
+            return dict(entry, key=key)
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        return self.store.open(key)
+
+    def content_hash(self, key: str) -> Optional[str]:
+        """파일 내용의 SHA-256을 반환합니다 (이전 방식 파일은 처음 요청 시 계산하여 인덱스에 기록)."""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            if entry.get("sha256"):
+                return entry["sha256"]
+        stream = self.store.open(key)
+        if stream is None:
+            return None
+        digest = hashlib.sha256()
+        with stream:
+            for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+                digest.update(chunk)
+        with self._lock:
+            if key in self._index and self.store.size(key) is not None:
+                self._index[key]["sha256"] = digest.hexdigest()
+                self._write_meta(key, self._index[key])
+        return digest.hexdigest()
+
+    def local_path(self, key: str) -> Optional[Path]:
+        return self.store.local_path(key)
+
+    def _evict_for(self, incoming_bytes: int) -> None:
+        """용량 한도를 넘지 않도록 가장 오래 사용하지 않은 파일부터 제거합니다."""
+        while self._index and self._total_bytes + incoming_bytes > self.quota_bytes:
+            key = next(iter(self._index))
+            print(f"용량 한도 초과로 파일 제거: {key}")
+            self._remove(key)
+            self.stats["evicted"] += 1
+
+    def sweep(self) -> int:
+        """
+        만료된 파일을 모두 제거하고 제거한 개수를 반환합니다.
+
+        디스크 저장소는 다른 워커가 저장한 항목의 메타데이터도 훑어 만료된 파일을 지우고,
+        파일이 없어진 메타데이터와 인덱스 항목(다른 워커가 삭제)을 정리합니다.
+        """
+        now = time.time()
+        with self._lock:
+            if self._meta_dir:
+                for path in self._meta_dir.glob("*.json"):
+                    key = path.name[:-len(".json")]
+                    if key in self._index:
+                        continue
+                    entry = self._read_meta(key)
+                    if self.store.size(key) is None:
+                        self._delete_meta(key)
+                    elif entry is not None and entry["expires_at"] <= now:
+                        self._index[key] = entry
+                        self._total_bytes += entry["size"]
+                for key in [key for key in self._index if self.store.size(key) is None]:
+                    self._forget(key)
+                    self._delete_meta(key)
+            expired = [key for key, entry in self._index.items() if entry["expires_at"] <= now]
+            if self._meta_dir:
+                # 다른 워커가 같은 파일을 다시 저장해 만료 시각을 연장했을 수 있음
+                for key in list(expired):
+                    entry = self._read_meta(key)
+                    if entry is not None and entry["expires_at"] > now:
+                        self._index[key].update(entry)
+                        expired.remove(key)
+            for key in expired:
+                self._remove(key)
+            self.stats["expired"] += len(expired)
+        return len(expired)
+
+    def start_sweeper(self, interval_seconds: int = DEFAULT_GC_INTERVAL) -> None:
+        """주기적으로 sweep()을 실행하는 백그라운드 스레드를 시작합니다."""
+        if self._sweeper and self._sweeper.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(interval_seconds):
+                try:
+                    removed = self.sweep()
+                    if removed:
+                        print(f"만료된 생성 파일 {removed}개 삭제")
+                except Exception as e:
+                    print(f"파일 GC 오류: {str(e)}")
+
+        self._sweeper = threading.Thread(target=run, name="file-gc", daemon=True)
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        self._stop.set()
+
+    def usage(self) -> Dict[str, Any]:
+        """현재 파일 수/용량과 통계를 반환합니다."""
+        with self._lock:
+            return {
+                "files": len(self._index),
+                "bytes": self._total_bytes,
+                "quota_bytes": self.quota_bytes,
+                **self.stats
+            }
+
+
+_managers: Dict[str, FileStorageManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_file_storage(base_dir: Path = None) -> FileStorageManager:
+    """저장소 디렉토리별 파일 관리자를 반환합니다 (프로세스에서 하나씩 재사용)."""
+    store = get_blob_store(base_dir)
+    key = str(id(store))
+    with _managers_lock:
+        manager = _managers.get(key)
+        if manager is None:
+            manager = FileStorageManager(store)
+            _managers[key] = manager
+        return manager
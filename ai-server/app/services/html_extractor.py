@@ -0,0 +1,326 @@
+"""
+HTML 본문 추출 서비스
+lxml 파서로 HTML을 읽고 네비게이션/푸터/쿠키 배너 등 보일러플레이트를 제거한 뒤,
+텍스트 밀도로 본문 블록을 골라 제목과 목록 구조를 유지한 간결한 텍스트로 변환합니다.
+"""
+
+import re
+from typing import Dict, List, Optional, Union
+
+import lxml.html
+from lxml import etree
+
+# 통째로 제거하는 태그
+REMOVE_TAGS = {
+    "script", "style", "noscript", "template", "iframe", "svg", "canvas",
+    "nav", "footer", "aside", "form", "button", "select", "input", "textarea"
+}
+
+# class/id 토큰이 이 중 하나면 보일러플레이트로 간주
+BOILERPLATE_TOKENS = {
+    "nav", "navbar", "navigation", "menu", "gnb", "lnb", "footer", "sidebar", "breadcrumb", "breadcrumbs",
+    "cookie", "cookies", "consent", "gdpr", "banner", "popup", "modal", "overlay", "subscribe",
+    "newsletter", "share", "sharing", "social", "sns", "advert", "ad", "ads", "promo", "sponsor",
+    "related", "recommend", "comment", "comments", "skip", "toolbar", "pagination"
+}
+
+# class/id 토큰이 이 중 하나면 본문일 가능성이 높음
+CONTENT_TOKENS = {
+    "article", "content", "main", "post", "entry", "body", "readme", "markdown", "project",
+    "portfolio", "story", "text", "blog", "view"
+}
+
+# 본문 후보 컨테이너 태그별 기본 점수
+CONTAINER_BONUS = {"article": 10, "main": 10, "section": 3, "div": 5, "td": 3, "pre": 3, "blockquote": 3, "body": -5}
+
+HEADING_LEVELS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+PARAGRAPH_TAGS = {"p", "pre", "blockquote", "figcaption", "dt", "dd", "address", "summary"}
+LIST_TAGS = {"ul", "ol"}
+INLINE_TAGS = {
+    "a", "span", "strong", "b", "em", "i", "u", "s", "code", "small", "sup", "sub", "mark",
+    "abbr", "time", "label", "kbd", "var", "cite", "q", "font", "img", "wbr"
+}
+
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_\-]+)', re.IGNORECASE)
+TOKEN_SPLIT_PATTERN = re.compile(r"[\s_\-]+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# 본문 후보로 인정할 최소 텍스트 길이
+MIN_PARAGRAPH_CHARS = 25
+MIN_CONTENT_CHARS = 200
+
+
+def _tag(element) -> Optional[str]:
+    """요소의 태그명을 반환합니다 (주석/처리 지시문은 None)."""
+    return element.tag.lower() if isinstance(element.tag, str) else None
+
+
+def _clean(text: Optional[str]) -> str:
+    """연속 공백을 하나로 줄입니다."""
+    if not text:
+        return ""
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def _class_tokens(element) -> set:
+    """class/id 속성을 토큰 집합으로 만듭니다."""
+    value = f"{element.get('class', '')} {element.get('id', '')}".lower()
+    return {token for token in TOKEN_SPLIT_PATTERN.split(value) if token}
+
+
+def _class_weight(element) -> int:
+    """class/id 이름으로 본문 가능성 가중치를 계산합니다."""
+    tokens = _class_tokens(element)
+    weight = 0
+    if tokens & CONTENT_TOKENS:
+        weight += 25
+    if tokens & BOILERPLATE_TOKENS:
+        weight -= 25
+    return weight
+
+
+def _link_density(element) -> float:
+    """요소 텍스트 중 링크 텍스트가 차지하는 비율을 계산합니다."""
+    text_length = len(_clean(element.text_content()))
+    if not text_length:
+        return 0.0
+    link_length = sum(len(_clean(link.text_content())) for link in element.iter("a"))
+    return min(link_length / text_length, 1.0)
+
+
+def _remove_boilerplate(body) -> None:
+    """보일러플레이트 요소를 트리에서 제거합니다."""
+    to_remove = []
+    for element in body.iter():
+        tag = _tag(element)
+        if tag is None:
+            to_remove.append(element)
+            continue
+        if tag in ("body", "main", "article"):
+            continue
+        if tag in REMOVE_TAGS:
+            to_remove.append(element)
+        elif tag == "header" and not any(_tag(a) in ("article", "main") for a in element.iterancestors()):
+            # 페이지 상단 헤더만 제거 (글 안의 헤더는 제목을 담고 있음)
+            to_remove.append(element)
+        elif element.get("hidden") is not None or element.get("aria-hidden") == "true":
+            to_remove.append(element)
+        elif _class_tokens(element) & BOILERPLATE_TOKENS and not _class_tokens(element) & CONTENT_TOKENS:
+            to_remove.append(element)
+
+    for element in to_remove:
+        parent = element.getparent()
+        if parent is None:
+            continue
+        # 제거되는 요소 뒤의 텍스트(tail)는 보존
+        if element.tail:
+            previous = element.getprevious()
+            if previous is not None:
+                previous.tail = (previous.tail or "") + element.tail
+            else:
+                parent.text = (parent.text or "") + element.tail
+        parent.remove(element)
+
+
+def _select_content_nodes(body) -> List:
+    """텍스트 밀도 점수로 본문 블록(및 관련 형제 블록)을 선택합니다."""
+    scores: Dict = {}
+
+    for paragraph in body.iter("p", "pre", "td", "blockquote", "li", "dd"):
+        text = _clean(paragraph.text_content())
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            continue
+
+        # 긴 문장, 구두점이 많을수록 본문일 가능성이 높음
+        score = 1 + len(re.findall(r"[,.，。]", text)) + min(len(text) // 100, 3)
+
+        parent = paragraph.getparent()
+        grandparent = parent.getparent() if parent is not None else None
+        for node, factor in ((parent, 1.0), (grandparent, 0.5)):
+            if node is None or _tag(node) is None:
+                continue
+            if node not in scores:
+                scores[node] = CONTAINER_BONUS.get(_tag(node), 0) + _class_weight(node)
+            scores[node] += score * factor
+
+    if not scores:
+        return [body]
+
+    for node in scores:
+        scores[node] *= 1 - _link_density(node)
+
+    best = max(scores, key=scores.get)
+    if len(_clean(best.text_content())) < MIN_CONTENT_CHARS:
+        return [body]
+
+    parent = best.getparent()
+    if parent is None:
+        return [best]
+
+    # 같은 부모 아래 점수가 충분한 형제 블록(제목, 이어지는 문단 등)도 포함
+    threshold = max(10.0, scores[best] * 0.2)
+    selected = []
+    for sibling in parent:
+        if sibling is best:
+            selected.append(sibling)
+            continue
+        tag = _tag(sibling)
+        if tag is None:
+            continue
+        if scores.get(sibling, 0) >= threshold:
+            selected.append(sibling)
+        elif tag in HEADING_LEVELS:
+            selected.append(sibling)
+        elif tag in PARAGRAPH_TAGS:
+            text = _clean(sibling.text_content())
+            if len(text) > 80 and _link_density(sibling) < 0.25:
+                selected.append(sibling)
+    return selected
+
+
+class _TextSink:
+    """블록 단위로 줄을 모으는 출력 버퍼"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self._inline: List[str] = []
+
+    def inline(self, text: Optional[str]) -> None:
+        if text:
+            self._inline.append(text)
+
+    def flush(self) -> None:
+        if self._inline:
+            self.block("".join(self._inline))
+            self._inline = []
+
+    def block(self, text: Optional[str], prefix: str = "") -> None:
+        text = _clean(text)
+        if not text:
+            return
+        line = f"{prefix}{text}"
+        if not self.lines or self.lines[-1] != line:
+            self.lines.append(line)
+
+
+def _render(element, sink: _TextSink, list_depth: int = 0) -> None:
+    """선택된 블록을 제목/목록 구조를 유지한 텍스트로 변환합니다."""
+    tag = _tag(element)
+    if tag is None:
+        return
+
+    if tag in HEADING_LEVELS:
+        sink.flush()
+        sink.block(element.text_content(), prefix=f"{'#' * HEADING_LEVELS[tag]} ")
+
+    elif tag in LIST_TAGS:
+        sink.flush()
+        items = [child for child in element if _tag(child) == "li"]
+        # 링크만 나열된 목록(메뉴 잔재)은 생략
+        if len(items) >= 3 and _link_density(element) > 0.8:
+            return
+        for index, item in enumerate(items, start=1):
+            _render_list_item(item, sink, list_depth + 1, f"{index}." if tag == "ol" else "-")
+
+    elif tag == "li":
+        sink.flush()
+        _render_list_item(element, sink, list_depth + 1, "-")
+
+    elif tag == "tr":
+        sink.flush()
+        cells = [_clean(cell.text_content()) for cell in element if _tag(cell) in ("td", "th")]
+        sink.block(" | ".join(cell for cell in cells if cell))
+
+    elif tag in PARAGRAPH_TAGS:
+        sink.flush()
+        sink.block(element.text_content())
+
+    elif tag == "br":
+        sink.flush()
+
+    elif tag in INLINE_TAGS:
+        sink.inline(element.text)
+        for child in element:
+            _render(child, sink, list_depth)
+            sink.inline(child.tail)
+
+    else:
+        # 컨테이너 요소: 앞뒤로 블록 경계
+        sink.flush()
+        sink.inline(element.text)
+        for child in element:
+            _render(child, sink, list_depth)
+            sink.inline(child.tail)
+        sink.flush()
+
+
+def _render_list_item(item, sink: _TextSink, depth: int, marker: str) -> None:
+    """목록 항목을 들여쓰기와 함께 출력합니다 (중첩 목록은 재귀)."""
+    parts = [item.text or ""]
+    nested = []
+    for child in item:
+        if _tag(child) in LIST_TAGS:
+            nested.append(child)
+        else:
+            parts.append(child.text_content() if _tag(child) else "")
+        parts.append(child.tail or "")
+
+    sink.block("".join(parts), prefix=f"{'  ' * (depth - 1)}{marker} ")
+    for child in nested:
+        _render(child, sink, depth)
+
+
+def extract_main_content(
+    html: Union[str, bytes],
+    encoding: Optional[str] = None,
+    max_chars: Optional[int] = None
+) -> str:
+    """
+    HTML에서 본문만 추출하여 간결한 텍스트로 반환합니다.
+
+    Args:
+        html: HTML 문자열 또는 바이트
+        encoding: html이 바이트일 때의 인코딩 (기본값: <meta charset> 또는 utf-8)
+        max_chars: 결과 텍스트 최대 길이
+
+    Returns:
+        제목은 '#', 목록은 '-'로 표시한 본문 텍스트 (추출 실패 시 빈 문자열)
+    """
+    try:
+        if isinstance(html, str):
+            html = html.encode("utf-8")
+            encoding = "utf-8"
+        elif encoding is None:
+            match = META_CHARSET_PATTERN.search(html[:4096])
+            encoding = match.group(1).decode("ascii", errors="ignore") if match else "utf-8"
+        parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True)
+        document = lxml.html.document_fromstring(html, parser=parser)
+    except (etree.ParserError, ValueError, LookupError) as e:
+        print(f"HTML 파싱 오류: {str(e)}")
+        return ""
+
+    title = _clean(document.findtext(".//title"))
+    body = document.find("body")
+    if body is None:
+        body = document
+
+    _remove_boilerplate(body)
+
+    sink = _TextSink()
+    try:
+        for node in _select_content_nodes(body):
+            _render(node, sink)
+        sink.flush()
+    except RecursionError:
+        # 비정상적으로 깊은 문서는 구조 없이 텍스트만 사용
+        sink = _TextSink()
+        sink.block(body.text_content())
+
+    lines = sink.lines
+    if title and not any(title in line for line in lines[:3]):
+        lines.insert(0, f"# {title}")
+
+    text = "\n".join(lines)
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars]
+    return text
@@ -0,0 +1,125 @@
+"""
+다운로드 응답 서비스
+생성 파일 다운로드에 내용 해시 기반 강한 ETag, If-None-Match(304),
+바이트 범위 요청(206/416), 내용 주소 파일의 immutable 캐시 헤더를 적용합니다.
+"""
+
+from typing import Dict, Any, Optional, Tuple, Callable, BinaryIO
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from app.services.blob_store import iter_blob
+
+# 내용 주소(해시) 이름 파일은 내용이 바뀌지 않으므로 1년간 캐시
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 이전 방식(이름 재사용 가능) 파일은 매번 ETag로 재검증
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(content_hash: str) -> str:
+    """내용 해시로 강한 ETag를 만듭니다."""
+    return f'"{content_hash}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 확인합니다 (약한 비교)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def parse_byte_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Range 헤더를 (시작, 끝) 바이트 위치로 변환합니다 (끝 포함).
+
+    단일 범위만 지원하며, 형식이 잘못되었거나 여러 범위면 None을 반환하여 전체 응답을 보냅니다.
+
+    Raises:
+        ValueError: 파일 크기를 벗어나 만족할 수 없는 범위 (416)
+    """
+    if not range_header or not range_header.startswith("bytes=") or "," in range_header:
+        return None
+    start_text, _, end_text = range_header[len("bytes="):].strip().partition("-")
+    try:
+        start = int(start_text) if start_text else None
+        end = int(end_text) if end_text else None
+    except ValueError:
+        return None
+
+    if start is None:
+        if end is None:
+            return None
+        # 마지막 N바이트 (bytes=-500)
+        if end == 0:
+            raise ValueError("빈 범위는 만족할 수 없습니다.")
+        start, end = max(size - end, 0), size - 1
+    elif end is None:
+        end = size - 1
+
+    if start >= size:
+        raise ValueError("범위가 파일 크기를 벗어났습니다.")
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def build_download_response(
+    request: Request,
+    entry: Dict[str, Any],
+    content_hash: str,
+    open_stream: Callable[[], Optional[BinaryIO]]
+) -> Response:
+    """
+    캐시/범위 요청을 처리한 다운로드 응답을 만듭니다.
+
+    Args:
+        request: 다운로드 요청 (If-None-Match, Range, If-Range 헤더)
+        entry: 파일 항목 (filename, media_type, size, content_addressed)
+        content_hash: 파일 내용의 SHA-256
+        open_stream: 파일 스트림을 여는 함수 (없으면 None 반환)
+    """
+    size = entry["size"]
+    etag = make_etag(content_hash)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if entry.get("content_addressed") else REVALIDATE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f"attachment; filename*=utf-8''{quote(entry['filename'])}",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    # If-Range가 현재 ETag와 다르면 범위를 무시하고 전체 파일 전송
+    if not if_range or if_range.strip() == etag:
+        try:
+            byte_range = parse_byte_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    stream = open_stream()
+    if stream is None:
+        return Response(status_code=404)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(iter_blob(stream), media_type=entry["media_type"], headers=headers)
+
+    start, end = byte_range
+    length = end - start + 1
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(length)
+    return StreamingResponse(
+        iter_blob(stream, start=start, length=length),
+        status_code=206,
+        media_type=entry["media_type"],
+        headers=headers
+    )
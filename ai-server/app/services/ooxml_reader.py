@@ -0,0 +1,219 @@
+"""
+OOXML 문서 읽기 서비스
+Word(.docx), PowerPoint(.pptx) 패키지(zip 컨테이너)를 한 번만 열어
+본문/슬라이드 텍스트, 발표자 노트, 포함된 이미지를 함께 추출합니다.
+"""
+
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Any, List, Optional
+
+from app.services.content_sniffing import sniff_mime_type
+
+# XML 네임스페이스
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+V_NS = "urn:schemas-microsoft-com:vml"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+IMAGE_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+NOTES_REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/notesSlide"
+
+# GPT-4o Vision이 지원하는 이미지 형식
+VISION_MIME_TYPES = {"image/png", "image/jpeg", "image/gif", "image/webp"}
+
+# 아이콘/글머리표 등 작은 이미지는 제외
+MIN_IMAGE_BYTES = 8 * 1024
+
+# 문서당 분석할 최대 이미지 수 (큰 이미지 우선)
+MAX_IMAGES = 6
+
+
+def _qn(namespace: str, tag: str) -> str:
+    return f"{{{namespace}}}{tag}"
+
+
+def read_relationships(archive: zipfile.ZipFile, part_name: str) -> Dict[str, Dict[str, str]]:
+    """파트의 관계(.rels)를 읽어 {rId: {"type", "target"}}로 반환합니다 (target은 패키지 내 경로)."""
+    directory, filename = posixpath.split(part_name)
+    rels_name = posixpath.join(directory, "_rels", f"{filename}.rels")
+    try:
+        root = ET.fromstring(archive.read(rels_name))
+    except KeyError:
+        return {}
+
+    relationships = {}
+    for rel in root.iter(_qn(REL_NS, "Relationship")):
+        target = rel.get("Target", "")
+        if rel.get("TargetMode") != "External":
+            target = posixpath.normpath(posixpath.join(directory, target)).lstrip("/")
+        relationships[rel.get("Id")] = {"type": rel.get("Type", ""), "target": target}
+    return relationships
+
+
+def read_images(archive: zipfile.ZipFile, targets: List[str], limit: int = MAX_IMAGES) -> List[Dict[str, Any]]:
+    """
+    패키지 안의 이미지 파트를 읽습니다.
+
+    Vision이 지원하지 않는 형식(EMF/WMF 등)과 작은 이미지는 제외하고,
+    개수가 많으면 큰 이미지 위주로 limit개만 남기되 문서 순서는 유지합니다.
+    """
+    images = []
+    for order, target in enumerate(targets):
+        try:
+            data = archive.read(target)
+        except KeyError:
+            continue
+        if len(data) < MIN_IMAGE_BYTES:
+            continue
+        mime_type = sniff_mime_type(data[:64])
+        if mime_type not in VISION_MIME_TYPES:
+            continue
+        images.append({"name": target, "data": data, "mime_type": mime_type, "order": order})
+
+    if len(images) > limit:
+        images = sorted(images, key=lambda image: len(image["data"]), reverse=True)[:limit]
+        images.sort(key=lambda image: image["order"])
+    return images
+
+
+def _paragraph_text(paragraph: ET.Element) -> str:
+    """w:p 요소의 텍스트를 탭/줄바꿈을 유지하여 반환합니다."""
+    parts = []
+    for node in paragraph.iter():
+        if node.tag == _qn(W_NS, "t"):
+            parts.append(node.text or "")
+        elif node.tag == _qn(W_NS, "tab"):
+            parts.append("\t")
+        elif node.tag in (_qn(W_NS, "br"), _qn(W_NS, "cr")):
+            parts.append("\n")
+    return "".join(parts)
+
+
+def read_docx(file_path: str, max_images: int = MAX_IMAGES) -> Dict[str, Any]:
+    """
+    Word 문서의 본문 텍스트와 포함된 이미지를 한 번에 추출합니다.
+
+    Args:
+        file_path: .docx 파일 경로
+        max_images: 추출할 최대 이미지 수
+
+    Returns:
+        {
+            "text": 본문 텍스트 (문단 단위 줄바꿈),
+            "images": [{"name", "data", "mime_type", "order"}, ...] (문서 등장 순서)
+        }
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        document_part = "word/document.xml"
+        relationships = read_relationships(archive, document_part)
+
+        paragraphs: List[str] = []
+        image_targets: List[str] = []
+        seen_targets = set()
+
+        def add_image(rel_id: Optional[str]) -> None:
+            rel = relationships.get(rel_id)
+            if rel and rel["type"] == IMAGE_REL_TYPE and rel["target"] not in seen_targets:
+                seen_targets.add(rel["target"])
+                image_targets.append(rel["target"])
+
+        with archive.open(document_part) as document:
+            for event, element in ET.iterparse(document, events=("end",)):
+                if element.tag == _qn(A_NS, "blip"):
+                    add_image(element.get(_qn(R_NS, "embed")))
+                elif element.tag == _qn(V_NS, "imagedata"):
+                    add_image(element.get(_qn(R_NS, "id")))
+                elif element.tag == _qn(W_NS, "p"):
+                    paragraphs.append(_paragraph_text(element))
+                    # 텍스트 상자 등 중첩 문단이 바깥 문단에서 중복되지 않도록 비움
+                    element.clear()
+
+        images = read_images(archive, image_targets, max_images)
+
+    text = "\n".join(paragraphs).strip()
+    return {"text": text, "images": images}
+
+
+def _drawing_text(root: ET.Element) -> str:
+    """DrawingML(a:p) 문단 텍스트를 추출합니다 (슬라이드 번호 등 필드는 제외)."""
+    lines = []
+    for paragraph in root.iter(_qn(A_NS, "p")):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == _qn(A_NS, "fld"):
+                # 필드(슬라이드 번호, 날짜)의 a:t는 건너뛰도록 표시
+                for child in node.iter(_qn(A_NS, "t")):
+                    child.set("skip", "1")
+            elif node.tag == _qn(A_NS, "t") and not node.get("skip"):
+                parts.append(node.text or "")
+            elif node.tag == _qn(A_NS, "br"):
+                parts.append("\n")
+        line = "".join(parts).strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def read_pptx(file_path: str, images_per_slide: int = 1) -> Dict[str, Any]:
+    """
+    PowerPoint 문서의 슬라이드별 텍스트, 발표자 노트, 이미지를 한 번에 추출합니다.
+
+    Args:
+        file_path: .pptx 파일 경로
+        images_per_slide: 슬라이드당 추출할 최대 이미지 수 (큰 이미지 우선)
+
+    Returns:
+        {
+            "slides": [
+                {"index": 1, "text": "...", "notes": "...", "images": [{"name", "data", "mime_type", "order"}]},
+                ...
+            ]
+        }
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        presentation_part = "ppt/presentation.xml"
+        presentation_rels = read_relationships(archive, presentation_part)
+        presentation = ET.fromstring(archive.read(presentation_part))
+
+        # 발표 순서대로 슬라이드 파트 경로 수집
+        slide_parts = []
+        for slide_id in presentation.iter(_qn(P_NS, "sldId")):
+            rel = presentation_rels.get(slide_id.get(_qn(R_NS, "id")))
+            if rel:
+                slide_parts.append(rel["target"])
+
+        slides = []
+        for index, slide_part in enumerate(slide_parts, start=1):
+            try:
+                slide_root = ET.fromstring(archive.read(slide_part))
+            except KeyError:
+                continue
+            slide_rels = read_relationships(archive, slide_part)
+
+            image_targets = []
+            for blip in slide_root.iter(_qn(A_NS, "blip")):
+                rel = slide_rels.get(blip.get(_qn(R_NS, "embed")))
+                if rel and rel["type"] == IMAGE_REL_TYPE and rel["target"] not in image_targets:
+                    image_targets.append(rel["target"])
+
+            notes = ""
+            for rel in slide_rels.values():
+                if rel["type"] == NOTES_REL_TYPE:
+                    try:
+                        notes = _drawing_text(ET.fromstring(archive.read(rel["target"])))
+                    except KeyError:
+                        pass
+                    break
+
+            slides.append({
+                "index": index,
+                "text": _drawing_text(slide_root),
+                "notes": notes,
+                "images": read_images(archive, image_targets, images_per_slide)
+            })
+
+    return {"slides": slides}
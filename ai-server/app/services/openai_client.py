@@ -0,0 +1,47 @@
+"""
+공유 OpenAI 클라이언트
+openai 패키지 import(수백 ms)와 클라이언트 생성을 첫 LLM 호출 시점으로 미루고,
+모든 서비스가 하나의 클라이언트(연결 풀)를 함께 사용합니다.
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from app.config import OPENAI_API_KEY
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+_client: Optional["OpenAI"] = None
+_lock = threading.Lock()
+
+
+def get_client() -> "OpenAI":
+    """
+    공유 OpenAI 클라이언트를 반환합니다 (처음 호출할 때 생성).
+
+    Raises:
+        ValueError: OPENAI_API_KEY가 설정되지 않음
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                if not OPENAI_API_KEY:
+                    raise ValueError("OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다.")
+                from openai import OpenAI
+                _client = OpenAI(api_key=OPENAI_API_KEY)
+    return _client
+
+
+def reset_client() -> None:
+    """클라이언트를 버립니다 (다음 호출에서 새로 생성, 예: 프로세스 fork 이후)."""
+    global _client, _lock
+    _client = None
+    _lock = threading.Lock()
+
+
+# fork된 워커가 부모의 연결 풀(소켓)을 함께 쓰지 않도록 자식에서 새로 만듦 (fork가 없는 Windows에서는 생략)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_client)
@@ -0,0 +1,188 @@
+"""
+한글 PDF 렌더러 (fpdf2)
+CJK TrueType 글꼴을 프로세스당 한 번만 읽어(add_font) 문자 폭/cmap을 캐시하고,
+문서마다 그 글꼴을 복사해 사용한 글리프만 서브셋으로 임베드합니다 (서브셋과 ToUnicode는 fpdf2가 처리).
+
+배포 환경에서는 빌드 단계에서 fonts-nanum 패키지를 설치합니다 (nixpacks.toml).
+"""
+
+import os
+import re
+import copy
+import threading
+from io import BytesIO
+from typing import List, Optional
+
+# 글꼴 탐색 경로 (PDF_FONT_PATH 우선, TrueType 글꼴)
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/noto/NotoSansKR-Regular.ttf",
+    "/usr/share/fonts/truetype/unfonts-core/UnDotum.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+    "/Library/Fonts/AppleGothic.ttf",
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",
+]
+
+FONT_FAMILY = "cjk"
+
+# 페이지 레이아웃 (A4, pt 단위)
+MARGIN = 56.7  # 2cm
+BODY_FONT_SIZE = 11
+TITLE_FONT_SIZE = 18
+LINE_HEIGHT = 1.6
+
+TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+
+
+def find_font_path() -> Optional[str]:
+    """PDF에 임베드할 한글 글꼴 경로를 찾습니다."""
+    candidates = [os.getenv("PDF_FONT_PATH")] + FONT_CANDIDATES
+    for path in candidates:
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+
+class PdfFont:
+    """한 번 읽어 둔 글꼴 (fpdf2 글꼴 객체와 원본 파일 바이트)"""
+
+    def __init__(self, path: str):
+        from fpdf import FPDF
+
+        with open(path, "rb") as f:
+            self.data = f.read()
+        self.path = path
+
+        # cmap과 문자 폭 계산은 여기서 한 번만 (add_font가 글꼴 전체를 훑음)
+        pdf = FPDF(unit="pt")
+        pdf.add_font(FONT_FAMILY, fname=path)
+        self.font = pdf.fonts[FONT_FAMILY]
+        self.num_glyphs = len(self.font.glyph_ids)
+
+    def for_document(self):
+        """
+        문서 하나에서 쓸 글꼴 객체를 만듭니다.
+
+        서브셋 생성이 fontTools 글꼴 객체를 직접 줄이므로, 문서마다 메모리의 원본 바이트에서 새로 엽니다 (lazy).
+        cmap/문자 폭은 캐시를 복사하고, 사용 글리프 목록(subset)은 문서별로 새로 시작합니다.
+        """
+        from fontTools.ttLib import TTFont
+        from fpdf.fonts import SubsetMap
+
+        font = copy.deepcopy(self.font)
+        font.ttfont = TTFont(BytesIO(self.data), recalcTimestamp=False, fontNumber=0, lazy=True)
+        font.missing_glyphs = []
+        font.subset = SubsetMap(font)
+        return font
+
+    def text_width(self, text: str) -> int:
+        """글자 폭 합계 (1000 단위, 글꼴에 없는 글자는 기본 폭)"""
+        widths = self.font.cw
+        missing = self.font.desc.missing_width
+        return sum(widths.get(ord(char), missing) for char in text)
+
+
+_font: Optional[PdfFont] = None
+_font_lock = threading.Lock()
+
+
+def get_pdf_font() -> Optional[PdfFont]:
+    """프로세스에서 한 번만 읽은 PDF 글꼴을 반환합니다 (사용 가능한 글꼴이 없으면 None)."""
+    global _font
+    if _font is None:
+        with _font_lock:
+            if _font is None:
+                path = find_font_path()
+                if path is None:
+                    print("PDF용 한글 글꼴을 찾을 수 없습니다. PDF_FONT_PATH를 설정해주세요.")
+                    return None
+                _font = PdfFont(path)
+    return _font
+
+
+def pdf_available() -> bool:
+    """PDF 렌더링에 사용할 글꼴이 있는지 확인합니다 (글꼴을 읽지 않고 경로만 확인)."""
+    return _font is not None or find_font_path() is not None
+
+
+def _wrap_paragraph(font: PdfFont, text: str, font_size: float, max_width: float) -> List[str]:
+    """
+    문단을 줄 단위로 나눕니다 (단어 단위 탐욕적 줄바꿈, 한 줄보다 긴 단어는 글자 단위).
+
+    fpdf2의 multi_cell은 줄마다 조각 폭을 반복해서 다시 계산하므로, 캐시한 글자 폭으로 직접 나눈 뒤 cell로 씁니다.
+    """
+    limit = max_width * 1000 / font_size
+    lines = []
+    line, width = "", 0
+
+    for token in TOKEN_PATTERN.findall(text):
+        token_width = font.text_width(token)
+        if width + token_width <= limit:
+            line, width = line + token, width + token_width
+            continue
+
+        if line:
+            lines.append(line.rstrip())
+            line, width = "", 0
+            # 줄 첫머리 공백은 버림
+            if token.isspace():
+                continue
+            if token_width <= limit:
+                line, width = token, token_width
+                continue
+
+        for char in token:
+            char_width = font.text_width(char)
+            if width + char_width > limit and line:
+                lines.append(line.rstrip())
+                line, width = "", 0
+            line, width = line + char, width + char_width
+
+    lines.append(line.rstrip())
+    return lines
+
+
+def render_pdf(text: str, title: Optional[str] = None, font_size: float = BODY_FONT_SIZE) -> bytes:
+    """
+    텍스트를 한글 글꼴이 임베드된 PDF로 렌더링합니다.
+
+    Args:
+        text: 본문 텍스트 (줄바꿈은 문단 구분)
+        title: 첫 페이지 제목 (None이면 생략)
+        font_size: 본문 글자 크기 (pt)
+
+    Returns:
+        PDF 파일 바이트
+
+    Raises:
+        RuntimeError: 사용 가능한 한글 글꼴이 없는 경우
+    """
+    from fpdf import FPDF
+
+    font = get_pdf_font()
+    if font is None:
+        raise RuntimeError("PDF용 한글 글꼴이 없습니다. PDF_FONT_PATH 환경 변수로 TrueType 글꼴을 지정해주세요.")
+
+    pdf = FPDF(unit="pt", format="A4")
+    pdf.set_margins(MARGIN, MARGIN, MARGIN)
+    pdf.set_auto_page_break(True, margin=MARGIN)
+    pdf.fonts[FONT_FAMILY] = font.for_document()
+    pdf.add_page()
+
+    max_width = pdf.epw
+    text = CONTROL_CHARS.sub("", text.replace("\t", "    ").replace("\r", ""))
+
+    # (글자 크기, 줄) 단위로 배치 (페이지 넘김은 auto_page_break)
+    blocks = []
+    if title:
+        blocks.extend((TITLE_FONT_SIZE, line) for line in _wrap_paragraph(font, title, TITLE_FONT_SIZE, max_width))
+        blocks.append((font_size, ""))
+    for paragraph in text.split("\n"):
+        blocks.extend((font_size, line) for line in _wrap_paragraph(font, paragraph, font_size, max_width))
+
+    for size, line in blocks:
+        pdf.set_font(FONT_FAMILY, size=size)
+        pdf.cell(max_width, size * LINE_HEIGHT, line, new_x="LMARGIN", new_y="NEXT")
+    return bytes(pdf.output())
@@ -0,0 +1,315 @@
+"""
+사용자별 프로젝트 벡터 인덱스
+사용자의 프로젝트(분석/수정 완료 결과)를 임베딩하여 float16 벡터로 디스크에 저장하고 메모리 매핑(np.memmap)으로 읽습니다.
+프로젝트가 완료될 때마다 증분 upsert하며, 챗봇이 관련 프로젝트만 골라 쓸 수 있도록 top-k 유사도 검색을 제공합니다.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+
+from app.services.openai_client import get_client
+from app.services.worker_pool import WorkerPool
+
+# 파일 잠금은 여러 워커 프로세스(gunicorn)용. Windows 개발 환경(단일 프로세스)에는 없으므로 프로세스 내 잠금만 사용
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# numpy는 인덱스를 처음 열 때 import (서버 시작 시간 단축)
+if TYPE_CHECKING:
+    import numpy as np
+
+# 임베딩 모델과 차원 (text-embedding-3 계열은 dimensions로 축소 가능)
+EMBEDDING_MODEL = os.getenv("PROJECT_EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_DIM = int(os.getenv("PROJECT_INDEX_DIM", "256"))
+INDEX_DIR = Path(os.getenv("PROJECT_INDEX_DIR", str(Path("files") / "project_index")))
+
+VECTORS_FILENAME = "vectors.f16"
+META_FILENAME = "meta.json"
+LOCK_FILENAME = ".lock"
+INITIAL_CAPACITY = 16
+MAX_EMBED_CHARS = 4000
+
+# 인덱스에 보관하는 프로젝트 필드 (검색 결과를 그대로 자기소개서 입력으로 쓰므로 자르지 않고 원본 값 저장)
+PAYLOAD_FIELDS = (
+    "title", "category", "tags", "summary", "start_date", "end_date",
+    "roles", "achievements", "tools", "description",
+)
+
+# upsert는 요청 처리와 분리하여 백그라운드에서 실행
+index_executor = WorkerPool(max_workers=1, thread_name_prefix="project-index")
+
+
+def project_to_text(project: Dict[str, Any]) -> str:
+    """임베딩할 프로젝트 텍스트를 만듭니다."""
+    parts = []
+    for field in ("title", "category", "summary", "description"):
+        if project.get(field):
+            parts.append(str(project[field]))
+    for field in ("tags", "tools", "roles", "achievements"):
+        items = [str(item) for item in (project.get(field) or []) if item]
+        if items:
+            parts.append(", ".join(items))
+    return "\n".join(parts)[:MAX_EMBED_CHARS]
+
+
+def project_payload(project: Dict[str, Any]) -> Dict[str, Any]:
+    """인덱스에 저장할 프로젝트 데이터 (빈 값 제외, 요약/잘라내기 없음)"""
+    return {field: project[field] for field in PAYLOAD_FIELDS if project.get(field)}
+
+
+def project_key(project: Dict[str, Any]) -> Optional[str]:
+    """프로젝트 식별 키 (id가 있으면 id, 없으면 제목 기준 → 같은 프로젝트를 다시 분석하면 갱신)."""
+    if project.get("id"):
+        return str(project["id"])
+    title = " ".join(str(project.get("title") or "").split()).lower()
+    return "title:" + hashlib.sha256(title.encode("utf-8")).hexdigest()[:16] if title else None
+
+
+def embed_texts(texts: List[str]) -> "np.ndarray":
+    """텍스트 목록을 단위 길이 float32 벡터 배열로 임베딩합니다."""
+    import numpy as np
+    
+    response = get_client().embeddings.create(model=EMBEDDING_MODEL, input=texts, dimensions=EMBEDDING_DIM)
+    vectors = np.asarray([item.embedding for item in response.data], dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class ProjectIndex:
+    """한 사용자의 프로젝트 벡터 인덱스 (행 = 프로젝트, float16 memmap)"""
+
+    def __init__(self, directory: Path, dim: int = EMBEDDING_DIM):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self._lock = threading.RLock()
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._payloads: Dict[str, Dict[str, Any]] = {}
+        self._capacity = 0
+        self._vectors: Optional["np.memmap"] = None
+        self._meta_mtime: Optional[int] = None
+        self._load()
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.directory / VECTORS_FILENAME
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.directory / META_FILENAME
+
+    def _load(self) -> None:
+        import numpy as np
+        
+        try:
+            self._meta_mtime = os.stat(self._meta_path).st_mtime_ns
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = None
+
+        if not meta or meta.get("dim") != self.dim or not self._vectors_path.exists():
+            # 인덱스가 없거나 임베딩 차원이 바뀌면 새로 시작
+            return
+        self._keys = meta["keys"]
+        self._rows = {key: row for row, key in enumerate(self._keys)}
+        self._payloads = meta["payloads"]
+        self._capacity = meta["capacity"]
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float16, mode="r+", shape=(self._capacity, self.dim))
+
+    def _refresh(self) -> None:
+        """다른 워커 프로세스가 메타데이터를 바꿨으면 다시 읽습니다 (mtime 비교)."""
+        try:
+            mtime = os.stat(self._meta_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime == self._meta_mtime:
+            return
+        self._keys, self._rows, self._payloads, self._capacity, self._vectors = [], {}, {}, 0, None
+        self._load()
+
+    @contextmanager
+    def _writing(self):
+        """프로세스 내 잠금과 파일 잠금(flock)을 함께 잡고 최신 상태에서 쓰기를 시작합니다."""
+        with self._lock, open(self.directory / LOCK_FILENAME, "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._refresh()
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save_meta(self) -> None:
+        """메타데이터를 임시 파일에 쓴 뒤 원자적으로 교체합니다."""
+        meta = {"dim": self.dim, "model": EMBEDDING_MODEL, "capacity": self._capacity, "keys": self._keys, "payloads": self._payloads}
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(temp_path, self._meta_path)
+            self._meta_mtime = os.stat(self._meta_path).st_mtime_ns
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _grow(self, needed: int) -> None:
+        """벡터 파일 용량을 두 배씩 늘립니다 (새 파일에 복사 후 교체)."""
+        import numpy as np
+        
+        capacity = max(self._capacity, INITIAL_CAPACITY)
+        while capacity < needed:
+            capacity *= 2
+        if capacity == self._capacity:
+            return
+        temp_path = self._vectors_path.with_suffix(".grow")
+        grown = np.memmap(temp_path, dtype=np.float16, mode="w+", shape=(capacity, self.dim))
+        if self._vectors is not None:
+            grown[:len(self._keys)] = self._vectors[:len(self._keys)]
+            self._vectors.flush()
+            self._vectors = None
+        grown.flush()
+        del grown
+        os.replace(temp_path, self._vectors_path)
+        self._capacity = capacity
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float16, mode="r+", shape=(capacity, self.dim))
+
+    def upsert(self, key: str, vector: "np.ndarray", payload: Dict[str, Any]) -> None:
+        """프로젝트 벡터를 추가하거나 같은 키의 행을 덮어씁니다."""
+        import numpy as np
+        
+        with self._writing():
+            row = self._rows.get(key)
+            if row is None:
+                self._grow(len(self._keys) + 1)
+                row = len(self._keys)
+                self._keys.append(key)
+                self._rows[key] = row
+            self._vectors[row] = np.asarray(vector, dtype=np.float16)
+            self._vectors.flush()
+            self._payloads[key] = payload
+            self._save_meta()
+
+    def delete(self, key: str) -> bool:
+        """프로젝트를 제거합니다 (마지막 행을 빈자리로 옮김)."""
+        with self._writing():
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+            last = len(self._keys) - 1
+            if row != last:
+                moved = self._keys[last]
+                self._vectors[row] = self._vectors[last]
+                self._keys[row] = moved
+                self._rows[moved] = row
+            self._keys.pop()
+            self._payloads.pop(key, None)
+            self._vectors.flush()
+            self._save_meta()
+            return True
+
+    def search(self, query_vector: "np.ndarray", top_k: int = 5, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """코사인 유사도 상위 top_k 프로젝트를 반환합니다 ({"key", "score", "project"})."""
+        import numpy as np
+        
+        with self._lock:
+            self._refresh()
+            count = len(self._keys)
+            if count == 0:
+                return []
+            # 저장은 float16, 계산은 float32 (사용자당 프로젝트 수는 작으므로 전체 행렬 곱으로 충분)
+            scores = self._vectors[:count].astype(np.float32) @ np.asarray(query_vector, dtype=np.float32)
+            if exclude in self._rows:
+                scores[self._rows[exclude]] = -np.inf
+            k = min(top_k, count - (1 if exclude in self._rows else 0))
+            if k <= 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {"key": self._keys[row], "score": round(float(scores[row]), 4), "project": self._payloads[self._keys[row]]}
+                for row in top
+            ]
+
+    def __len__(self) -> int:
+        """프로젝트 수 (다른 워커가 추가한 프로젝트도 반영)"""
+        with self._lock:
+            self._refresh()
+            return len(self._keys)
+
+
+_indexes: Dict[str, ProjectIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_project_index(user_id: str) -> ProjectIndex:
+    """사용자별 인덱스를 반환합니다 (디렉토리명은 사용자 ID 해시, 프로세스에서 하나씩 재사용)."""
+    user_key = hashlib.sha256(str(user_id).encode("utf-8")).hexdigest()[:24]
+    with _indexes_lock:
+        index = _indexes.get(user_key)
+        if index is None:
+            index = ProjectIndex(INDEX_DIR / user_key)
+            _indexes[user_key] = index
+        return index
+
+
+def index_project(user_id: str, project: Dict[str, Any]) -> Optional[str]:
+    """프로젝트를 임베딩하여 사용자 인덱스에 upsert하고 키를 반환합니다 (제목이 없으면 건너뜀)."""
+    key = project_key(project)
+    text = project_to_text(project)
+    if not key or not text:
+        return None
+    vector = embed_texts([text])[0]
+    get_project_index(user_id).upsert(key, vector, project_payload(project))
+    return key
+
+
+def schedule_index_project(user_id: Optional[str], project: Optional[Dict[str, Any]]) -> None:
+    """분석/수정이 끝난 프로젝트의 인덱싱을 백그라운드로 예약합니다 (사용자 ID가 없으면 무시)."""
+    if not user_id or not project or not project.get("title"):
+        return
+
+    def run():
+        try:
+            index_project(user_id, project)
+        except Exception as e:
+            print(f"프로젝트 인덱싱 오류: {str(e)}")
+
+    index_executor.submit(run)
+
+
+def search_projects(
+    user_id: str,
+    query: str,
+    top_k: int = 5,
+    exclude: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    사용자 프로젝트 중 query와 가장 관련 있는 프로젝트를 찾습니다.
+
+    Args:
+        user_id: 인증된 사용자 ID
+        query: 검색 문장 (예: 지원 직무, 수정 중인 프로젝트 텍스트)
+        top_k: 반환할 최대 개수
+        exclude: 결과에서 제외할 프로젝트 (수정 중인 프로젝트 자신)
+
+    Returns:
+        [{"key", "score", "project": 저장된 프로젝트}] (인덱스가 비어 있으면 빈 목록)
+    """
+    index = get_project_index(user_id)
+    # 빈 인덱스면 임베딩 호출 없이 종료 (len은 디스크의 최신 메타데이터 기준)
+    if not query or not len(index):
+        return []
+    vector = embed_texts([query[:MAX_EMBED_CHARS]])[0]
+    return index.search(vector, top_k, exclude=project_key(exclude) if exclude else None)
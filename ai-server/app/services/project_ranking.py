@@ -0,0 +1,218 @@
+"""
+프로젝트 관련도 순위 서비스
+자기소개서 프롬프트에 모든 프로젝트를 넣는 대신, 목표 직무(position)와의 태그/도구 겹침과
+최근성(start_date/end_date)으로 점수를 매겨 상위 프로젝트만 요약된 형태로 토큰 예산 안에서 고릅니다.
+"""
+
+import os
+import re
+import math
+from datetime import date
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from app.services.token_estimate import estimate_tokens
+
+# 프롬프트에 넣을 최대 프로젝트 수와 프로젝트 요약의 토큰 예산
+PROMPT_TOP_K = int(os.getenv("PROMPT_PROJECT_TOP_K", "5"))
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_PROJECT_TOKENS", "1200"))
+
+# 최근성 점수가 절반이 되는 기간 (개월)과 관련도 대비 가중치
+RECENCY_HALF_LIFE_MONTHS = 24
+RECENCY_WEIGHT = 1.5
+
+# 관련도 가중치: 태그/도구/역할이 직무와 겹치면 크게, 제목/설명에 언급되면 작게
+TAG_MATCH_WEIGHT = 2.0
+TEXT_MATCH_WEIGHT = 0.5
+
+# 요약 시 필드별 최대 개수/길이
+MAX_LIST_ITEMS = {"roles": 3, "tools": 8, "tags": 6, "achievements": 3}
+MAX_ITEM_CHARS = 120
+MAX_SUMMARY_CHARS = 200
+MAX_SKILLS = 20
+MAX_ACHIEVEMENTS = 8
+
+# 직무 키워드 → 관련 기술/태그 (직무명만으로는 도구와 겹치지 않으므로 확장)
+ROLE_KEYWORDS = {
+    "백엔드": ["backend", "server", "api", "python", "java", "spring", "django", "fastapi", "flask", "node", "express",
+             "sql", "mysql", "postgresql", "redis", "docker", "kubernetes", "aws", "서버", "데이터베이스"],
+    "backend": ["server", "api", "python", "java", "spring", "django", "fastapi", "node", "sql", "docker", "aws"],
+    "프론트": ["frontend", "react", "vue", "next", "javascript", "typescript", "html", "css", "웹", "ui"],
+    "frontend": ["react", "vue", "next", "javascript", "typescript", "html", "css", "ui"],
+    "풀스택": ["react", "node", "javascript", "typescript", "python", "sql", "api", "웹"],
+    "앱": ["android", "ios", "kotlin", "swift", "flutter", "react native", "모바일"],
+    "모바일": ["android", "ios", "kotlin", "swift", "flutter", "앱"],
+    "데이터": ["data", "python", "sql", "pandas", "spark", "분석", "통계", "tableau", "머신러닝"],
+    "ai": ["machine learning", "deep learning", "pytorch", "tensorflow", "llm", "nlp", "python", "머신러닝", "딥러닝"],
+    "머신러닝": ["pytorch", "tensorflow", "scikit-learn", "python", "딥러닝", "ai", "모델"],
+    "디자인": ["figma", "photoshop", "illustrator", "ux", "ui", "브랜딩", "프로토타입"],
+    "디자이너": ["figma", "photoshop", "illustrator", "ux", "ui", "브랜딩"],
+    "마케팅": ["marketing", "sns", "광고", "캠페인", "콘텐츠", "ga", "seo", "브랜딩", "퍼포먼스"],
+    "기획": ["pm", "po", "서비스", "기획서", "요구사항", "figma", "jira", "사용자 조사", "로드맵"],
+}
+
+TERM_PATTERN = re.compile(r"[0-9a-zA-Z가-힣+#.]+")
+DATE_PATTERN = re.compile(r"(\d{4})(?:\D{1,3}(\d{1,2}))?")
+ONGOING_WORDS = ("진행", "현재", "present", "now", "ongoing")
+
+
+def _terms(value: Any) -> Set[str]:
+    """문자열/리스트 값을 소문자 검색어 집합으로 만듭니다."""
+    if not value:
+        return set()
+    if isinstance(value, (list, tuple, set)):
+        value = " ".join(str(item) for item in value if item)
+    return {term.lower() for term in TERM_PATTERN.findall(str(value))}
+
+
+def target_terms(cover_letter_data: Dict[str, Any]) -> Set[str]:
+    """목표 직무에서 검색어를 뽑고 직무별 관련 기술로 확장합니다."""
+    position = (cover_letter_data.get("position") or "").lower()
+    terms = _terms(position)
+    for keyword, related in ROLE_KEYWORDS.items():
+        if keyword in position:
+            terms.update(term.lower() for term in related)
+    return terms
+
+
+def _parse_month(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """"2024-03", "2024.3", "2024년 3월", "2024" 등을 (연, 월)로 변환합니다."""
+    if not value:
+        return None
+    match = DATE_PATTERN.search(str(value))
+    if not match:
+        return None
+    year = int(match.group(1))
+    month = int(match.group(2)) if match.group(2) else 12
+    return (year, month) if 1 <= month <= 12 else (year, 12)
+
+
+def recency_score(project: Dict[str, Any], today: Optional[date] = None) -> float:
+    """종료일(없으면 시작일) 기준 최근성 점수 (0~1, 진행 중이면 1)."""
+    today = today or date.today()
+    end = project.get("end_date")
+    if end and any(word in str(end).lower() for word in ONGOING_WORDS):
+        return 1.0
+    month = _parse_month(end) or _parse_month(project.get("start_date"))
+    if month is None:
+        # 날짜가 없으면 중간 정도로 취급
+        return 0.5
+    age_months = max((today.year - month[0]) * 12 + (today.month - month[1]), 0)
+    return 0.5 ** (age_months / RECENCY_HALF_LIFE_MONTHS)
+
+
+def score_project(project: Dict[str, Any], terms: Set[str], today: Optional[date] = None) -> float:
+    """직무 관련도(태그/도구/역할 겹침, 제목/설명 언급)와 최근성으로 프로젝트 점수를 계산합니다."""
+    relevance = 0.0
+    if terms:
+        tagged = _terms(project.get("tags")) | _terms(project.get("tools")) | _terms(project.get("roles")) | _terms(project.get("category"))
+        text = _terms(project.get("title")) | _terms(project.get("summary")) | _terms(project.get("description"))
+        # 많이 겹칠수록 점수가 커지되 태그가 많은 프로젝트가 지나치게 유리하지 않도록 제곱근 적용
+        relevance = TAG_MATCH_WEIGHT * math.sqrt(len(tagged & terms)) + TEXT_MATCH_WEIGHT * math.sqrt(len((text - tagged) & terms))
+    return relevance + RECENCY_WEIGHT * recency_score(project, today)
+
+
+def rank_projects(cover_letter_data: Dict[str, Any], today: Optional[date] = None) -> List[Dict[str, Any]]:
+    """프로젝트를 관련도 높은 순으로 정렬합니다 (같은 점수면 원래 순서 유지)."""
+    projects = cover_letter_data.get("projects") or []
+    terms = target_terms(cover_letter_data)
+    scored = [(score_project(project, terms, today), index, project) for index, project in enumerate(projects)]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [project for _, _, project in scored]
+
+
+def _truncate(text: Any, limit: int) -> str:
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def compress_project(project: Dict[str, Any]) -> Dict[str, Any]:
+    """프롬프트용으로 프로젝트를 요약합니다 (빈 값 제거, 목록 개수와 문장 길이 제한)."""
+    compressed: Dict[str, Any] = {}
+    if project.get("title"):
+        compressed["title"] = _truncate(project["title"], MAX_ITEM_CHARS)
+    if project.get("start_date") or project.get("end_date"):
+        compressed["period"] = f"{project.get('start_date') or ''}~{project.get('end_date') or ''}"
+    for field, limit in MAX_LIST_ITEMS.items():
+        items = [_truncate(item, MAX_ITEM_CHARS) for item in (project.get(field) or []) if item]
+        if items:
+            compressed[field] = items[:limit]
+    summary = project.get("summary") or project.get("description")
+    if summary:
+        compressed["summary"] = _truncate(summary, MAX_SUMMARY_CHARS)
+    return compressed
+
+
+def select_projects(
+    cover_letter_data: Dict[str, Any],
+    top_k: int = PROMPT_TOP_K,
+    token_budget: int = PROMPT_TOKEN_BUDGET,
+    today: Optional[date] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    관련도 상위 프로젝트를 토큰 예산 안에서 고릅니다.
+
+    Returns:
+        (선택된 원본 프로젝트 목록, 프롬프트용 요약 목록) - 첫 프로젝트는 예산을 넘더라도 항상 포함
+    """
+    selected: List[Dict[str, Any]] = []
+    compressed: List[Dict[str, Any]] = []
+    used_tokens = 0
+    for project in rank_projects(cover_letter_data, today):
+        if len(selected) >= top_k:
+            break
+        summary = compress_project(project)
+        tokens = estimate_tokens(str(summary))
+        if selected and used_tokens + tokens > token_budget:
+            continue
+        selected.append(project)
+        compressed.append(summary)
+        used_tokens += tokens
+    return selected, compressed
+
+
+def build_prompt_data(
+    cover_letter_data: Dict[str, Any],
+    top_k: int = PROMPT_TOP_K,
+    token_budget: int = PROMPT_TOKEN_BUDGET
+) -> Dict[str, Any]:
+    """
+    자기소개서 프롬프트에 넣을 데이터를 만듭니다.
+
+    projects는 관련도 상위 프로젝트 요약으로 바꾸고, 모든 프로젝트를 이어 붙인 experience/achievements/skills에서
+    선택되지 않은 프로젝트의 내용은 뺍니다 (원본 cover_letter_data는 변경하지 않음).
+    """
+    projects = cover_letter_data.get("projects") or []
+    if not projects:
+        return dict(cover_letter_data)
+
+    selected, compressed = select_projects(cover_letter_data, top_k, token_budget)
+    dropped = [project for project in projects if not any(project is chosen for chosen in selected)]
+    prompt_data = {key: value for key, value in cover_letter_data.items() if key != "projects"}
+    prompt_data["projects"] = compressed
+    if len(selected) < len(projects):
+        prompt_data["omitted_projects"] = len(projects) - len(selected)
+
+    # experience: 빠진 프로젝트의 "제목: 설명" 또는 "제목" 조각 제거
+    # (제목이 같은 글자로 시작하는 다른 프로젝트 조각은 유지)
+    dropped_titles = [project.get("title") for project in dropped if project.get("title")]
+    experience = cover_letter_data.get("experience")
+    if experience and dropped_titles:
+        parts = [
+            part for part in experience.split(" | ")
+            if not any(part == title or part.startswith(f"{title}: ") for title in dropped_titles)
+        ]
+        prompt_data["experience"] = " | ".join(_truncate(part, MAX_SUMMARY_CHARS) for part in parts)
+
+    # achievements: 빠진 프로젝트의 성과 제외
+    kept_achievements = {item for project in selected for item in (project.get("achievements") or [])}
+    dropped_achievements = {item for project in dropped for item in (project.get("achievements") or [])} - kept_achievements
+    achievements = [item for item in (cover_letter_data.get("achievements") or []) if item not in dropped_achievements]
+    if cover_letter_data.get("achievements") is not None:
+        prompt_data["achievements"] = achievements[:MAX_ACHIEVEMENTS]
+
+    # skills: 선택된 프로젝트의 도구를 앞에 두고 개수 제한
+    skills = cover_letter_data.get("skills") or []
+    if skills:
+        selected_tools = {tool for project in selected for tool in (project.get("tools") or [])}
+        prompt_data["skills"] = sorted(skills, key=lambda skill: skill not in selected_tools)[:MAX_SKILLS]
+    return prompt_data
@@ -0,0 +1,267 @@
+"""
+세션 모델
+챗봇 세션, 대화 턴, 프로젝트 레코드를 __slots__ 데이터 클래스로 표현합니다 (객체마다 __dict__ 없음).
+역할 문자열은 인턴된 상수를 공유하고 생성 시각은 float 타임스탬프로 저장하며,
+세션은 키 이름 없는 msgpack 배열로 직렬화하여 스냅샷/공유 저장소에 그대로 씁니다.
+
+Turn과 ProjectRecord는 기존 dict 형식과 같은 방식(msg["role"], project.get("title"))으로도 읽을 수 있어
+히스토리/프로젝트를 다루는 코드가 dict와 레코드를 구분하지 않아도 됩니다.
+"""
+
+import os
+import sys
+import time
+import tempfile
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import ormsgpack
+
+# 직렬화 형식 버전 (필드 구성이 바뀌면 올림 → 이전 스냅샷은 복원하지 않음)
+SNAPSHOT_VERSION = 2
+
+ROLE_USER = sys.intern("user")
+ROLE_ASSISTANT = sys.intern("assistant")
+
+
+class _ReadAsMapping:
+    """필드를 dict처럼 읽는 접근자 (["필드"], .get("필드"))"""
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+@dataclass(frozen=True, slots=True)
+class Turn(_ReadAsMapping):
+    """대화 한 턴 (role은 ROLE_USER/ROLE_ASSISTANT를 공유)"""
+
+    role: str
+    content: str
+
+    @classmethod
+    def user(cls, content: str) -> "Turn":
+        return cls(ROLE_USER, content)
+
+    @classmethod
+    def assistant(cls, content: str) -> "Turn":
+        return cls(ROLE_ASSISTANT, content)
+
+    @classmethod
+    def from_dict(cls, message: Union["Turn", Dict[str, str]]) -> "Turn":
+        if isinstance(message, Turn):
+            return message
+        return cls(sys.intern(message.get("role", ROLE_USER)), message.get("content", ""))
+
+
+@dataclass(slots=True)
+class ProjectRecord(_ReadAsMapping):
+    """자기소개서 데이터에 담는 프로젝트 (목록 필드는 튜플)"""
+
+    title: Optional[str] = None
+    category: Optional[str] = None
+    tags: Tuple[str, ...] = ()
+    summary: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    roles: Tuple[str, ...] = ()
+    achievements: Tuple[str, ...] = ()
+    tools: Tuple[str, ...] = ()
+    description: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, project: Dict[str, Any]) -> "ProjectRecord":
+        return cls(
+            title=project.get("title"),
+            category=project.get("category"),
+            tags=tuple(project.get("tags") or ()),
+            summary=project.get("summary"),
+            start_date=project.get("start_date"),
+            end_date=project.get("end_date"),
+            roles=tuple(project.get("roles") or ()),
+            achievements=tuple(project.get("achievements") or ()),
+            tools=tuple(project.get("tools") or ()),
+            description=project.get("description")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: list(value) if isinstance(value, tuple) else value for name, value in zip(PROJECT_FIELDS, self._values())}
+
+    def _values(self) -> List[Any]:
+        return [getattr(self, name) for name in PROJECT_FIELDS]
+
+
+PROJECT_FIELDS = [f.name for f in fields(ProjectRecord)]
+
+
+def _pack_history(history: List[Turn]) -> List[Any]:
+    """히스토리를 [역할, 내용, 역할, 내용, ...] 평면 배열로 만듭니다."""
+    packed = []
+    for turn in history:
+        turn = Turn.from_dict(turn)
+        packed.append(turn.role)
+        packed.append(turn.content)
+    return packed
+
+
+def _unpack_history(packed: List[Any]) -> List[Turn]:
+    return [Turn(sys.intern(packed[i]), packed[i + 1]) for i in range(0, len(packed), 2)]
+
+
+def _pack_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """자기소개서 데이터의 프로젝트 레코드를 값 배열로 바꿉니다."""
+    projects = data.get("projects")
+    if not projects:
+        return data
+    packed = dict(data)
+    packed["projects"] = [
+        project._values() if isinstance(project, ProjectRecord) else ProjectRecord.from_dict(project)._values()
+        for project in projects
+    ]
+    return packed
+
+
+def _unpack_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    projects = data.get("projects")
+    if projects:
+        data["projects"] = [ProjectRecord(*[tuple(value) if isinstance(value, list) else value for value in values]) for values in projects]
+    return data
+
+
+@dataclass(slots=True)
+class CoverLetterSession:
+    """자기소개서 챗봇 세션 상태 (speculative_draft는 실행 중인 작업이라 직렬화에서 제외)"""
+
+    state: str = "intent_confirmation"
+    data: Dict[str, Any] = field(default_factory=dict)
+    history: List[Turn] = field(default_factory=list)
+    writing_style: Optional[str] = None
+    draft: Optional[str] = None
+    draft_variants: Optional[Dict[str, str]] = None
+    variants_mode: Optional[bool] = None
+    export: Optional[Dict[str, Any]] = None
+    created_at: float = field(default_factory=time.time)
+    speculative_draft: Any = field(default=None, repr=False, compare=False)
+
+    kind = "cover_letter"
+
+    def _pack(self) -> List[Any]:
+        return [
+            self.state, _pack_data(self.data), _pack_history(self.history), self.writing_style, self.draft,
+            self.draft_variants, self.variants_mode, self.export, self.created_at
+        ]
+
+    @classmethod
+    def _unpack(cls, values: List[Any]) -> "CoverLetterSession":
+        state, data, history, *rest = values
+        return cls(sys.intern(state), _unpack_data(data), _unpack_history(history), *rest)
+
+    def to_bytes(self) -> bytes:
+        return encode_session(self)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "CoverLetterSession":
+        return decode_session(blob)
+
+    def result(self, message: str, status: Optional[str] = None, **extra: Any) -> Dict[str, Any]:
+        """챗봇 응답 딕셔너리를 만듭니다 (세션의 현재 값을 그대로 담음)."""
+        result = {
+            "message": message,
+            "updated_data": self.data,
+            "status": status or self.state,
+            "next_state": self.state,
+            "draft_cover_letter": self.draft,
+            "writing_style": self.writing_style,
+            "draft_variants": self.draft_variants,
+        }
+        if self.speculative_draft is not None:
+            result["speculative_draft"] = self.speculative_draft
+        result.update(extra)
+        return result
+
+
+@dataclass(slots=True)
+class RefineSession:
+    """프로젝트 수정 챗봇 세션 상태"""
+
+    project: Dict[str, Any] = field(default_factory=dict)
+    user_id: Optional[str] = None
+    history: List[Turn] = field(default_factory=list)
+    status: str = "conversing"
+    created_at: float = field(default_factory=time.time)
+
+    kind = "refine"
+
+    def _pack(self) -> List[Any]:
+        return [self.project, self.user_id, _pack_history(self.history), self.status, self.created_at]
+
+    @classmethod
+    def _unpack(cls, values: List[Any]) -> "RefineSession":
+        project, user_id, history, status, created_at = values
+        return cls(project, user_id, _unpack_history(history), sys.intern(status), created_at)
+
+    def to_bytes(self) -> bytes:
+        return encode_session(self)
+
+
+Session = Union[CoverLetterSession, RefineSession]
+SESSION_TYPES = {cls.kind: cls for cls in (CoverLetterSession, RefineSession)}
+
+
+def encode_session(session: Session) -> bytes:
+    """세션을 [형식 버전, 종류, 필드 값...] msgpack 배열로 직렬화합니다."""
+    return ormsgpack.packb([SNAPSHOT_VERSION, session.kind] + session._pack())
+
+
+def decode_session(blob: bytes) -> Session:
+    """encode_session 결과에서 세션을 복원합니다 (형식 버전/종류가 다르면 ValueError)."""
+    values = ormsgpack.unpackb(blob)
+    if not values or values[0] != SNAPSHOT_VERSION or values[1] not in SESSION_TYPES:
+        raise ValueError("지원하지 않는 세션 스냅샷 형식입니다.")
+    return SESSION_TYPES[values[1]]._unpack(values[2:])
+
+
+def save_sessions(sessions: Dict[str, Session], path: Path) -> int:
+    """
+    세션들을 한 파일에 스냅샷으로 저장합니다 (임시 파일에 쓴 뒤 원자적으로 교체).
+
+    Returns:
+        저장한 세션 수
+    """
+    blob = ormsgpack.packb({session_id: encode_session(session) for session_id, session in sessions.items()})
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(blob)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return len(sessions)
+
+
+def load_sessions(path: Path) -> Dict[str, Session]:
+    """save_sessions로 저장한 스냅샷을 읽습니다 (파일이 없으면 빈 딕셔너리, 형식이 다른 세션은 건너뜀)."""
+    try:
+        with open(path, "rb") as f:
+            snapshot = ormsgpack.unpackb(f.read())
+    except FileNotFoundError:
+        return {}
+    sessions = {}
+    for session_id, blob in snapshot.items():
+        try:
+            sessions[session_id] = decode_session(blob)
+        except (ValueError, TypeError) as e:
+            print(f"세션 스냅샷 복원 실패 ({session_id}): {str(e)}")
+    return sessions
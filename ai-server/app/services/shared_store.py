@@ -0,0 +1,176 @@
+"""
+공유 상태 저장소
+여러 워커 프로세스(gunicorn)가 같은 세션과 캐시를 보도록 로컬 SQLite 파일(WAL 모드)에 저장합니다.
+세션은 session_models의 msgpack 바이너리로, 캐시는 (이름공간, 키) → 바이트 값으로 보관하며
+재시작 후에도 그대로 남습니다.
+
+연결은 스레드마다 하나씩 열고, fork된 자식 프로세스에서는 부모의 연결을 쓰지 않고 새로 엽니다.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from app.services.session_models import Session, encode_session, decode_session
+
+SHARED_STATE_PATH = Path(os.getenv("SHARED_STATE_PATH", str(Path("files") / "state.db")))
+
+# 마지막 갱신 후 이 시간이 지난 세션/캐시 값은 expire()에서 삭제
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# 다른 프로세스가 쓰는 중일 때 기다리는 최대 시간 (초)
+BUSY_TIMEOUT_SECONDS = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_kind_created ON sessions (kind, created_at);
+CREATE TABLE IF NOT EXISTS cache (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+
+class SharedStore:
+    """프로세스 간에 공유하는 SQLite 세션/캐시 저장소"""
+
+    def __init__(self, path: Path = SHARED_STATE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """현재 스레드의 연결을 반환합니다 (처음이면 열고 스키마 준비)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        # isolation_level=None: 자동 커밋, 여러 문장을 묶을 때만 BEGIN IMMEDIATE
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with self._schema_lock:
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+        self._local.conn = conn
+        return conn
+
+    def reset_after_fork(self) -> None:
+        """fork된 자식에서 부모가 연 연결을 버립니다 (닫지 않음, 다음 사용 시 새로 연결)."""
+        self._local = threading.local()
+
+    # ---- 세션 ----
+
+    def get_session(self, session_id: str) -> Optional[Session]:
+        row = self._connect().execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return decode_session(row[0]) if row else None
+
+    def put_session(self, session_id: str, session: Session) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO sessions (id, kind, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?)",
+            (session_id, session.kind, session.created_at, time.time(), encode_session(session))
+        )
+
+    def latest_session(self, kind: str) -> Optional[Tuple[str, Session]]:
+        """가장 최근에 만든 kind 세션을 (세션 ID, 세션)으로 반환합니다."""
+        row = self._connect().execute(
+            "SELECT id, data FROM sessions WHERE kind = ? ORDER BY created_at DESC LIMIT 1", (kind,)
+        ).fetchone()
+        return (row[0], decode_session(row[1])) if row else None
+
+    def update_session(self, session_id: str, update: Callable[[Session], Optional[Session]]) -> Optional[Session]:
+        """
+        세션을 읽어 update(session)로 고친 뒤 저장합니다 (다른 프로세스의 쓰기와 겹치지 않도록 한 트랜잭션).
+        update가 세션을 반환하면 읽은 세션 대신 그 세션을 저장합니다.
+
+        Returns:
+            갱신된 세션 (세션이 없으면 None)
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            session = decode_session(row[0])
+            session = update(session) or session
+            conn.execute(
+                "UPDATE sessions SET updated_at = ?, data = ? WHERE id = ?",
+                (time.time(), encode_session(session), session_id)
+            )
+            conn.execute("COMMIT")
+            return session
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def delete_session(self, session_id: str) -> None:
+        self._connect().execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    # ---- 캐시 ----
+
+    def get_value(self, namespace: str, key: str) -> Optional[bytes]:
+        row = self._connect().execute(
+            "SELECT value FROM cache WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def put_value(self, namespace: str, key: str, value: bytes) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, updated_at, value) VALUES (?, ?, ?, ?)",
+            (namespace, key, time.time(), value)
+        )
+
+    # ---- 관리 ----
+
+    def expire(self, max_age_seconds: int = SESSION_TTL_SECONDS) -> int:
+        """오래 갱신되지 않은 세션과 캐시 값을 삭제하고 삭제한 개수를 반환합니다."""
+        cutoff = time.time() - max_age_seconds
+        conn = self._connect()
+        removed = conn.execute("DELETE FROM sessions WHERE updated_at < ?", (cutoff,)).rowcount
+        removed += conn.execute("DELETE FROM cache WHERE updated_at < ?", (cutoff,)).rowcount
+        return removed
+
+    def usage(self) -> Dict[str, int]:
+        """종류별 세션 수와 캐시 값 수를 반환합니다."""
+        conn = self._connect()
+        usage = {kind: count for kind, count in conn.execute("SELECT kind, COUNT(*) FROM sessions GROUP BY kind")}
+        usage["cache"] = conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        return usage
+
+
+_store: Optional[SharedStore] = None
+_store_lock = threading.Lock()
+
+
+def get_shared_store() -> SharedStore:
+    """프로세스에서 하나의 공유 저장소 객체를 반환합니다 (같은 파일을 여러 워커가 함께 사용)."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SharedStore()
+        return _store
+
+
+def _reset_after_fork() -> None:
+    if _store is not None:
+        _store.reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
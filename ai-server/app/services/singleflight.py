@@ -0,0 +1,72 @@
+"""
+요청 병합(singleflight) 서비스
+같은 키의 작업이 이미 진행 중이면 새로 실행하지 않고 진행 중인 작업의 결과를 함께 기다립니다.
+더블 클릭이나 프록시 재시도로 같은 업로드가 연달아 들어와도 분석은 한 번만 실행됩니다.
+"""
+
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """키별로 진행 중인 작업을 하나로 합치는 이벤트 루프용 요청 병합기"""
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"calls": 0, "executed": 0, "coalesced": 0, "failed": 0}
+
+    async def do(self, key: str, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        key에 해당하는 작업을 실행하거나, 이미 진행 중이면 그 결과를 기다립니다.
+
+        작업은 별도 태스크로 실행되므로 먼저 요청한 클라이언트가 연결을 끊어도
+        함께 기다리는 다른 요청에는 영향을 주지 않습니다.
+
+        Args:
+            key: 작업 식별 키 (입력 내용의 해시)
+            func: 코루틴 함수 (예: asyncio.to_thread)
+            *args: func에 전달할 인자
+
+        Returns:
+            작업 결과 (같은 키를 기다린 모든 요청이 같은 결과를 받음)
+        """
+        self.stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["executed"] += 1
+            task = asyncio.ensure_future(func(*args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        """완료된 작업을 진행 목록에서 제거합니다."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 기다리던 요청이 모두 취소된 경우에도 예외가 회수되지 않았다는 경고가 남지 않도록 확인
+        if not task.cancelled() and task.exception() is not None:
+            self.stats["failed"] += 1
+
+    @property
+    def inflight(self) -> int:
+        """현재 진행 중인 작업 수"""
+        return len(self._inflight)
+
+
+def make_key(*parts: Optional[Any]) -> str:
+    """입력 값들로 작업 키(SHA-256)를 만듭니다 (bytes는 그대로, 나머지는 문자열로 해시)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if part is None:
+            data = b"\x00"
+        elif isinstance(part, (bytes, bytearray)):
+            data = bytes(part)
+        else:
+            data = str(part).encode("utf-8")
+        # 구분자 충돌을 막기 위해 길이를 앞에 붙임
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
@@ -0,0 +1,99 @@
+"""
+상태 패치(delta) 서비스
+대화형 정보 추출에서 LLM이 전체 상태를 다시 출력하는 대신 바뀐 필드만 패치 연산으로 돌려주게 하고,
+서버에서 복사 후 쓰기(copy-on-write)로 적용합니다 (JSON 왕복 깊은 복사 없음).
+
+패치 형식:
+    {"set": {"필드": 값}, "add": {"목록 필드": [추가할 값]}, "remove": {"목록 필드": [제거할 값]}}
+"""
+
+import json
+from typing import Dict, Any, Iterable, List, Tuple
+
+# 프롬프트에 넣는 응답 형식 설명 (필드 설명은 호출 측 프롬프트에서 제공)
+PATCH_INSTRUCTIONS = """바뀐 내용만 "patch"로 응답하세요 (변경 없는 필드는 절대 포함하지 마세요):
+- "set": 단일 값 필드를 새 값으로 바꾸거나, 목록 필드 전체를 다시 쓸 때 (예: 문체 변경)
+- "add": 목록 필드에 새 항목 추가
+- "remove": 목록 필드에서 항목 제거
+예: "patch": {"set": {"position": "백엔드 개발자"}, "add": {"skills": ["Docker"]}}
+바뀐 것이 없으면 "patch": {}"""
+
+
+def format_state(state: Dict[str, Any], fields: Iterable[str]) -> str:
+    """프롬프트용으로 상태의 지정 필드만 한 줄 JSON으로 만듭니다 (들여쓰기 없음)."""
+    return json.dumps({field: state.get(field) for field in fields}, ensure_ascii=False, separators=(",", ":"))
+
+
+def copy_state(state: Dict[str, Any]) -> Dict[str, Any]:
+    """상태의 얕은 복사본을 만듭니다 (목록 값은 새 목록으로 복사, 안쪽 객체는 공유)."""
+    return {key: list(value) if isinstance(value, list) else value for key, value in state.items()}
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def apply_patch(
+    state: Dict[str, Any],
+    patch: Dict[str, Any],
+    fields: Iterable[str],
+    list_fields: Iterable[str]
+) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    패치를 적용한 새 상태를 반환합니다 (원본 state는 변경하지 않음).
+
+    Args:
+        state: 현재 상태
+        patch: LLM이 반환한 패치 ({"set", "add", "remove"})
+        fields: 변경을 허용하는 필드 (나머지는 무시)
+        list_fields: 목록 필드
+
+    Returns:
+        (새 상태, 실제로 바뀐 필드 목록)
+    """
+    allowed = set(fields)
+    list_fields = set(list_fields)
+    updated = dict(state)
+    changed: List[str] = []
+
+    def mark(field: str):
+        if field not in changed:
+            changed.append(field)
+
+    for field, value in (patch.get("set") or {}).items():
+        if field not in allowed or value is None or value == "":
+            continue
+        if field in list_fields:
+            value = [item for item in _as_list(value) if item not in (None, "")]
+            if not value:
+                continue
+        if updated.get(field) != value:
+            updated[field] = value
+            mark(field)
+
+    for field, values in (patch.get("add") or {}).items():
+        if field not in list_fields or field not in allowed:
+            continue
+        current = _as_list(updated.get(field))
+        # 기존 순서 유지, 중복 없이 뒤에 추가
+        merged = list(current)
+        for item in _as_list(values):
+            if item not in (None, "") and item not in merged:
+                merged.append(item)
+        if len(merged) != len(current):
+            updated[field] = merged
+            mark(field)
+
+    for field, values in (patch.get("remove") or {}).items():
+        if field not in list_fields or field not in allowed:
+            continue
+        current = _as_list(updated.get(field))
+        removals = set(item for item in _as_list(values) if isinstance(item, (str, int, float)))
+        remaining = [item for item in current if not (isinstance(item, (str, int, float)) and item in removals)]
+        if len(remaining) != len(current):
+            updated[field] = remaining
+            mark(field)
+
+    return updated, changed
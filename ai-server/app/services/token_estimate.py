@@ -0,0 +1,29 @@
+"""
+토큰 수 어림 계산
+프롬프트에 넣을 텍스트의 예산(프로젝트 요약, 저장소 발췌)을 같은 기준으로 계산합니다.
+한글은 글자당 약 1토큰, 그 외(영문, 숫자, 코드, 공백)는 4글자당 약 1토큰으로 봅니다.
+"""
+
+
+def _is_hangul(char: str) -> bool:
+    return "가" <= char <= "힣"
+
+
+def estimate_tokens(text: str) -> int:
+    """텍스트의 토큰 수를 어림합니다."""
+    hangul = sum(1 for char in text if _is_hangul(char))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """어림 토큰 수가 budget을 넘지 않도록 텍스트 앞부분만 남깁니다."""
+    if budget <= 0:
+        return ""
+    # 4글자당 1토큰 단위로 계산 (한글 4, 그 외 1)
+    limit = budget * 4
+    cost = 0
+    for index, char in enumerate(text):
+        cost += 4 if _is_hangul(char) else 1
+        if cost > limit:
+            return text[:index]
+    return text
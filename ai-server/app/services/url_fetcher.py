@@ -0,0 +1,279 @@
+"""
+URL 가져오기 서비스
+커넥션 풀을 공유하는 비동기 HTTP 클라이언트로 웹 페이지를 스트리밍 방식으로 가져옵니다.
+응답 크기에 상한을 두고, 충분한 텍스트가 모이면 읽기를 중단하며,
+ETag/Last-Modified 기반 조건부 요청 캐시를 디스크에 유지합니다.
+"""
+
+import os
+import re
+import json
+import time
+import codecs
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from html.parser import HTMLParser
+from typing import Dict, Any, Optional
+
+import httpx
+
+# 응답 본문 최대 크기 (바이트)
+MAX_RESPONSE_BYTES = int(os.getenv("LINK_FETCH_MAX_BYTES", str(2 * 1024 * 1024)))
+
+# 이만큼의 본문 텍스트가 모이면 더 이상 읽지 않음 (analyze_link의 50000자 제한과 동일)
+MAX_TEXT_CHARS = 50000
+
+# 요청 타임아웃 (초) 및 전체 처리 제한 시간
+FETCH_TIMEOUT = 10.0
+FETCH_DEADLINE = 30.0
+
+# 조건부 요청 캐시 디렉토리
+CACHE_DIR = Path(os.getenv("LINK_CACHE_DIR", "files/cache/links"))
+
+USER_AGENT = "Mozilla/5.0 (compatible; NextMe-AI-Server/1.0)"
+
+# 텍스트로 치지 않는 태그
+NON_TEXT_TAGS = {"script", "style", "noscript", "template"}
+
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_\-]+)', re.IGNORECASE)
+
+# 전용 이벤트 루프 스레드와 그 위에서만 사용하는 공유 클라이언트
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_client: Optional[httpx.AsyncClient] = None
+
+
+class _TextCounter(HTMLParser):
+    """스트리밍 중 지금까지 모인 본문 텍스트 길이를 추적합니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.text_chars = 0
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in NON_TEXT_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in NON_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.text_chars += len(data.strip())
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """페처 전용 이벤트 루프를 (최초 호출 시) 백그라운드 스레드에서 시작합니다."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="url-fetcher", daemon=True)
+            thread.start()
+            _loop = loop
+    return _loop
+
+
+def _get_client() -> httpx.AsyncClient:
+    """커넥션 풀을 공유하는 HTTP 클라이언트를 반환합니다 (페처 루프 안에서만 호출)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(FETCH_TIMEOUT),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+            follow_redirects=True,
+            headers={"User-Agent": USER_AGENT}
+        )
+    return _client
+
+
+def _cache_paths(url: str) -> tuple:
+    """URL에 대한 캐시 메타데이터/본문 파일 경로를 반환합니다."""
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{key}.json", CACHE_DIR / f"{key}.html"
+
+
+def _load_cache_entry(url: str) -> Optional[Dict[str, Any]]:
+    """디스크 캐시에서 URL의 메타데이터를 읽습니다."""
+    meta_path, body_path = _cache_paths(url)
+    try:
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"링크 캐시 읽기 오류: {str(e)}")
+        return None
+
+
+def _store_cache_entry(url: str, meta: Dict[str, Any], body: bytes) -> None:
+    """응답 본문과 검증자(ETag/Last-Modified)를 디스크 캐시에 저장합니다."""
+    meta_path, body_path = _cache_paths(url)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # 다른 요청이 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_body = body_path.with_suffix(f".html.{os.getpid()}.tmp")
+        tmp_body.write_bytes(body)
+        os.replace(tmp_body, body_path)
+        tmp_meta = meta_path.with_suffix(f".json.{os.getpid()}.tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta, meta_path)
+    except Exception as e:
+        print(f"링크 캐시 저장 오류: {str(e)}")
+
+
+def _resolve_encoding(header_encoding: Optional[str], head: bytes) -> str:
+    """Content-Type 헤더 또는 <meta charset>에서 인코딩을 결정합니다 (기본값: utf-8)."""
+    candidates = [header_encoding]
+    match = META_CHARSET_PATTERN.search(head)
+    if match:
+        candidates.append(match.group(1).decode("ascii", errors="ignore"))
+
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+async def _fetch(url: str, max_bytes: int, max_text_chars: int) -> Dict[str, Any]:
+    """URL을 스트리밍으로 가져옵니다 (페처 루프에서 실행)."""
+    client = _get_client()
+
+    # 캐시된 검증자가 있으면 조건부 요청
+    cached = _load_cache_entry(url)
+    if cached and cached.get("truncated"):
+        # 이전에 저장된 잘린 본문은 재사용하지 않음 (검증자를 보내지 않고 새로 받음)
+        cached = None
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    async with client.stream("GET", url, headers=headers) as response:
+        if response.status_code == 304 and cached:
+            _, body_path = _cache_paths(url)
+            return {
+                "url": cached.get("final_url", url),
+                "status_code": 304,
+                "content": body_path.read_bytes(),
+                "encoding": cached.get("encoding", "utf-8"),
+                "content_type": cached.get("content_type"),
+                "from_cache": True,
+                "truncated": False
+            }
+
+        response.raise_for_status()
+
+        chunks = []
+        size = 0
+        truncated = False
+        encoding = None
+        decoder = None
+        counter = _TextCounter()
+
+        async for chunk in response.aiter_bytes():
+            remaining = max_bytes - size
+            if len(chunk) >= remaining:
+                chunk = chunk[:remaining]
+                truncated = True
+            chunks.append(chunk)
+            size += len(chunk)
+
+            # 첫 청크에서 인코딩 결정 후 점진적으로 디코딩하며 텍스트 양 측정
+            if decoder is None:
+                encoding = _resolve_encoding(response.charset_encoding, chunk[:4096])
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            counter.feed(decoder.decode(chunk))
+
+            if counter.text_chars >= max_text_chars:
+                truncated = True
+            if truncated:
+                break
+
+        body = b"".join(chunks)
+        if encoding is None:
+            encoding = _resolve_encoding(response.charset_encoding, body[:4096])
+
+        result = {
+            "url": str(response.url),
+            "status_code": response.status_code,
+            "content": body,
+            "encoding": encoding,
+            "content_type": response.headers.get("content-type"),
+            "from_cache": False,
+            "truncated": truncated
+        }
+
+        # 검증자가 있는 완전한 응답만 캐시 (검증자가 없으면 조건부 요청이 불가능하고,
+        # 잘린 본문을 캐시하면 이후 304마다 잘린 본문을 재사용하게 됨)
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if (etag or last_modified) and not truncated:
+            _store_cache_entry(url, {
+                "url": url,
+                "final_url": result["url"],
+                "etag": etag,
+                "last_modified": last_modified,
+                "encoding": encoding,
+                "content_type": result["content_type"],
+                "fetched_at": time.time()
+            }, body)
+
+        return result
+
+
+def _submit(url: str, max_bytes: int, max_text_chars: int):
+    """페처 루프에 요청을 제출하고 concurrent.futures.Future를 반환합니다."""
+    coroutine = asyncio.wait_for(_fetch(url, max_bytes, max_text_chars), timeout=FETCH_DEADLINE)
+    return asyncio.run_coroutine_threadsafe(coroutine, _get_loop())
+
+
+def fetch_url(url: str, max_bytes: int = MAX_RESPONSE_BYTES, max_text_chars: int = MAX_TEXT_CHARS) -> Dict[str, Any]:
+    """
+    URL을 가져옵니다 (동기 호출용).
+
+    Args:
+        url: 가져올 URL
+        max_bytes: 읽을 최대 바이트 수
+        max_text_chars: 이만큼의 본문 텍스트가 모이면 읽기 중단
+
+    Returns:
+        {
+            "url": 최종 URL (리다이렉트 반영),
+            "status_code": 200 또는 304,
+            "content": 본문 바이트,
+            "encoding": 본문 인코딩,
+            "content_type": Content-Type 헤더,
+            "from_cache": 캐시 재사용 여부,
+            "truncated": 상한에 걸려 잘렸는지 여부
+        }
+    """
+    return _submit(url, max_bytes, max_text_chars).result()
+
+
+async def fetch_url_async(url: str, max_bytes: int = MAX_RESPONSE_BYTES, max_text_chars: int = MAX_TEXT_CHARS) -> Dict[str, Any]:
+    """URL을 가져옵니다 (다른 이벤트 루프에서 await 가능)."""
+    return await asyncio.wrap_future(_submit(url, max_bytes, max_text_chars))
+
+
+def _reset_after_fork() -> None:
+    """fork된 자식에는 부모의 페처 루프 스레드가 없으므로 루프/클라이언트를 새로 만들게 합니다."""
+    global _loop, _loop_lock, _client
+    _loop = None
+    _loop_lock = threading.Lock()
+    _client = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
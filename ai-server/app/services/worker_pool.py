@@ -0,0 +1,79 @@
+"""
+워커 스레드 풀
+모듈 전역 스레드 풀(렌더링, 선행 생성, 인덱싱, 분석)을 멀티 프로세스 서버에서 안전하게 쓰기 위한 ThreadPoolExecutor입니다.
+- fork된 자식 프로세스에서는 부모의 스레드가 없으므로 같은 객체를 그 자리에서 다시 초기화합니다
+  (다른 모듈이 import한 이름이 그대로 유효).
+- 종료 시 drain_pools()로 실행 중인 작업을 제한 시간까지 기다립니다 (선행 생성처럼 버려도 되는 풀은 대기 작업 취소).
+"""
+
+import os
+import time
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
+
+_pools: "weakref.WeakSet[WorkerPool]" = weakref.WeakSet()
+
+
+class WorkerPool(ThreadPoolExecutor):
+    """fork 후 재초기화와 종료 시 드레인을 지원하는 스레드 풀"""
+
+    def __init__(self, max_workers: int, thread_name_prefix: str, cancel_on_shutdown: bool = False):
+        """
+        Args:
+            max_workers: 최대 스레드 수
+            thread_name_prefix: 스레드 이름 접두사 (통계/드레인 결과의 풀 이름으로도 사용)
+            cancel_on_shutdown: 종료 시 아직 시작하지 않은 작업을 취소할지 여부
+        """
+        self.name = thread_name_prefix
+        self.cancel_on_shutdown = cancel_on_shutdown
+        super().__init__(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        _pools.add(self)
+
+    def _reinit_after_fork(self) -> None:
+        super().__init__(max_workers=self._max_workers, thread_name_prefix=self._thread_name_prefix)
+
+    @property
+    def active_threads(self) -> int:
+        return len(self._threads)
+
+    @property
+    def queued(self) -> int:
+        return self._work_queue.qsize()
+
+
+def drain_pools(timeout: float) -> Dict[str, Any]:
+    """
+    모든 풀에 새 작업을 받지 않게 하고, 실행 중인 작업이 끝나기를 최대 timeout초 기다립니다.
+
+    Returns:
+        {"drained": 제한 시간 안에 끝났는지, "seconds": 걸린 시간, "pools": {이름: 남은 대기 작업 수}}
+    """
+    started = time.perf_counter()
+    pools = list(_pools)
+    pending = {pool.name: pool.queued for pool in pools}
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=pool.cancel_on_shutdown)
+
+    def wait_all():
+        for pool in pools:
+            pool.shutdown(wait=True)
+
+    waiter = threading.Thread(target=wait_all, name="pool-drain", daemon=True)
+    waiter.start()
+    waiter.join(timeout)
+    return {
+        "drained": not waiter.is_alive(),
+        "seconds": round(time.perf_counter() - started, 3),
+        "pools": pending,
+    }
+
+
+def _reinit_after_fork() -> None:
+    for pool in list(_pools):
+        pool._reinit_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_after_fork)
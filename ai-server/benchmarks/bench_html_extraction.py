@@ -0,0 +1,87 @@
+"""
+HTML 본문 추출 벤치마크
+저장된 HTML 코퍼스에 대해 기존 방식(BeautifulSoup html.parser + 전체 텍스트)과
+html_extractor.extract_main_content의 처리 시간과 출력 길이를 비교합니다.
+
+사용법 (ai-server 디렉토리에서):
+    python -m benchmarks.bench_html_extraction [HTML 디렉토리] [반복 횟수]
+
+디렉토리를 지정하지 않으면 저장소에 포함된 코퍼스(benchmarks/html_corpus)를 사용합니다.
+실제 링크 캐시로 측정하려면 files/cache/links를 지정하세요.
+"""
+
+import sys
+import json
+import time
+from pathlib import Path
+
+from app.services.html_extractor import extract_main_content
+
+CORPUS_DIR = Path(__file__).resolve().parent / "html_corpus"
+
+
+def legacy_extract(html: bytes, encoding: str) -> str:
+    """기존 analyze_link의 텍스트 추출 방식"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html.decode(encoding, errors="replace"), 'html.parser')
+
+    for script in soup(["script", "style"]):
+        script.decompose()
+
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = ' '.join(chunk for chunk in chunks if chunk)
+    return text[:50000]
+
+
+def load_corpus(corpus_dir: Path) -> list:
+    """코퍼스 디렉토리의 HTML 파일과 인코딩을 읽습니다 (같은 이름의 .json 메타데이터가 있으면 인코딩을 읽음)."""
+    corpus = []
+    for path in sorted(corpus_dir.glob("*.htm*")):
+        encoding = "utf-8"
+        meta_path = path.with_suffix(".json")
+        if meta_path.exists():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                encoding = json.load(f).get("encoding", encoding)
+        corpus.append((path.name, path.read_bytes(), encoding))
+    return corpus
+
+
+def timed(func, repeat: int) -> tuple:
+    """함수를 repeat번 실행하여 (평균 ms, 마지막 결과)를 반환합니다."""
+    result = None
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+def main():
+    corpus_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else CORPUS_DIR
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    corpus = load_corpus(corpus_dir)
+    if not corpus:
+        print(f"HTML 파일이 없습니다: {corpus_dir}")
+        sys.exit(1)
+
+    print(f"{'파일':<40} {'기존 ms':>9} {'신규 ms':>9} {'기존 글자':>10} {'신규 글자':>10}")
+    totals = [0.0, 0.0, 0, 0]
+    for name, html, encoding in corpus:
+        legacy_ms, legacy_text = timed(lambda: legacy_extract(html, encoding), repeat)
+        new_ms, new_text = timed(lambda: extract_main_content(html, encoding=encoding, max_chars=50000), repeat)
+        totals[0] += legacy_ms
+        totals[1] += new_ms
+        totals[2] += len(legacy_text)
+        totals[3] += len(new_text)
+        print(f"{name[:40]:<40} {legacy_ms:>9.2f} {new_ms:>9.2f} {len(legacy_text):>10} {len(new_text):>10}")
+
+    print("-" * 82)
+    print(f"{'합계':<40} {totals[0]:>9.2f} {totals[1]:>9.2f} {totals[2]:>10} {totals[3]:>10}")
+    if totals[1] and totals[2]:
+        print(f"속도 {totals[0] / totals[1]:.1f}배, 프롬프트 텍스트 {100 * (1 - totals[3] / totals[2]):.0f}% 감소")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+세션 메모리 벤치마크
+같은 내용의 자기소개서 세션 N개를 기존 dict 레이아웃(세션/턴/프로젝트 모두 dict, ISO 문자열 created_at)과
+__slots__ 세션 모델(CoverLetterSession/Turn/ProjectRecord, float 타임스탬프)로 만들어
+tracemalloc 기준 메모리와 세션당 바이트, msgpack 직렬화/복원 시간을 비교합니다.
+
+사용법 (ai-server 디렉토리에서):
+    python -m benchmarks.bench_session_memory [세션 수 ...]   (기본: 10000 100000)
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from app.services.session_models import CoverLetterSession, ProjectRecord, Turn, encode_session, decode_session
+
+TURNS = 8
+PROJECTS = 3
+DRAFT_PARAGRAPHS = 12
+
+
+def _texts(i: int):
+    """세션 i의 문자열 (레이아웃마다 새로 만들어 둘 다 같은 문자열 비용을 가짐)"""
+    draft = "\n".join(f"{i}-{p}. 저는 백엔드 API 설계와 배포 자동화를 맡아 응답 시간을 40% 줄였습니다." for p in range(DRAFT_PARAGRAPHS))
+    turns = [
+        f"{i}-{t} 사용자 답변입니다." if t % 2 == 0 else f"{i}-{t} 넥스터 응답입니다. 지원하시는 직무와 관련된 경험을 조금 더 알려주세요."
+        for t in range(TURNS)
+    ]
+    projects = [
+        {
+            "title": f"프로젝트 {i}-{p}",
+            "category": "웹 개발",
+            "tags": ["backend", "api"],
+            "summary": f"{i}-{p} 사용자 포트폴리오를 자동으로 만들어 주는 서비스",
+            "start_date": "2024-03",
+            "end_date": "2024-08",
+            "roles": ["백엔드 개발자"],
+            "achievements": [f"{i}-{p} 응답 시간 40% 단축"],
+            "tools": ["Python", "FastAPI", "PostgreSQL"],
+            "description": f"{i}-{p} FastAPI 기반 API 서버와 배포 파이프라인을 구축했습니다."
+        }
+        for p in range(PROJECTS)
+    ]
+    return draft, turns, projects
+
+
+def _cover_letter_data(projects):
+    return {
+        "position": "백엔드 개발자",
+        "skills": ["Python", "FastAPI", "PostgreSQL"],
+        "experience": " | ".join(project["title"] for project in projects),
+        "achievements": [project["achievements"][0] for project in projects],
+        "motivation": None,
+        "strengths": [],
+        "personality": None,
+        "future_plans": None,
+        "projects": projects
+    }
+
+
+def legacy_session(i: int):
+    draft, turns, projects = _texts(i)
+    return {
+        "cover_letter_data": _cover_letter_data(projects),
+        "conversation_history": [{"role": "user" if t % 2 == 0 else "assistant", "content": text} for t, text in enumerate(turns)],
+        "current_state": "draft_revision",
+        "writing_style": "자연스럽고 전문적인",
+        "draft_cover_letter": draft,
+        "variants_mode": None,
+        "draft_variants": None,
+        "created_at": datetime.now().isoformat()
+    }
+
+
+def compact_session(i: int) -> CoverLetterSession:
+    draft, turns, projects = _texts(i)
+    data = _cover_letter_data([ProjectRecord.from_dict(project) for project in projects])
+    return CoverLetterSession(
+        state="draft_revision",
+        data=data,
+        history=[Turn.user(text) if t % 2 == 0 else Turn.assistant(text) for t, text in enumerate(turns)],
+        writing_style="자연스럽고 전문적인",
+        draft=draft
+    )
+
+
+def measure(factory, count: int):
+    """세션 count개를 만든 뒤 남아 있는 메모리(바이트)와 생성 시간(초)을 반환합니다."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    sessions = [factory(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    gc.collect()
+    return current, elapsed
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    sample = compact_session(0)
+    blob = encode_session(sample)
+    repeat = 20000
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode_session(sample)
+    encode_us = (time.perf_counter() - start) * 1e6 / repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode_session(blob)
+    decode_us = (time.perf_counter() - start) * 1e6 / repeat
+
+    print(f"세션 구성: 턴 {TURNS}개, 프로젝트 {PROJECTS}개, 초안 {len(sample.draft)}자")
+    print(f"msgpack 직렬화 {encode_us:>7.2f} us  복원 {decode_us:>7.2f} us  크기 {len(blob)} B")
+    print()
+    print(f"{'세션 수':>9}  {'레이아웃':<8} {'메모리(MB)':>10} {'세션당(B)':>10} {'생성(s)':>8}")
+    for count in counts:
+        results = {}
+        for name, factory in (("dict", legacy_session), ("slots", compact_session)):
+            memory, elapsed = measure(factory, count)
+            results[name] = memory
+            print(f"{count:>9}  {name:<8} {memory / 1024 / 1024:>10.1f} {memory / count:>10.0f} {elapsed:>8.2f}")
+        saved = results["dict"] - results["slots"]
+        print(f"{'':>9}  절감 {saved / 1024 / 1024:.1f} MB ({saved / results['dict'] * 100:.0f}%, 세션당 {saved / count:.0f} B)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+import 시간 벤치마크
+새 인터프리터에서 `python -X importtime -c "import 모듈"`을 실행해 전체 import 시간과
+import 시간이 큰 패키지를 보여줍니다 (서버 콜드 스타트, --reload 재시작 비용 확인용).
+여러 번 실행해 가장 빠른 회차를 사용합니다 (디스크 캐시 영향 제외).
+
+사용법 (ai-server 디렉토리에서):
+    python -m benchmarks.import_time [모듈] [반복 횟수] [상위 개수]   (기본: app.main 5 15)
+"""
+
+import re
+import os
+import sys
+import time
+import subprocess
+from typing import Dict, List, Tuple
+
+LINE_PATTERN = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(module: str) -> Tuple[float, List[Tuple[int, int, int, str]]]:
+    """
+    새 프로세스에서 module을 import합니다.
+
+    Returns:
+        (프로세스 실행 시간 초, [(self us, 누적 us, 깊이, 모듈 이름)])
+    """
+    env = dict(os.environ)
+    # 키가 없어도 import는 되어야 하지만, 외부 서비스에 연결하지 않도록 더미 값 사용
+    env.setdefault("OPENAI_API_KEY", "import-time-benchmark")
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = LINE_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return elapsed, entries
+
+
+def summarize(entries: List[Tuple[int, int, int, str]]) -> Tuple[int, Dict[str, int]]:
+    """전체 import 시간(us)과 최상위 패키지별 시간(소속 모듈의 self 시간 합, 중복 없음)을 계산합니다."""
+    total = sum(cumulative for _, cumulative, depth, _ in entries if depth == 0)
+    packages: Dict[str, int] = {}
+    for self_us, _, _, name in entries:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    return total, packages
+
+
+def main():
+    module = sys.argv[1] if len(sys.argv) > 1 else "app.main"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    top = int(sys.argv[3]) if len(sys.argv) > 3 else 15
+
+    runs = []
+    for _ in range(repeat):
+        elapsed, entries = run_importtime(module)
+        total, packages = summarize(entries)
+        runs.append((total, elapsed, packages, len(entries)))
+    total, elapsed, packages, count = min(runs, key=lambda run: run[0])
+
+    print(f"import {module}: {total / 1000:.1f} ms (모듈 {count}개, 프로세스 {elapsed * 1000:.0f} ms, {repeat}회 중 최소)")
+    print()
+    print(f"{'패키지':<28} {'시간(ms)':>9}")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        print(f"{package:<28} {self_us / 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
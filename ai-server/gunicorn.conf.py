@@ -0,0 +1,90 @@
+"""
+운영 서버 설정 (gunicorn + uvicorn 워커)
+    gunicorn app.main:app -c gunicorn.conf.py
+
+- 컨테이너에 할당된 CPU 수만큼(최대 MAX_DEFAULT_WORKERS) 워커 프로세스를 띄웁니다.
+  워커마다 분석/렌더링/선행 생성 스레드 풀을 따로 가지므로 기본값은 보수적으로 두고,
+  더 필요하면 WEB_CONCURRENCY로 워커 수를 직접 지정합니다.
+- preload_app: 마스터에서 앱과 무거운 라이브러리를 한 번 import한 뒤 fork하여 워커들이 메모리를 copy-on-write로 공유합니다.
+  import 시점에는 스레드/연결을 만들지 않고, 스레드 풀·OpenAI 클라이언트·SQLite 연결은 fork 후 워커에서 새로 만듭니다.
+- 세션과 캐시는 공유 저장소(files/state.db)에 있으므로 어느 워커가 요청을 받아도 같은 대화를 이어갑니다.
+- 생성 파일도 모든 워커가 같은 디스크 디렉토리를 읽어야 다운로드 링크가 어느 워커에서나 열립니다.
+  워커별로 따로 보관되는 RESUME_STORAGE=memory는 워커가 2개 이상이면 disk로 바꿔 시작합니다.
+- 종료(SIGTERM) 시 새 요청을 받지 않고 처리 중인 요청(LLM 호출)을 graceful_timeout까지 기다린 뒤,
+  앱 shutdown 이벤트에서 백그라운드 작업을 정리합니다.
+
+개발 환경에서는 기존처럼 uvicorn app.main:app --reload를 사용합니다.
+"""
+
+import os
+import math
+import importlib
+
+# WEB_CONCURRENCY가 없을 때 띄우는 최대 워커 수
+MAX_DEFAULT_WORKERS = 4
+
+
+def available_cpus() -> int:
+    """
+    이 프로세스가 쓸 수 있는 CPU 수를 반환합니다.
+
+    호스트 전체 코어 수가 아니라 CPU 친화도(cpuset)와 cgroup CPU 한도(cpu.max, cfs_quota)를 반영합니다.
+    """
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    quota_files = (
+        ("/sys/fs/cgroup/cpu.max", None),  # cgroup v2: "<quota> <period>" 또는 "max <period>"
+        ("/sys/fs/cgroup/cpu/cpu.cfs_quota_us", "/sys/fs/cgroup/cpu/cpu.cfs_period_us"),  # cgroup v1
+    )
+    for quota_path, period_path in quota_files:
+        try:
+            with open(quota_path) as f:
+                values = f.read().split()
+            if period_path:
+                with open(period_path) as f:
+                    values.append(f.read().strip())
+        except OSError:
+            continue
+        if values[0] not in ("max", "-1"):
+            cpus = min(cpus, max(1, math.ceil(int(values[0]) / int(values[1]))))
+        break
+    return max(1, cpus)
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = int(os.getenv("WEB_CONCURRENCY") or min(available_cpus(), MAX_DEFAULT_WORKERS))
+worker_class = "uvicorn_worker.UvicornWorker"
+
+if workers > 1 and os.getenv("RESUME_STORAGE", "disk").lower() == "memory":
+    # 메모리 저장소는 워커마다 따로 있어 다른 워커로 간 다운로드 요청이 404가 됨
+    print(f"⚠️ RESUME_STORAGE=memory는 워커 {workers}개 사이에서 공유되지 않아 disk로 바꿉니다.")
+    os.environ["RESUME_STORAGE"] = "disk"
+preload_app = True
+
+# 처리 중인 요청을 기다리는 시간 (자기소개서 초안 생성처럼 긴 LLM 호출 포함)
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "60"))
+# 워커가 응답하지 않을 때 재시작하기까지의 시간 (이벤트 루프가 막힌 경우)
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+keepalive = 5
+
+# 워커 heartbeat 파일을 메모리 파일시스템에 둠 (컨테이너 디스크 I/O 지연으로 인한 오탐 방지)
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+errorlog = "-"
+
+# fork 전에 마스터에서 미리 import할 모듈 (첫 요청에서 import하던 것들, 쉼표 구분)
+PRELOAD_MODULES = os.getenv("PRELOAD_MODULES", "openai,numpy,app.services.file_analysis").split(",")
+
+
+def when_ready(server):
+    """워커를 띄우기 전에 지연 import 모듈을 마스터에서 불러와 워커들이 공유하게 합니다."""
+    for name in filter(None, (name.strip() for name in PRELOAD_MODULES)):
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            server.log.warning(f"사전 import 실패 ({name}): {e}")
+    server.log.info(f"워커 {workers}개 시작 (preload, pid {os.getpid()})")
+
+
+def post_fork(server, worker):
+    server.log.info(f"워커 시작 (pid {worker.pid})")
@@ -0,0 +1,121 @@
+"""
+content_sniffing 테스트
+매직 바이트 판별, ZIP 항목 이름 기반 OOXML 판별(앞부분/중앙 디렉토리), 텍스트 인코딩(UTF-8/cp949/BOM) 판별을 확인합니다.
+
+실행 (ai-server 디렉토리에서):
+    python -m unittest discover tests
+"""
+
+import io
+import os
+import unittest
+import zipfile
+
+from app.services.content_sniffing import (
+    DECODE_SAMPLE_BYTES, DOCX_MIME, PPTX_MIME, SNIFF_BYTES, XLSX_MIME,
+    detect_text_encoding, read_text, sniff_mime_type
+)
+
+
+def make_zip(entries, compression=zipfile.ZIP_DEFLATED) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+class MagicSignatureTest(unittest.TestCase):
+    def test_binary_signatures(self):
+        cases = {
+            b"%PDF-1.7\n": "application/pdf",
+            b"\x89PNG\r\n\x1a\n\x00\x00": "image/png",
+            b"\xff\xd8\xff\xe0\x00\x10JFIF": "image/jpeg",
+            b"GIF89a\x01\x00": "image/gif",
+            b"RIFF\x00\x00\x00\x00WEBPVP8 ": "image/webp",
+            b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1\x00": "application/x-ole-storage",
+            b"\x1f\x8b\x08\x00": "application/gzip",
+        }
+        for head, expected in cases.items():
+            with self.subTest(expected=expected):
+                self.assertEqual(sniff_mime_type(head), expected)
+
+    def test_uncompressed_tar(self):
+        head = bytearray(512)
+        head[:8] = b"repo/a.p"
+        head[257:262] = b"ustar"
+        self.assertEqual(sniff_mime_type(bytes(head)), "application/x-tar")
+
+    def test_text_and_html(self):
+        self.assertEqual(sniff_mime_type("안녕하세요 포트폴리오".encode("utf-8")), "text/plain")
+        self.assertEqual(sniff_mime_type(b"  <!DOCTYPE html><html></html>"), "text/html")
+
+    def test_empty_and_unknown_binary(self):
+        self.assertIsNone(sniff_mime_type(b""))
+        self.assertIsNone(sniff_mime_type(bytes(range(256)) * 4))
+
+
+class OoxmlSniffTest(unittest.TestCase):
+    def test_ooxml_kinds_from_head(self):
+        cases = [("word/document.xml", DOCX_MIME), ("ppt/presentation.xml", PPTX_MIME), ("xl/workbook.xml", XLSX_MIME)]
+        for name, expected in cases:
+            with self.subTest(name=name):
+                data = make_zip([("[Content_Types].xml", "<Types/>"), (name, "<xml/>")])
+                self.assertEqual(sniff_mime_type(data[:SNIFF_BYTES], io.BytesIO(data)), expected)
+
+    def test_source_zip_with_similar_directory_names_is_plain_zip(self):
+        # "password/", "keyword/"는 "word/"로 시작하지 않으므로 문서가 아님
+        data = make_zip([("password/reset.py", "x"), ("keyword/index.py", "y"), ("README.md", "# repo")])
+        self.assertEqual(sniff_mime_type(data[:SNIFF_BYTES], io.BytesIO(data)), "application/zip")
+
+    def test_docx_with_large_first_entry_uses_central_directory(self):
+        # 첫 항목이 앞부분보다 커서 word/ 항목의 로컬 헤더가 head에 없음
+        data = make_zip(
+            [("[Content_Types].xml", os.urandom(SNIFF_BYTES * 2)), ("word/document.xml", "<xml/>")],
+            compression=zipfile.ZIP_STORED,
+        )
+        head = data[:SNIFF_BYTES]
+
+        self.assertIsNone(sniff_mime_type(head))  # source가 없으면 판별 불가 → 확장자로 판단
+
+        upload = io.BytesIO(data)
+        upload.seek(5)
+        self.assertEqual(sniff_mime_type(head, upload), DOCX_MIME)
+        self.assertEqual(upload.tell(), 5)  # 읽기 위치 복원
+
+    def test_broken_zip_is_inconclusive(self):
+        data = make_zip([("[Content_Types].xml", os.urandom(SNIFF_BYTES * 2))], compression=zipfile.ZIP_STORED)
+        truncated = io.BytesIO(data[:SNIFF_BYTES * 2])
+        self.assertIsNone(sniff_mime_type(data[:SNIFF_BYTES], truncated))
+
+
+class TextEncodingTest(unittest.TestCase):
+    def test_detect_encoding(self):
+        self.assertEqual(detect_text_encoding("자기소개서".encode("utf-8")), "utf-8")
+        self.assertEqual(detect_text_encoding("자기소개서".encode("cp949")), "cp949")
+        self.assertEqual(detect_text_encoding(b"\xef\xbb\xbf" + "본문".encode("utf-8")), "utf-8-sig")
+        self.assertEqual(detect_text_encoding("본문".encode("utf-16")), "utf-16")
+
+    def test_utf8_cut_in_the_middle_of_a_character_is_still_utf8(self):
+        data = "가나다".encode("utf-8")[:-1]
+        self.assertEqual(detect_text_encoding(data), "utf-8")
+
+    def test_read_text_from_bytes_and_stream(self):
+        text = "포트폴리오 설명\n두 번째 줄"
+        self.assertEqual(read_text(text.encode("cp949")), (text, "cp949"))
+        self.assertEqual(read_text(io.BytesIO(text.encode("utf-8"))), (text, "utf-8"))
+        self.assertEqual(read_text(b"\xef\xbb\xbf" + text.encode("utf-8")), (text, "utf-8-sig"))
+
+    def test_cp949_after_ascii_sample_falls_back(self):
+        # 샘플 구간은 ASCII라 utf-8로 판별되지만 뒤쪽의 cp949 한글에서 다음 후보로 다시 디코딩
+        text = "a" * DECODE_SAMPLE_BYTES + "한글 내용"
+        decoded, encoding = read_text(text.encode("cp949"))
+        self.assertEqual(encoding, "cp949")
+        self.assertEqual(decoded, text)
+
+    def test_cp949_text_is_sniffed_as_text(self):
+        self.assertEqual(sniff_mime_type("자기소개서 초안입니다".encode("cp949")), "text/plain")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+http_download 테스트
+Range 헤더 해석(접미 범위, bytes=-0, 시작 > 끝, 여러 범위), If-None-Match 비교, If-Range 불일치 시 전체 응답을 확인합니다.
+
+실행 (ai-server 디렉토리에서):
+    python -m unittest discover tests
+"""
+
+import io
+import unittest
+
+from starlette.requests import Request
+
+from app.services.http_download import (
+    build_download_response, etag_matches, make_etag, parse_byte_range
+)
+
+CONTENT = bytes(range(256)) * 4  # 1024 bytes
+ETAG = make_etag("abc123")
+
+
+def make_request(**headers) -> Request:
+    raw_headers = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/files/resumes/x.docx", "headers": raw_headers})
+
+
+def download(**headers):
+    entry = {"filename": "자기소개서.docx", "media_type": "application/octet-stream", "size": len(CONTENT), "content_addressed": True}
+    return build_download_response(make_request(**headers), entry, "abc123", lambda: io.BytesIO(CONTENT))
+
+
+class ParseByteRangeTest(unittest.TestCase):
+    def test_missing_or_other_units_are_ignored(self):
+        self.assertIsNone(parse_byte_range(None, 100))
+        self.assertIsNone(parse_byte_range("", 100))
+        self.assertIsNone(parse_byte_range("items=0-10", 100))
+
+    def test_closed_and_open_ended_ranges(self):
+        self.assertEqual(parse_byte_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_byte_range("bytes=90-", 100), (90, 99))
+
+    def test_end_is_clamped_to_file_size(self):
+        self.assertEqual(parse_byte_range("bytes=50-1000", 100), (50, 99))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_byte_range("bytes=-10", 100), (90, 99))
+        # 파일보다 긴 접미 범위는 전체 파일
+        self.assertEqual(parse_byte_range("bytes=-500", 100), (0, 99))
+
+    def test_empty_suffix_range_is_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            parse_byte_range("bytes=-0", 100)
+
+    def test_start_beyond_size_is_unsatisfiable(self):
+        with self.assertRaises(ValueError):
+            parse_byte_range("bytes=100-", 100)
+        with self.assertRaises(ValueError):
+            parse_byte_range("bytes=-10", 0)
+
+    def test_start_after_end_falls_back_to_full_response(self):
+        self.assertIsNone(parse_byte_range("bytes=50-10", 100))
+
+    def test_multiple_ranges_and_malformed_values_fall_back_to_full_response(self):
+        self.assertIsNone(parse_byte_range("bytes=0-1,5-6", 100))
+        self.assertIsNone(parse_byte_range("bytes=a-b", 100))
+        self.assertIsNone(parse_byte_range("bytes=-", 100))
+
+
+class EtagMatchesTest(unittest.TestCase):
+    def test_exact_weak_list_and_wildcard(self):
+        self.assertTrue(etag_matches(ETAG, ETAG))
+        self.assertTrue(etag_matches(f"W/{ETAG}", ETAG))
+        self.assertTrue(etag_matches(f'"other", {ETAG}', ETAG))
+        self.assertTrue(etag_matches("*", ETAG))
+
+    def test_missing_or_different(self):
+        self.assertFalse(etag_matches(None, ETAG))
+        self.assertFalse(etag_matches("", ETAG))
+        self.assertFalse(etag_matches('"other"', ETAG))
+
+
+class DownloadResponseTest(unittest.TestCase):
+    def test_if_none_match_returns_304(self):
+        response = download(if_none_match=ETAG)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], ETAG)
+
+    def test_range_returns_206(self):
+        response = download(range="bytes=10-19")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.headers["content-range"], f"bytes 10-19/{len(CONTENT)}")
+        self.assertEqual(response.headers["content-length"], "10")
+
+    def test_unsatisfiable_range_returns_416(self):
+        response = download(range=f"bytes={len(CONTENT)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response.headers["content-range"], f"bytes */{len(CONTENT)}")
+
+    def test_if_range_match_keeps_range(self):
+        self.assertEqual(download(range="bytes=0-9", if_range=ETAG).status_code, 206)
+
+    def test_if_range_mismatch_sends_full_file(self):
+        response = download(range="bytes=0-9", if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-length"], str(len(CONTENT)))
+        self.assertNotIn("content-range", response.headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+"""
+fork/fcntl이 없는 플랫폼(Windows 개발 환경) 호환 테스트
+별도 프로세스에서 os.fork, os.register_at_fork, fcntl을 없앤 뒤 앱을 import하고 프로젝트 인덱스에 씁니다.
+
+실행 (ai-server 디렉토리에서):
+    python -m unittest discover tests
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+WITHOUT_FORK = """
+import os, sys, tempfile
+del os.fork, os.register_at_fork
+sys.modules["fcntl"] = None
+
+import app.main
+from app.services.project_index import ProjectIndex
+
+index = ProjectIndex(tempfile.mkdtemp(), dim=4)
+index.upsert("p1", [1.0, 0.0, 0.0, 0.0], {"title": "프로젝트"})
+assert len(index) == 1
+print("ok")
+"""
+
+
+class PlatformImportTest(unittest.TestCase):
+    def test_app_imports_without_fork_hooks_and_fcntl(self):
+        env = dict(os.environ, OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY") or "test-key")
+        result = subprocess.run(
+            [sys.executable, "-c", WITHOUT_FORK],
+            cwd=SERVER_DIR, env=env, capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], "ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
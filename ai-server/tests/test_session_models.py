@@ -0,0 +1,140 @@
+"""
+session_models 테스트
+세션 직렬화 왕복(자기소개서/프로젝트 수정), 스냅샷 파일 저장/복원, 형식 버전이 다른 세션 처리를 확인합니다.
+
+실행 (ai-server 디렉토리에서):
+    python -m unittest discover tests
+"""
+
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import ormsgpack
+
+from app.services import session_models
+from app.services.session_models import (
+    CoverLetterSession, ProjectRecord, RefineSession, Turn,
+    decode_session, encode_session, load_sessions, save_sessions
+)
+
+
+def make_cover_letter_session() -> CoverLetterSession:
+    return CoverLetterSession(
+        state="draft_revision",
+        data={
+            "position": "백엔드 개발자",
+            "skills": ["Python", "FastAPI"],
+            "projects": [
+                ProjectRecord(title="챗봇", tags=("LLM",), start_date="2024-01", tools=("FastAPI",)),
+                {"title": "대시보드", "roles": ["프론트엔드"], "achievements": ["로딩 50% 단축"]},
+            ],
+        },
+        history=[Turn.user("안녕하세요"), Turn.assistant("무엇을 도와드릴까요?")],
+        writing_style="formal",
+        draft="자기소개서 초안",
+        draft_variants={"formal": "격식체", "friendly": "친근체"},
+        variants_mode=True,
+        export={"url": "http://localhost/files/resumes/a.docx", "status": "ready"},
+        created_at=1700000000.5,
+        speculative_draft=object(),
+    )
+
+
+class SessionRoundTripTest(unittest.TestCase):
+    def test_cover_letter_session_round_trip(self):
+        session = make_cover_letter_session()
+        restored = decode_session(encode_session(session))
+
+        self.assertIsInstance(restored, CoverLetterSession)
+        self.assertEqual(restored.state, session.state)
+        self.assertEqual(restored.history, session.history)
+        self.assertEqual(restored.writing_style, "formal")
+        self.assertEqual(restored.draft, "자기소개서 초안")
+        self.assertEqual(restored.draft_variants, session.draft_variants)
+        self.assertTrue(restored.variants_mode)
+        self.assertEqual(restored.export, session.export)
+        self.assertEqual(restored.created_at, 1700000000.5)
+        self.assertEqual(restored.data["skills"], ["Python", "FastAPI"])
+
+    def test_projects_are_restored_as_records(self):
+        restored = decode_session(encode_session(make_cover_letter_session()))
+        first, second = restored.data["projects"]
+        self.assertIsInstance(first, ProjectRecord)
+        self.assertEqual(first.title, "챗봇")
+        self.assertEqual(first.tags, ("LLM",))
+        # dict로 넣은 프로젝트도 레코드로 복원되고 dict처럼 읽힘
+        self.assertIsInstance(second, ProjectRecord)
+        self.assertEqual(second["achievements"], ("로딩 50% 단축",))
+        self.assertEqual(second.get("summary"), None)
+        self.assertEqual(second.to_dict()["roles"], ["프론트엔드"])
+
+    def test_running_speculation_is_not_serialized(self):
+        restored = decode_session(encode_session(make_cover_letter_session()))
+        self.assertIsNone(restored.speculative_draft)
+
+    def test_refine_session_round_trip(self):
+        session = RefineSession(
+            project={"title": "챗봇", "tags": ["LLM"]},
+            user_id="user-1",
+            history=[Turn.user("설명 보강해줘")],
+            status="completed",
+            created_at=1700000000.0,
+        )
+        self.assertEqual(decode_session(session.to_bytes()), session)
+
+    def test_roles_are_interned_after_restore(self):
+        restored = decode_session(encode_session(make_cover_letter_session()))
+        self.assertIs(restored.history[0].role, session_models.ROLE_USER)
+        self.assertIs(restored.history[1].role, session_models.ROLE_ASSISTANT)
+
+
+class SnapshotVersionTest(unittest.TestCase):
+    def test_other_version_is_rejected(self):
+        blob = ormsgpack.packb([session_models.SNAPSHOT_VERSION - 1, "cover_letter", "intent_confirmation"])
+        with self.assertRaises(ValueError):
+            decode_session(blob)
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            decode_session(ormsgpack.packb([session_models.SNAPSHOT_VERSION, "unknown"]))
+
+    def test_empty_payload_is_rejected(self):
+        with self.assertRaises(ValueError):
+            decode_session(ormsgpack.packb([]))
+
+
+class SnapshotFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.path = self.directory / "nested" / "sessions.snapshot"
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def test_save_and_load(self):
+        sessions = {"a": make_cover_letter_session(), "b": RefineSession(project={"title": "챗봇"})}
+        self.assertEqual(save_sessions(sessions, self.path), 2)
+
+        restored = load_sessions(self.path)
+        self.assertEqual(set(restored), {"a", "b"})
+        self.assertEqual(restored["a"].draft, "자기소개서 초안")
+        self.assertEqual(restored["b"].project, {"title": "챗봇"})
+        self.assertEqual(list(self.path.parent.glob("*.tmp")), [])
+
+    def test_missing_file_loads_nothing(self):
+        self.assertEqual(load_sessions(self.path), {})
+
+    def test_sessions_with_old_version_are_skipped(self):
+        old = ormsgpack.packb([session_models.SNAPSHOT_VERSION - 1, "refine", {}, None, [], "conversing", 0.0])
+        current = encode_session(RefineSession(project={"title": "챗봇"}))
+        self.path.parent.mkdir(parents=True)
+        self.path.write_bytes(ormsgpack.packb({"old": old, "current": current}))
+
+        restored = load_sessions(self.path)
+        self.assertEqual(list(restored), ["current"])
+
+
+if __name__ == "__main__":
+    unittest.main()
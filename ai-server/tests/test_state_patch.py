@@ -0,0 +1,108 @@
+"""
+state_patch 테스트
+set/add/remove 패치 적용, 허용 필드 제한, 원본 상태 보존(copy-on-write)을 확인합니다.
+
+실행 (ai-server 디렉토리에서):
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from app.services.state_patch import apply_patch, copy_state
+
+FIELDS = ["position", "skills", "achievements", "motivation"]
+LIST_FIELDS = ["skills", "achievements"]
+
+
+def patch(state, operations):
+    return apply_patch(state, operations, FIELDS, LIST_FIELDS)
+
+
+class ApplyPatchTest(unittest.TestCase):
+    def setUp(self):
+        self.state = {"position": "백엔드 개발자", "skills": ["Python", "Django"], "achievements": None, "motivation": None}
+
+    def test_set_replaces_single_value(self):
+        updated, changed = patch(self.state, {"set": {"position": "데이터 엔지니어"}})
+        self.assertEqual(updated["position"], "데이터 엔지니어")
+        self.assertEqual(changed, ["position"])
+
+    def test_set_with_same_value_or_empty_value_changes_nothing(self):
+        updated, changed = patch(self.state, {"set": {"position": "백엔드 개발자", "motivation": ""}})
+        self.assertEqual(changed, [])
+        self.assertEqual(updated, self.state)
+
+    def test_set_rewrites_list_field_and_drops_empty_items(self):
+        updated, changed = patch(self.state, {"set": {"skills": ["Go", "", None]}})
+        self.assertEqual(updated["skills"], ["Go"])
+        self.assertEqual(changed, ["skills"])
+
+    def test_set_with_scalar_on_list_field_wraps_it(self):
+        updated, _ = patch(self.state, {"set": {"skills": "Rust"}})
+        self.assertEqual(updated["skills"], ["Rust"])
+
+    def test_add_appends_without_duplicates(self):
+        updated, changed = patch(self.state, {"add": {"skills": ["Django", "Docker", "Docker"]}})
+        self.assertEqual(updated["skills"], ["Python", "Django", "Docker"])
+        self.assertEqual(changed, ["skills"])
+
+    def test_add_to_missing_list_starts_new_list(self):
+        updated, changed = patch(self.state, {"add": {"achievements": "응답 시간 40% 단축"}})
+        self.assertEqual(updated["achievements"], ["응답 시간 40% 단축"])
+        self.assertEqual(changed, ["achievements"])
+
+    def test_add_existing_items_only_changes_nothing(self):
+        _, changed = patch(self.state, {"add": {"skills": ["Python"]}})
+        self.assertEqual(changed, [])
+
+    def test_remove_drops_matching_items(self):
+        updated, changed = patch(self.state, {"remove": {"skills": ["Django", "Java"]}})
+        self.assertEqual(updated["skills"], ["Python"])
+        self.assertEqual(changed, ["skills"])
+
+    def test_remove_missing_items_changes_nothing(self):
+        _, changed = patch(self.state, {"remove": {"skills": ["Java"], "achievements": ["없음"]}})
+        self.assertEqual(changed, [])
+
+    def test_set_add_remove_in_one_patch(self):
+        updated, changed = patch(self.state, {
+            "set": {"motivation": "성장"},
+            "add": {"skills": ["Docker"]},
+            "remove": {"skills": ["Python"]},
+        })
+        self.assertEqual(updated["skills"], ["Django", "Docker"])
+        self.assertEqual(updated["motivation"], "성장")
+        self.assertEqual(changed, ["motivation", "skills"])
+
+    def test_unknown_and_non_list_fields_are_ignored(self):
+        updated, changed = patch(self.state, {
+            "set": {"user_id": "other"},
+            "add": {"position": ["x"], "unknown": ["y"]},
+            "remove": {"motivation": ["z"]},
+        })
+        self.assertEqual(changed, [])
+        self.assertNotIn("user_id", updated)
+
+    def test_empty_patch(self):
+        updated, changed = patch(self.state, {})
+        self.assertEqual(changed, [])
+        self.assertEqual(updated, self.state)
+
+    def test_original_state_is_not_modified(self):
+        original_skills = self.state["skills"]
+        patch(self.state, {"add": {"skills": ["Docker"]}, "remove": {"skills": ["Python"]}, "set": {"position": "PM"}})
+        self.assertEqual(self.state["skills"], ["Python", "Django"])
+        self.assertIs(self.state["skills"], original_skills)
+        self.assertEqual(self.state["position"], "백엔드 개발자")
+
+
+class CopyStateTest(unittest.TestCase):
+    def test_lists_are_copied(self):
+        state = {"skills": ["Python"], "position": "백엔드"}
+        copied = copy_state(state)
+        copied["skills"].append("Go")
+        self.assertEqual(state["skills"], ["Python"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+url_fetcher 테스트
+로컬 HTTP 서버(http.server)를 대역으로 띄워 응답 크기 상한, ETag 조건부 요청(304), 텍스트 양에 따른 조기 중단을 확인합니다.
+
+실행 (ai-server 디렉토리에서):
+    python -m unittest discover tests
+"""
+
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from app.services import url_fetcher
+
+PAGES = {
+    "/large": b"<html><body>" + b"a" * 200_000 + b"</body></html>",
+    "/article": "<html><body><p>안녕하세요 포트폴리오입니다</p></body></html>".encode("utf-8"),
+    "/long-text": b"<html><body>" + b"<p>" + b"word " * 20_000 + b"</p></body></html>",
+}
+ETAG = '"v1"'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """경로별 고정 페이지를 ETag와 함께 응답하고, 조건부 요청에는 304로 응답합니다."""
+
+    requests = []
+
+    def do_GET(self):
+        StandInHandler.requests.append((self.path, self.headers.get("If-None-Match")))
+        body = PAGES.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.send_header("ETag", ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # 상한에 걸려 클라이언트가 먼저 연결을 끊은 경우
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UrlFetcherTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.cache_dir = Path(tempfile.mkdtemp())
+        self._original_cache_dir = url_fetcher.CACHE_DIR
+        url_fetcher.CACHE_DIR = self.cache_dir
+        StandInHandler.requests = []
+
+    def tearDown(self):
+        url_fetcher.CACHE_DIR = self._original_cache_dir
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_response_is_capped_at_max_bytes(self):
+        result = url_fetcher.fetch_url(self.base_url + "/large", max_bytes=10_000)
+        self.assertEqual(len(result["content"]), 10_000)
+        self.assertTrue(result["truncated"])
+
+    def test_unchanged_page_is_revalidated_with_304(self):
+        url = self.base_url + "/article"
+        first = url_fetcher.fetch_url(url)
+        second = url_fetcher.fetch_url(url)
+
+        self.assertEqual(first["status_code"], 200)
+        self.assertFalse(first["from_cache"])
+        self.assertEqual(second["status_code"], 304)
+        self.assertTrue(second["from_cache"])
+        self.assertEqual(second["content"], first["content"])
+        self.assertEqual(StandInHandler.requests[-1], ("/article", ETAG))
+
+    def test_reading_stops_once_enough_text_is_collected(self):
+        result = url_fetcher.fetch_url(self.base_url + "/long-text", max_text_chars=1_000)
+        self.assertTrue(result["truncated"])
+        self.assertLess(len(result["content"]), len(PAGES["/long-text"]))
+
+    def test_truncated_body_is_not_cached(self):
+        url = self.base_url + "/large"
+        url_fetcher.fetch_url(url, max_bytes=10_000)
+        second = url_fetcher.fetch_url(url, max_bytes=10_000)
+
+        # 잘린 본문은 캐시하지 않으므로 다시 요청할 때 검증자를 보내지 않고 새로 받음
+        self.assertFalse(second["from_cache"])
+        self.assertEqual(StandInHandler.requests[-1], ("/large", None))
+        self.assertEqual(list(self.cache_dir.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()